@@ -8,22 +8,46 @@ import threading
 import sys
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import cv2
-import numpy as np
-from PIL import Image, ImageTk
 
 # Agregar el directorio src al path
 sys.path.append(str(Path(__file__).parent / 'src'))
 
-from src.capture import RealSenseCapture
-from src.preprocessing import DataPreprocessor
-from src.features import FeatureExtractor
-from src.classification import ActivityClassifier
-from src.legacy_tools import LegacyDataProcessor, SkeletonVisualizer
-from src.capture.gui_pose_detector import GUIPoseDetector
+# Solo lo necesario para mostrar la ventana: captura (cv2, MediaPipe, RealSense), pipeline,
+# clasificador y renderizador se importan en segundo plano en init_system_async, y las
+# herramientas legacy (matplotlib) al usarlas por primera vez
+from src.utils import FramePacer, STAGE_TIMER, TRACER, STARTUP_PROFILER
 
 class ActivityRecognitionGUI:
+    # Fuentes de los textos superpuestos en la vista previa
+    OVERLAY_FONT = ('Consolas', 12, 'bold')
+    OVERLAY_SMALL_FONT = ('Consolas', 8)
+    
+    # Etapas mostradas en el panel de latencias, en orden del pipeline
+    STAGE_PANEL = [
+        ("capture.wait_for_frames", "Cámara"),
+        ("pose.mediapipe", "MediaPipe"),
+        ("pose.depth_lookup", "Profundidad"),
+        ("preprocess.clean_anomalies", "Anomalías"),
+        ("preprocess.impute", "Imputación"),
+        ("features.extract", "Características"),
+        ("classifier.predict", "Bosque"),
+    ]
+    
+    # Lado de la imagen que recibe MediaPipe al recortar alrededor de la persona (None = frame completo)
+    POSE_ROI_SIZE = 256
+    
+    # Workers de pose por cámara: toda la inferencia ocurre en el pool (0 = en el hilo de captura)
+    POSE_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+    
+    # Fracción del canvas a la que se dibuja la vista previa (HAR_PREVIEW_SCALE=0.5 reduce a 320 × 240
+    # la conversión de color y la copia a Tk en equipos lentos)
+    PREVIEW_SCALE = float(os.environ.get('HAR_PREVIEW_SCALE', 1.0))
+    
+    # Procesos para reestructurar CSVs legacy (una subcarpeta por proceso)
+    RESHAPE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+    
     def __init__(self, root):
         self.root = root
         self.root.title("🚀 Sistema de Reconocimiento de Actividades Humanas")
@@ -37,10 +61,32 @@ class ActivityRecognitionGUI:
         self.camera_running = False
         self.video_feed_active = False
         self.countdown_active = False
+        self.continuous_mode = False
+        
+        # Reconocedor continuo (ventana deslizante sobre el video en vivo) y productor retenido a tasa completa
+        self.streaming_recognizer = None
+        self.continuous_producer = None
         
         # Detector específico para GUI (igual a test_camera.py)
         self.gui_pose_detector = None
         
+        # Herramientas legacy: se crean al usarlas por primera vez
+        self._legacy_processor = None
+        self._visualizer = None
+        
+        # Ritmo de visualización independiente del de captura
+        self.target_display_fps = 30
+        self.fps_status_job = None
+        
+        # Latencias por etapa para el panel de estado, opcional desde el inicio (HAR_STAGE_TIMER=1);
+        # también se activa desde Herramientas
+        if os.environ.get('HAR_STAGE_TIMER'):
+            STAGE_TIMER.enabled = True
+        
+        # Traza de hilos opcional desde el inicio (HAR_TRACE=1); también se activa desde Herramientas
+        if os.environ.get('HAR_TRACE'):
+            TRACER.start()
+        
         # Configurar estilo
         self.setup_styles()
         
@@ -191,6 +237,31 @@ class ActivityRecognitionGUI:
                                       fg='#605e5c',
                                       bg='#ffffff')
         self.classes_status.grid(row=1, column=1, sticky='w', padx=(20, 0), pady=2)
+        
+        # Indicador de rendimiento (FPS medidos)
+        self.fps_status = tk.Label(indicators_frame,
+                                  text="⚡ FPS captura: -- | inferencia: -- | display: --",
+                                  font=('Segoe UI', 10),
+                                  fg='#605e5c',
+                                  bg='#ffffff')
+        self.fps_status.grid(row=2, column=0, columnspan=2, sticky='w', pady=2)
+        
+        # Indicador de frames descartados
+        self.dropped_status = tk.Label(indicators_frame,
+                                      text="🗑️ Frames descartados: --",
+                                      font=('Segoe UI', 10),
+                                      fg='#605e5c',
+                                      bg='#ffffff')
+        self.dropped_status.grid(row=3, column=0, columnspan=2, sticky='w', pady=2)
+        
+        # Latencia p95 por etapa
+        self.stage_status = tk.Label(indicators_frame,
+                                    text="⏱️ Latencia p95 por etapa: --",
+                                    font=('Consolas', 9),
+                                    fg='#605e5c',
+                                    bg='#ffffff',
+                                    justify='left')
+        self.stage_status.grid(row=4, column=0, columnspan=2, sticky='w', pady=2)
     
     def create_detection_panel(self):
         """Crea el panel de detección de actividades"""
@@ -216,6 +287,10 @@ class ActivityRecognitionGUI:
                                      bg='#2b2b2b')
         self.video_canvas.pack(padx=10, pady=10)
         
+        # Renderizador con buffers e items del canvas reutilizados entre frames
+        # (se crea en init_system_async, junto con cv2 y PIL)
+        self.preview_renderer = None
+        
         # Mostrar placeholder inicial
         self.show_camera_placeholder()
         
@@ -247,7 +322,8 @@ class ActivityRecognitionGUI:
                                text="1. Inicia la cámara para ver el esqueleto\n"
                                     "2. Posiciónate frente a la cámara\n"
                                     "3. Presiona 'Detectar' (tendrás 3 segundos)\n"
-                                    "4. Realiza la actividad por 10 segundos",
+                                    "4. Realiza la actividad por 10 segundos\n"
+                                    "O activa el modo continuo para monitorear sin countdown",
                                font=('Segoe UI', 9),
                                fg='#605e5c',
                                justify='left')
@@ -260,6 +336,13 @@ class ActivityRecognitionGUI:
                                        command=self.start_detection)
         self.detect_button.pack(pady=10, fill='x')
         
+        # Botón de modo continuo (ventana deslizante)
+        self.continuous_button = ttk.Button(controls_frame,
+                                           text="🔁 Modo Continuo: OFF",
+                                           style='Secondary.TButton',
+                                           command=self.toggle_continuous_mode)
+        self.continuous_button.pack(pady=(0, 10), fill='x')
+        
         # Label para countdown
         self.countdown_label = tk.Label(controls_frame,
                                        text="",
@@ -365,6 +448,25 @@ class ActivityRecognitionGUI:
                   style='Secondary.TButton',
                   command=self.reshape_csvs).grid(row=1, column=0, padx=10, pady=10, sticky='ew')
         
+        # Traza de rendimiento (formato Chrome trace-event)
+        self.trace_button = ttk.Button(tools_grid,
+                                      text="⏺️ Iniciar Traza de Rendimiento",
+                                      style='Secondary.TButton',
+                                      command=self.toggle_trace)
+        self.trace_button.grid(row=1, column=1, padx=10, pady=10, sticky='ew')
+        
+        ttk.Button(tools_grid,
+                  text="💾 Exportar Traza (Chrome)",
+                  style='Secondary.TButton',
+                  command=self.export_trace).grid(row=2, column=0, padx=10, pady=10, sticky='ew')
+        
+        # Latencias por etapa del panel de estado
+        self.stage_timer_button = ttk.Button(tools_grid,
+                                            text=self._stage_timer_button_text(),
+                                            style='Secondary.TButton',
+                                            command=self.toggle_stage_timer)
+        self.stage_timer_button.grid(row=2, column=1, padx=10, pady=10, sticky='ew')
+        
         # Configurar columnas para que se expandan uniformemente
         tools_grid.columnconfigure(0, weight=1)
         tools_grid.columnconfigure(1, weight=1)
@@ -428,32 +530,47 @@ class ActivityRecognitionGUI:
             try:
                 self.log_message("🔧 Inicializando componentes del sistema...")
                 
-                # Inicializar detector de poses para GUI primero
-                self.log_message("🤖 Configurando detector de poses para GUI...")
-                self.gui_pose_detector = GUIPoseDetector()
-                
-                # Inicializar componentes uno por uno
-                self.log_message("📹 Configurando cámaras RealSense...")
-                self.capture_system = RealSenseCapture(output_path="temp_data")
-                
-                self.log_message("🔄 Iniciando preprocesador...")
-                self.preprocessor = DataPreprocessor()
-                
-                self.log_message("📊 Configurando extractor de características...")
-                self.feature_extractor = FeatureExtractor()
+                # Detector de poses, cámaras y clasificador no dependen entre sí: se preparan en paralelo
+                self.log_message("🤖 Configurando detector de poses, cámaras RealSense y clasificador...")
+                with ThreadPoolExecutor(max_workers=3, thread_name_prefix="init") as executor:
+                    pose_future = executor.submit(self._init_pose_detector)
+                    capture_future = executor.submit(self._init_capture_system)
+                    classifier_future = executor.submit(self._init_classifier)
+                    
+                    self.log_message("🔄 Iniciando preprocesador y extractor de características...")
+                    with STARTUP_PROFILER.phase("import.pipeline", "import"):
+                        from src.preprocessing import DataPreprocessor
+                        from src.features import FeatureExtractor
+                        from src.pipeline import ActivityRecognitionPipeline
+                        from src.gui import PreviewRenderer
+                    with STARTUP_PROFILER.phase("init.pipeline"):
+                        self.preprocessor = DataPreprocessor()
+                        self.feature_extractor = FeatureExtractor()
+                        self.preview_renderer = PreviewRenderer(self.video_canvas, 640, 480,
+                                                                scale=self.PREVIEW_SCALE)
+                    
+                    self.gui_pose_detector = pose_future.result()
+                    self.capture_system = capture_future.result()
+                    self.classifier = classifier_future.result()
                 
-                self.log_message("🤖 Cargando clasificador...")
-                self.classifier = ActivityClassifier(model_path="models/activity_classifier.pkl")
+                if self.classifier.is_trained():
+                    problems = self.classifier.check_compatibility(self.feature_extractor.create_feature_names(),
+                                                                   self.preprocessor.feature_config())
+                    for problem in problems:
+                        self.log_message(f"⚠️ Modelo: {problem}")
                 
-                self.log_message("🛠️ Preparando herramientas legacy...")
-                self.legacy_processor = LegacyDataProcessor()
-                self.visualizer = SkeletonVisualizer()
+                # Pipeline en memoria (sin CSV temporales)
+                self.recognition_pipeline = ActivityRecognitionPipeline(
+                    self.preprocessor, self.feature_extractor, self.classifier
+                )
                 
                 # Actualizar estado
                 self.system_initialized = True
+                STARTUP_PROFILER.mark("system.ready")
                 self.update_status()
                 
                 self.log_message("✅ Sistema inicializado correctamente")
+                self.log_startup_report()
                 
                 # Iniciar automáticamente la cámara
                 self.root.after(1000, self.auto_start_camera)  # Esperar 1 segundo y luego iniciar
@@ -463,7 +580,77 @@ class ActivityRecognitionGUI:
                 messagebox.showerror("Error de Inicialización", 
                                    f"No se pudo inicializar el sistema:\n{str(e)}")
         
-        threading.Thread(target=init_worker, daemon=True).start()
+        threading.Thread(target=init_worker, name="init_worker", daemon=True).start()
+    
+    def _init_pose_detector(self):
+        """Importa y crea el detector de poses de la GUI (y lo calienta si es quien infiere)"""
+        with STARTUP_PROFILER.phase("import.pose_detector", "import"):
+            from src.capture.gui_pose_detector import GUIPoseDetector
+        with STARTUP_PROFILER.phase("init.pose_detector"):
+            detector = GUIPoseDetector(roi_size=self.POSE_ROI_SIZE)
+        # Con workers el detector solo dibuja y lee profundidad: su Pose no se crea ni se calienta
+        if self.POSE_WORKERS == 0:
+            # Inferencia sobre un frame negro: la primera detección real no paga la carga del modelo
+            with STARTUP_PROFILER.phase("warmup.pose_detector", "warmup"):
+                detector.warm_up()
+        return detector
+    
+    def _init_capture_system(self):
+        """Importa y abre las cámaras RealSense y calienta los workers de pose"""
+        with STARTUP_PROFILER.phase("import.capture", "import"):
+            from src.capture import RealSenseCapture
+        with STARTUP_PROFILER.phase("init.capture"):
+            capture_system = RealSenseCapture(
+                output_path="temp_data",
+                pose_workers=self.POSE_WORKERS,
+                depth_neighborhood=1,
+                pose_roi_size=self.POSE_ROI_SIZE
+            )
+        # Los workers crean su Pose y hacen una inferencia de prueba antes de abrir la cámara
+        with STARTUP_PROFILER.phase("warmup.pose_workers", "warmup"):
+            if not capture_system.prepare_pose_workers():
+                print("Advertencia: los workers de pose no terminaron de calentarse durante el arranque")
+        return capture_system
+    
+    def _init_classifier(self):
+        """Importa, carga y calienta el clasificador"""
+        with STARTUP_PROFILER.phase("import.classification", "import"):
+            from src.classification import ActivityClassifier
+        with STARTUP_PROFILER.phase("init.classifier"):
+            classifier = ActivityClassifier(model_path="models/activity_classifier.pkl")
+        with STARTUP_PROFILER.phase("warmup.classifier", "warmup"):
+            classifier.warm_up()
+        return classifier
+    
+    def log_startup_report(self):
+        """Resume el costo del arranque en la consola de la GUI y deja el detalle en stdout"""
+        print(STARTUP_PROFILER.report())
+        
+        totals = STARTUP_PROFILER.totals()
+        first_paint = next((phase['start_ms'] for phase in STARTUP_PROFILER.phases()
+                            if phase['name'] == "window.first_paint"), None)
+        first_paint_text = f"ventana {first_paint:.0f} ms, " if first_paint is not None else ""
+        self.log_message(
+            f"⏱️ Arranque: {first_paint_text}sistema listo {STARTUP_PROFILER.elapsed_ms():.0f} ms "
+            f"(importaciones {totals['import']:.0f} ms, inicialización {totals['init']:.0f} ms, "
+            f"calentamiento {totals['warmup']:.0f} ms; detalle en la terminal)"
+        )
+    
+    @property
+    def legacy_processor(self):
+        """Procesador de datos legacy, creado al usarlo por primera vez"""
+        if self._legacy_processor is None:
+            from src.legacy_tools import LegacyDataProcessor
+            self._legacy_processor = LegacyDataProcessor()
+        return self._legacy_processor
+    
+    @property
+    def visualizer(self):
+        """Visualizador de esqueletos (importa matplotlib), creado al usarlo por primera vez"""
+        if self._visualizer is None:
+            from src.legacy_tools import SkeletonVisualizer
+            self._visualizer = SkeletonVisualizer()
+        return self._visualizer
     
     def update_status(self):
         """Actualiza los indicadores de estado"""
@@ -508,8 +695,14 @@ class ActivityRecognitionGUI:
             self.video_status.config(text="📹 Cámara activa - Detectando esqueleto", fg='#107c10')
             self.log_message("📹 Iniciando transmisión en vivo de la cámara...")
             
+            # Un solo productor por cámara: lee los frames e infiere la pose una vez
+            self.capture_system.start_frame_producers(self.gui_pose_detector)
+            
             # Iniciar hilo para el video feed
-            threading.Thread(target=self.video_feed_worker, daemon=True).start()
+            self.preview_renderer.display_rate.reset()
+            threading.Thread(target=self.video_feed_worker, name="video_feed", daemon=True).start()
+            if self.fps_status_job is None:
+                self.fps_status_job = self.root.after(1000, self.update_fps_status)
             
         except Exception as e:
             self.log_message(f"❌ Error iniciando cámara: {str(e)}")
@@ -518,11 +711,17 @@ class ActivityRecognitionGUI:
     
     def stop_camera_feed(self):
         """Detiene la transmisión en vivo de la cámara"""
+        if self.continuous_mode:
+            self.stop_continuous_mode()
         self.camera_running = False
         self.video_feed_active = False
+        if hasattr(self, 'capture_system'):
+            self.capture_system.stop_frame_producers()
         self.start_camera_btn.config(text="🎥 Iniciar Cámara")
         self.video_status.config(text="📷 Cámara desconectada", fg='#d13438')
         self.video_canvas.delete("all")
+        if self.preview_renderer is not None:
+            self.preview_renderer.reset()
         self.video_canvas.create_text(320, 240, 
                                      text="📷 Cámara desconectada",
                                      fill='white',
@@ -540,6 +739,7 @@ class ActivityRecognitionGUI:
                 self.log_message("⚠️ No se pudo iniciar la cámara automáticamente - No hay dispositivos")
                 self.video_status.config(text="❌ No hay cámaras conectadas", fg='#d13438')
                 self.video_canvas.delete("all")
+                self.preview_renderer.reset()
                 self.video_canvas.create_text(320, 200, 
                                              text="❌ No se detectaron cámaras",
                                              fill='#ff6b6b',
@@ -553,65 +753,48 @@ class ActivityRecognitionGUI:
             self.video_status.config(text="❌ Error en cámara", fg='#d13438')
     
     def video_feed_worker(self):
-        """Worker thread para la transmisión de video en vivo - Idéntico a test_camera.py"""
+        """Worker thread para la transmisión de video en vivo - Consume el productor compartido"""
+        subscriber = None
         try:
             # Usar la primera cámara/pipeline
-            if not hasattr(self, 'capture_system') or len(self.capture_system.pipelines) == 0:
+            if not hasattr(self, 'capture_system') or len(self.capture_system.frame_producers) == 0:
                 self.log_message("❌ No hay cámaras disponibles")
                 self.stop_camera_feed()
                 return
             
-            pipeline = self.capture_system.pipelines[0]
+            # Suscripción de "último frame": si la GUI va lenta se descartan frames viejos
+            subscriber = self.capture_system.frame_producers[0].subscribe("preview")
+            pacer = FramePacer(self.target_display_fps)
             frame_count = 0
             joints_detected = 0
             
             while self.video_feed_active:
                 try:
-                    # EXACTAMENTE igual a test_camera.py
-                    frames = pipeline.wait_for_frames()
-                    
-                    # Obtener frame de color y profundidad
-                    color_frame = frames.get_color_frame()
-                    depth_frame = frames.get_depth_frame()
-                    
-                    if not color_frame or not depth_frame:
+                    packet = subscriber.get(timeout=1.0)
+                    if packet is None:
+                        if subscriber.closed:
+                            break
                         continue
                     
                     frame_count += 1
                     
-                    # Convertir a arrays de numpy
-                    color_image = np.asanyarray(color_frame.get_data())
-                    depth_image = np.asanyarray(depth_frame.get_data())
+                    # La pose ya fue inferida por el productor
+                    color_image = packet.color_image
+                    pose_results = packet.pose_results
+                    joints_3d = packet.joints_3d
+                    if joints_3d:
+                        joints_detected += 1
                     
-                    # Detectar poses usando el detector GUI (igual a test_camera.py)
-                    pose_results = None
-                    joints_3d = []
-                    if self.gui_pose_detector:
-                        pose_results = self.gui_pose_detector.detect_pose(color_image)
-                        joints_3d = self.gui_pose_detector.get_joint_coordinates(pose_results, depth_frame)
-                        if joints_3d:
-                            joints_detected += 1
-
-                    # Preparar imagen para mostrar (igual a test_camera.py)
-                    display_image = color_image.copy()
-
-                    # Dibujar poses si están habilitadas (igual a test_camera.py)
-                    if pose_results and self.gui_pose_detector:
-                        self.gui_pose_detector.draw_landmarks(display_image, pose_results, False)
-
-                    # Agregar información de estado (igual a test_camera.py)
-                    cv2.putText(display_image, f"Modo: Color", 
-                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                    cv2.putText(display_image, f"Poses: ON", 
-                               (10, 55), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                    cv2.putText(display_image, f"Joints detectados: {len(joints_3d)}/33", 
-                               (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                    # Textos de estado: items del canvas que solo se actualizan si cambian
+                    detection_rate = (joints_detected / frame_count) * 100
+                    overlays = {
+                        'mode': ("Modo: Color", (10, 30), '#00ff00', self.OVERLAY_FONT),
+                        'poses': ("Poses: ON", (10, 55), '#00ff00', self.OVERLAY_FONT),
+                        'joints': (f"Joints detectados: {len(joints_3d)}/33", (10, 80), '#00ff00', self.OVERLAY_FONT),
+                        'rate': (f"Tasa detección: {detection_rate:.1f}%", (10, 105), '#00ff00', self.OVERLAY_FONT),
+                        'footer': ("Vista en vivo - GUI Activa", (10, 450), '#ffff00', self.OVERLAY_FONT),
+                    }
                     
-                    if frame_count > 0:
-                        detection_rate = (joints_detected / frame_count) * 100
-                        cv2.putText(display_image, f"Tasa detección: {detection_rate:.1f}%", 
-                                   (10, 105), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-
                     # Mostrar joints importantes detectados (igual a test_camera.py)
                     if joints_3d:
                         important_joints = [11, 12, 13, 14, 15, 16, 23, 24, 25, 26, 29, 30]
@@ -619,32 +802,26 @@ class ActivityRecognitionGUI:
                         for joint in joints_3d:
                             if joint['id'] in important_joints and joint['confidence'] > 0.5:
                                 text = f"{joint['name']}: ({joint['x']}, {joint['y']}, {joint['z']:.2f}m)"
-                                cv2.putText(display_image, text, (10, y_offset), 
-                                           cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 0), 1)
+                                overlays[f"joint_{joint['id']}"] = (text, (10, y_offset), '#00ffff',
+                                                                    self.OVERLAY_SMALL_FONT)
                                 y_offset += 20
                                 if y_offset > 400:  # Limitar para que no se salga de la pantalla
                                     break
                     
-                    # Mostrar controles
-                    cv2.putText(display_image, "Vista en vivo - GUI Activa", 
-                               (10, display_image.shape[0] - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-                    
-                    # La imagen ya está en el tamaño correcto (640x480)
-                    # No necesitamos redimensionar porque ya tiene la resolución exacta
-                    height, width = display_image.shape[:2]
-                    
-                    # Convertir BGR a RGB para Tkinter
-                    rgb_image = cv2.cvtColor(display_image, cv2.COLOR_BGR2RGB)
-                    
-                    # Convertir a PIL Image y luego a PhotoImage
-                    pil_image = Image.fromarray(rgb_image)
-                    photo = ImageTk.PhotoImage(pil_image)
+                    self.preview_renderer.set_overlays(overlays)
                     
-                    # Actualizar canvas en el hilo principal con el tamaño real
-                    self.root.after(0, self.update_video_canvas, photo, width, height)
+                    # Copiar al buffer preasignado, dibujar el esqueleto y programar el refresco;
+                    # si Tk no mostró aún el frame anterior, este se descarta
+                    draw = None
+                    if pose_results and self.gui_pose_detector:
+                        draw = lambda image, results=pose_results: self.gui_pose_detector.draw_landmarks(
+                            image, results, False)
+                    with TRACER.span("preview.submit", "gui", index=packet.index):
+                        self.preview_renderer.submit(color_image, draw)
                     
-                    # Controlar FPS exactamente igual a test_camera.py
-                    time.sleep(1/30)  # 30 FPS
+                    # Esperar solo lo que falta para el ritmo de display; los frames que
+                    # lleguen mientras tanto se descartan y se muestra siempre el más reciente
+                    pacer.wait()
                     
                 except Exception as e:
                     if self.video_feed_active:  # Solo mostrar error si aún deberíamos estar activos
@@ -654,26 +831,67 @@ class ActivityRecognitionGUI:
         except Exception as e:
             self.log_message(f"❌ Error en transmisión de video: {str(e)}")
         finally:
+            if subscriber is not None:
+                subscriber.close()
             if self.camera_running:
                 self.root.after(0, self.stop_camera_feed)
     
-    def update_video_canvas(self, photo, width, height):
-        """Actualiza el canvas con el nuevo frame - Mantiene resolución original"""
-        if not self.video_feed_active:
+    def update_fps_status(self):
+        """Actualiza los FPS medidos de captura, inferencia y display (cada segundo)"""
+        self.fps_status_job = None
+        if not self.camera_running:
+            self.fps_status.config(text="⚡ FPS captura: -- | inferencia: -- | display: --", fg='#605e5c')
             return
+        
+        producers = getattr(self.capture_system, 'frame_producers', [])
+        if producers:
+            capture_fps = producers[0].capture_rate.rate()
+            inference_fps = producers[0].inference_rate.rate()
+            display_fps = self.preview_renderer.display_rate.rate()
+            self.fps_status.config(
+                text=f"⚡ FPS captura: {capture_fps:.1f} | inferencia: {inference_fps:.1f} | "
+                     f"display: {display_fps:.1f} (objetivo {self.target_display_fps})",
+                fg='#107c10' if display_fps >= 0.8 * self.target_display_fps else '#d13438'
+            )
             
-        self.video_canvas.delete("all")
+            gate = producers[0].motion_gate
+            if gate is not None:
+                gate_labels = {"motion": "movimiento", "static": "escena quieta", "empty": "escena vacía"}
+                self.fps_status.config(
+                    text=self.fps_status.cget('text') +
+                         f" | pose: {gate_labels[gate.state]} ({gate.skip_ratio():.0%} frames omitidos)"
+                )
+            
+            dropped = producers[0].dropped_frames()
+            if dropped:
+                details = " | ".join(f"{source}: {count}" for source, count in dropped.items())
+                self.dropped_status.config(text=f"🗑️ Frames descartados: {details}",
+                                           fg='#d13438' if any(dropped.values()) else '#605e5c')
+        
+        self.update_stage_status()
+        self.fps_status_job = self.root.after(1000, self.update_fps_status)
+    
+    def update_stage_status(self):
+        """Muestra la latencia p95 de cada etapa medida por STAGE_TIMER"""
+        if not STAGE_TIMER.enabled:
+            self.stage_status.config(text="⏱️ Latencia p95 por etapa: desactivada (Herramientas o HAR_STAGE_TIMER=1)")
+            return
         
-        # No centrar, usar toda la resolución disponible (640x480)
-        # Esto mantiene exactamente el mismo campo de visión que test_camera.py
-        self.video_canvas.create_image(0, 0, anchor='nw', image=photo)
+        snapshot = STAGE_TIMER.snapshot()
+        lines = []
+        for stage_name, label in self.STAGE_PANEL:
+            stats = snapshot.get(stage_name)
+            if stats is not None:
+                lines.append(f"{label:<16}p95 {stats['p95_ms']:8.2f} ms  (n={stats['count']})")
         
-        # Mantener referencia para evitar garbage collection
-        self.video_canvas.image = photo
+        if lines:
+            self.stage_status.config(text="⏱️ Latencia p95 por etapa:\n" + "\n".join(lines))
     
     def show_camera_placeholder(self):
         """Muestra un placeholder cuando la cámara no está activa"""
         self.video_canvas.delete("all")
+        if self.preview_renderer is not None:
+            self.preview_renderer.reset()
         self.video_canvas.create_text(320, 200, 
                                      text="🎥 Cámara Iniciando...",
                                      fill='white',
@@ -697,6 +915,11 @@ class ActivityRecognitionGUI:
         if self.is_detecting:
             return
         
+        if self.continuous_mode:
+            messagebox.showinfo("Modo continuo activo", 
+                              "Desactiva el modo continuo para hacer una detección con countdown.")
+            return
+        
         if not self.classifier.is_trained():
             messagebox.showwarning("Modelo no entrenado", 
                                  "Primero debes entrenar un modelo en la pestaña de Entrenamiento.")
@@ -705,6 +928,107 @@ class ActivityRecognitionGUI:
         # Iniciar countdown
         self.start_countdown()
     
+    def toggle_continuous_mode(self):
+        """Activa o desactiva el reconocimiento continuo por ventana deslizante"""
+        if self.continuous_mode:
+            self.stop_continuous_mode()
+            return
+        
+        if not self.system_initialized:
+            messagebox.showwarning("Sistema no listo", 
+                                 "El sistema aún se está inicializando. Espera un momento.")
+            return
+        
+        if self.is_detecting or self.countdown_active:
+            return
+        
+        if not self.classifier.is_trained():
+            messagebox.showwarning("Modelo no entrenado", 
+                                 "Primero debes entrenar un modelo en la pestaña de Entrenamiento.")
+            return
+        
+        if not self.camera_running:
+            messagebox.showwarning("Cámara inactiva", 
+                                 "Inicia la cámara para usar el modo continuo.")
+            return
+        
+        self.start_continuous_mode()
+    
+    def start_continuous_mode(self):
+        """Crea el reconocedor continuo y empieza a alimentarlo desde el video en vivo"""
+        from src.pipeline import SlidingWindowRecognizer
+        
+        self.streaming_recognizer = SlidingWindowRecognizer(
+            self.recognition_pipeline,
+            window_seconds=self.capture_system.CAPTURE_SECONDS,
+            hop_seconds=0.5,
+            frame_rate=self.capture_system.FRAME_RATE,
+            on_prediction=lambda activity, confidence, probabilities: self.root.after(
+                0, self.show_continuous_prediction, activity, confidence, dict(probabilities)
+            )
+        )
+        # Sin compuerta de movimiento solo mientras se llena la primera ventana (se libera con la
+        # primera predicción); después los frames omitidos entran como muestras repetidas
+        producer = self.capture_system.frame_producers[0]
+        producer.hold_full_rate()
+        self.continuous_producer = producer
+        self.streaming_recognizer.start(
+            producer.subscribe("recognizer", queue_size=self.capture_system.FRAME_RATE)
+        )
+        self.continuous_mode = True
+        
+        self.continuous_button.config(text="🔁 Modo Continuo: ON")
+        self.detect_button.config(state='disabled')
+        self.countdown_label.config(text="🔁 Llenando ventana...", fg='#605e5c')
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, "🔁 MODO CONTINUO ACTIVO\n")
+        self.results_text.insert(tk.END, "=" * 50 + "\n\n")
+        self.results_text.insert(tk.END, f"Esperando {self.capture_system.CAPTURE_SECONDS} segundos de datos...\n")
+        self.log_message("🔁 Modo continuo activado - Predicción cada 0.5 s")
+    
+    def stop_continuous_mode(self):
+        """Detiene el reconocimiento continuo"""
+        self.continuous_mode = False
+        if self.streaming_recognizer:
+            self.streaming_recognizer.stop()
+            self.streaming_recognizer = None
+        self.release_continuous_full_rate()
+        
+        self.continuous_button.config(text="🔁 Modo Continuo: OFF")
+        self.detect_button.config(state='normal')
+        self.countdown_label.config(text="")
+        self.log_message("⏹️ Modo continuo desactivado")
+    
+    def release_continuous_full_rate(self):
+        """Devuelve la compuerta de movimiento al productor del modo continuo"""
+        if self.continuous_producer is not None:
+            self.continuous_producer.hold_full_rate(False)
+            self.continuous_producer = None
+    
+    def show_continuous_prediction(self, activity, confidence, probabilities):
+        """Muestra la última predicción del modo continuo"""
+        if not self.continuous_mode:
+            return
+        
+        # La ventana ya está llena: la compuerta vuelve a omitir los frames quietos
+        self.release_continuous_full_rate()
+        
+        self.countdown_label.config(text=f"🏷️ {activity}",
+                                    fg='#107c10' if confidence >= 0.5 else '#d13438')
+        
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, "🔁 RECONOCIMIENTO CONTINUO\n")
+        self.results_text.insert(tk.END, "=" * 50 + "\n\n")
+        self.results_text.insert(tk.END, f"🏷️ Actividad actual: {activity}\n")
+        self.results_text.insert(tk.END, f"🎯 Confianza: {confidence:.2%}\n")
+        if self.streaming_recognizer and self.streaming_recognizer.last_latency is not None:
+            self.results_text.insert(tk.END, 
+                                     f"⏱️ Latencia: {self.streaming_recognizer.last_latency * 1000:.0f} ms\n")
+        self.results_text.insert(tk.END, "\n📈 Probabilidades por clase:\n")
+        
+        for name, prob in sorted(probabilities.items(), key=lambda x: x[1], reverse=True):
+            self.results_text.insert(tk.END, f"   {name}: {prob:.2%}\n")
+    
     def start_countdown(self):
         """Inicia el countdown de 3 segundos"""
         self.countdown_active = True
@@ -712,6 +1036,7 @@ class ActivityRecognitionGUI:
         self.log_message("⏰ Iniciando countdown - Posiciónate frente a la cámara")
         
         def countdown_worker():
+            TRACER.instant("countdown.start", "gui")
             try:
                 for i in range(3, 0, -1):
                     if not self.countdown_active:
@@ -735,7 +1060,7 @@ class ActivityRecognitionGUI:
                 self.log_message(f"❌ Error en countdown: {str(e)}")
                 self.root.after(0, self.reset_detection_ui)
         
-        threading.Thread(target=countdown_worker, daemon=True).start()
+        threading.Thread(target=countdown_worker, name="countdown", daemon=True).start()
     
     def execute_detection(self):
         """Ejecuta la detección real después del countdown"""
@@ -751,19 +1076,23 @@ class ActivityRecognitionGUI:
                 
                 # Capturar actividad con callback de progreso
                 self.log_message("📹 Capturando datos de la cámara...")
-                raw_file = self.capture_activity_with_progress()
+                with TRACER.span("detection.capture", "recognition"):
+                    frames = self.capture_activity_with_progress()
                 
-                if raw_file:
+                if frames is not None and len(frames) > 0:
                     self.root.after(0, lambda: self.countdown_label.config(text="🔄 Procesando..."))
                     
                     self.log_message("🔄 Preprocesando datos...")
-                    processed_file = self.preprocessor.process_raw_data(raw_file)
+                    with TRACER.span("detection.preprocess", "recognition", frames=len(frames)):
+                        processed = self.recognition_pipeline.preprocess_sequence(frames)
                     
                     self.log_message("📊 Extrayendo características...")
-                    features = self.feature_extractor.extract_features(processed_file)
+                    with TRACER.span("detection.features", "recognition"):
+                        features = self.feature_extractor.extract_features_from_sequence(processed)
                     
                     self.log_message("🔍 Clasificando actividad...")
-                    predicted_activity, probabilities = self.classifier.predict_activity(features)
+                    with TRACER.span("detection.classify", "recognition"):
+                        predicted_activity, probabilities = self.classifier.predict_activity(features)
                     
                     # Mostrar resultados
                     self.results_text.delete(1.0, tk.END)
@@ -777,15 +1106,6 @@ class ActivityRecognitionGUI:
                         self.results_text.insert(tk.END, f"   {activity}: {prob:.2%}\n")
                     
                     self.log_message(f"✅ Actividad detectada: {predicted_activity} ({max(probabilities.values()):.2%})")
-                    
-                    # Limpiar archivos temporales
-                    try:
-                        if os.path.exists(raw_file):
-                            os.remove(raw_file)
-                        if os.path.exists(processed_file):
-                            os.remove(processed_file)
-                    except:
-                        pass
                 else:
                     self.log_message("❌ Error en la captura de datos")
                     self.results_text.delete(1.0, tk.END)
@@ -799,13 +1119,13 @@ class ActivityRecognitionGUI:
             finally:
                 self.root.after(0, self.reset_detection_ui)
         
-        threading.Thread(target=detection_worker, daemon=True).start()
+        threading.Thread(target=detection_worker, name="detection", daemon=True).start()
     
     def capture_activity_with_progress(self):
-        """Captura actividad con actualizaciones de progreso"""
+        """Captura actividad con actualizaciones de progreso (CaptureBuffer en memoria, sin CSV)"""
         try:
             # Usar el método de captura existente pero con progreso
-            return self.capture_system.capture_activity("unknown_activity")
+            return self.capture_system.capture_frames("unknown_activity")
         except Exception as e:
             self.log_message(f"❌ Error en captura: {str(e)}")
             return None
@@ -901,7 +1221,7 @@ class ActivityRecognitionGUI:
                 self.detect_button.config(text="🚀 INICIAR DETECCIÓN", state='normal')
                 self.progress_var.set(0)
         
-        threading.Thread(target=detection_worker, daemon=True).start()
+        threading.Thread(target=detection_worker, name="detection", daemon=True).start()
     
     def browse_dataset(self):
         """Abre el diálogo para seleccionar el dataset"""
@@ -940,9 +1260,16 @@ class ActivityRecognitionGUI:
                 self.train_results_text.insert(tk.END, "=" * 50 + "\n\n")
                 
                 self.train_progress_var.set(50)
-                accuracy = self.classifier.train_model(dataset_path)
+                with TRACER.span("training.fit", "training"):
+                    # La versión y el preprocesamiento se leen del dataset (versión 1 si no los declara)
+                    accuracy = self.classifier.train_model(dataset_path)
                 self.train_progress_var.set(100)
                 
+                problems = self.classifier.check_compatibility(self.feature_extractor.create_feature_names(),
+                                                               self.preprocessor.feature_config())
+                for problem in problems:
+                    self.log_message(f"⚠️ Modelo: {problem}")
+                
                 # Mostrar resultados
                 self.train_results_text.insert(tk.END, f"✅ Modelo entrenado exitosamente\n")
                 self.train_results_text.insert(tk.END, f"📊 Precisión: {accuracy:.2%}\n")
@@ -963,7 +1290,52 @@ class ActivityRecognitionGUI:
                 self.train_button.config(text="🚀 ENTRENAR MODELO", state='normal')
                 self.train_progress_var.set(0)
         
-        threading.Thread(target=training_worker, daemon=True).start()
+        threading.Thread(target=training_worker, name="training", daemon=True).start()
+    
+    def toggle_trace(self):
+        """Inicia o detiene la traza de hilos y etapas"""
+        if TRACER.enabled:
+            TRACER.stop()
+            self.trace_button.config(text="⏺️ Iniciar Traza de Rendimiento")
+            self.log_message("⏹️ Traza detenida (los eventos siguen disponibles para exportar)")
+        else:
+            TRACER.start()
+            self.trace_button.config(text="⏹️ Detener Traza de Rendimiento")
+            self.log_message("⏺️ Traza de rendimiento iniciada")
+        # La traza activa también las latencias por etapa
+        self.stage_timer_button.config(text=self._stage_timer_button_text())
+    
+    def _stage_timer_button_text(self):
+        if STAGE_TIMER.enabled:
+            return "⏹️ Desactivar Latencias por Etapa"
+        return "⏱️ Activar Latencias por Etapa"
+    
+    def toggle_stage_timer(self):
+        """Activa o desactiva la medición de latencias por etapa del panel de estado"""
+        STAGE_TIMER.enabled = not STAGE_TIMER.enabled
+        if STAGE_TIMER.enabled:
+            STAGE_TIMER.reset()
+            self.log_message("⏱️ Medición de latencias por etapa activada")
+        else:
+            self.log_message("⏹️ Medición de latencias por etapa desactivada")
+        self.stage_timer_button.config(text=self._stage_timer_button_text())
+        self.update_stage_status()
+    
+    def export_trace(self):
+        """Guarda los eventos registrados en formato Chrome trace-event"""
+        output_file = filedialog.asksaveasfilename(title="Guardar traza",
+                                                   defaultextension=".json",
+                                                   initialfile=f"har_trace_{time.strftime('%Y%m%d_%H%M%S')}.json",
+                                                   filetypes=[("Chrome trace", "*.json")])
+        if not output_file:
+            return
+        
+        try:
+            count = TRACER.export(output_file)
+            self.log_message(f"✅ Traza exportada: {output_file} ({count} eventos) - abrir en chrome://tracing o Perfetto")
+        except Exception as e:
+            self.log_message(f"❌ Error exportando traza: {str(e)}")
+            messagebox.showerror("Error", f"Error exportando traza:\n{str(e)}")
     
     # Métodos para herramientas legacy
     def clean_folders(self):
@@ -1004,7 +1376,8 @@ class ActivityRecognitionGUI:
                                                    "Ingresa el prefijo para nombres de archivo:")
         if activity_prefix:
             try:
-                self.legacy_processor.reshape_csvs_to_dataset(input_path, output_path, activity_prefix)
+                self.legacy_processor.reshape_csvs_to_dataset(input_path, output_path, activity_prefix,
+                                                              n_jobs=self.RESHAPE_WORKERS)
                 self.log_message(f"✅ CSVs convertidos a dataset - Salida: {output_path}")
                 messagebox.showinfo("Éxito", "CSVs convertidos a dataset exitosamente")
             except Exception as e:
@@ -1040,7 +1413,9 @@ class ActivityRecognitionGUI:
     def on_closing(self):
         """Maneja el cierre de la aplicación"""
         try:
-            # Detener cámara si está activa
+            # Detener reconocimiento continuo y cámara si están activos
+            if self.continuous_mode:
+                self.stop_continuous_mode()
             if self.camera_running:
                 self.stop_camera_feed()
             
@@ -1062,6 +1437,7 @@ def main():
     """Función principal"""
     root = tk.Tk()
     app = ActivityRecognitionGUI(root)
+    root.after_idle(STARTUP_PROFILER.mark, "window.first_paint")
     root.mainloop()
 
 if __name__ == "__main__":
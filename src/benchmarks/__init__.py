@@ -0,0 +1,27 @@
+"""
+Benchmarks de rendimiento con secuencias de esqueleto sintéticas
+"""
+
+from .synthetic import SyntheticSkeletonGenerator
+from .runner import (
+    BenchmarkResult,
+    BenchmarkSuite,
+    BenchmarkRegressionError,
+    run_benchmark,
+    format_report,
+    save_baseline,
+    compare_with_baseline,
+    check_against_baseline
+)
+
+__all__ = [
+    'SyntheticSkeletonGenerator',
+    'BenchmarkResult',
+    'BenchmarkSuite',
+    'BenchmarkRegressionError',
+    'run_benchmark',
+    'format_report',
+    'save_baseline',
+    'compare_with_baseline',
+    'check_against_baseline'
+]
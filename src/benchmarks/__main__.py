@@ -0,0 +1,56 @@
+"""
+Ejecuta la suite de benchmarks desde la línea de comandos
+
+    python -m src.benchmarks                                  # solo reporte
+    python -m src.benchmarks --save-baseline benchmarks.json  # guardar línea base
+    python -m src.benchmarks --baseline benchmarks.json       # fallar si hay regresiones
+"""
+
+import argparse
+import sys
+from .synthetic import SyntheticSkeletonGenerator
+from .runner import BenchmarkSuite, format_report, save_baseline, compare_with_baseline
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del pipeline de reconocimiento de actividades")
+    parser.add_argument("--stages", nargs="*", choices=BenchmarkSuite.STAGES, help="Etapas a medir (por defecto todas)")
+    parser.add_argument("--repeats", type=int, default=30, help="Repeticiones cronometradas por etapa")
+    parser.add_argument("--warmup", type=int, default=3, help="Repeticiones previas sin medir")
+    parser.add_argument("--frames", type=int, default=300, help="Frames por clip sintético")
+    parser.add_argument("--dropout", type=float, default=0.02, help="Probabilidad de joint perdido por frame")
+    parser.add_argument("--jitter", type=float, default=1.5, help="Ruido en píxeles")
+    parser.add_argument("--classes", type=int, default=4, help="Número de actividades sintéticas")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del generador")
+    parser.add_argument("--batch-size", type=int, default=16, help="Clips por llamada en las etapas por lotes")
+    parser.add_argument("--no-memory", action="store_true", help="No medir el pico de memoria")
+    parser.add_argument("--baseline", help="JSON de línea base contra el que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Empeoramiento relativo permitido")
+    parser.add_argument("--save-baseline", help="Guardar los resultados como línea base en este JSON")
+    args = parser.parse_args(argv)
+    
+    generator = SyntheticSkeletonGenerator(n_frames=args.frames, dropout_rate=args.dropout,
+                                           jitter=args.jitter, n_classes=args.classes, seed=args.seed)
+    suite = BenchmarkSuite(generator, repeats=args.repeats, warmup=args.warmup, batch_size=args.batch_size)
+    
+    print("Preparando datos sintéticos y clasificador de prueba...")
+    try:
+        results = suite.run(args.stages, track_memory=not args.no_memory)
+        print(format_report(results))
+        
+        if args.save_baseline:
+            save_baseline(results, args.save_baseline, suite.metadata())
+        
+        if args.baseline:
+            regressions = compare_with_baseline(results, args.baseline, args.tolerance)
+            if regressions:
+                print("\n❌ REGRESIONES DE RENDIMIENTO:")
+                for regression in regressions:
+                    print(f"   {regression}")
+                return 1
+            print(f"\n✅ Sin regresiones respecto a {args.baseline} (tolerancia {args.tolerance:.0%})")
+        return 0
+    finally:
+        suite.teardown()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""
+Ejecución de benchmarks por etapa y de extremo a extremo, con comparación contra una línea base
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from ..preprocessing import DataPreprocessor
+from ..features import FeatureExtractor, FEATURE_VERSION
+from ..classification import ActivityClassifier, write_dataset_info
+from ..pipeline import ActivityRecognitionPipeline
+from ..utils.joint_utils import create_column_names
+from .synthetic import SyntheticSkeletonGenerator
+
+# Métricas comparadas contra la línea base (mayor = peor)
+BASELINE_METRICS = ("p50_ms", "p95_ms", "peak_memory_kb")
+
+class BenchmarkRegressionError(Exception):
+    """Alguna etapa empeoró más de lo tolerado respecto a la línea base"""
+
+class BenchmarkResult:
+    def __init__(self, name, latencies, items_per_call=1, peak_memory_bytes=None):
+        """
+        Resultado de un benchmark
+        
+        Args:
+            name: Nombre de la etapa medida
+            latencies: Duración en segundos de cada repetición
+            items_per_call: Elementos (clips, muestras) procesados en cada repetición
+            peak_memory_bytes: Pico de memoria asignada durante una repetición (tracemalloc)
+        """
+        self.name = name
+        self.latencies = np.asarray(latencies, dtype=np.float64)
+        self.items_per_call = items_per_call
+        self.peak_memory_bytes = peak_memory_bytes
+    
+    def percentile_ms(self, q):
+        return float(np.percentile(self.latencies, q) * 1000.0)
+    
+    @property
+    def p50_ms(self):
+        return self.percentile_ms(50)
+    
+    @property
+    def p95_ms(self):
+        return self.percentile_ms(95)
+    
+    @property
+    def p99_ms(self):
+        return self.percentile_ms(99)
+    
+    @property
+    def mean_ms(self):
+        return float(self.latencies.mean() * 1000.0)
+    
+    @property
+    def throughput(self):
+        """Elementos procesados por segundo"""
+        total = self.latencies.sum()
+        return float(len(self.latencies) * self.items_per_call / total) if total > 0 else 0.0
+    
+    def to_dict(self):
+        return {
+            "p50_ms": self.p50_ms,
+            "p95_ms": self.p95_ms,
+            "p99_ms": self.p99_ms,
+            "mean_ms": self.mean_ms,
+            "throughput": self.throughput,
+            "peak_memory_kb": None if self.peak_memory_bytes is None else self.peak_memory_bytes / 1024.0,
+            "repeats": int(len(self.latencies)),
+            "items_per_call": self.items_per_call,
+        }
+
+def _quiet_context(quiet):
+    """Silencia los print y los warnings del código medido"""
+    stack = contextlib.ExitStack()
+    if quiet:
+        stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        stack.enter_context(warnings.catch_warnings())
+        warnings.simplefilter("ignore")
+    return stack
+
+def run_benchmark(name, func, repeats=30, warmup=3, items_per_call=1, track_memory=True, quiet=True):
+    """
+    Mide una función repetidas veces
+    
+    La memoria se mide en una ejecución aparte, porque tracemalloc ralentiza el código medido.
+    
+    Args:
+        name: Nombre de la etapa
+        func: Función sin argumentos a medir
+        repeats: Repeticiones cronometradas
+        warmup: Repeticiones previas sin medir (cachés, imports perezosos)
+        items_per_call: Elementos procesados por llamada, para el throughput
+        track_memory: Medir el pico de memoria con tracemalloc
+        quiet: Silenciar los print del código medido
+    
+    Returns:
+        BenchmarkResult
+    """
+    with _quiet_context(quiet):
+        for _ in range(warmup):
+            func()
+        
+        latencies = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - start)
+        
+        peak = None
+        if track_memory:
+            already_tracing = tracemalloc.is_tracing()
+            if not already_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            peak -= baseline
+            if not already_tracing:
+                tracemalloc.stop()
+    
+    return BenchmarkResult(name, latencies, items_per_call, peak)
+
+class BenchmarkSuite:
+    STAGES = (
+        "preprocess_frames",
+        "process_raw_data",
+        "extract_features",
+        "extract_features_from_dataframe",
+        "predict_activity",
+        "predict_batch",
+        "end_to_end",
+        "end_to_end_batch",
+    )
+    
+    def __init__(self, generator=None, repeats=30, warmup=3, batch_size=16,
+                 clips_per_class=10, work_dir=None, quiet=True):
+        """
+        Benchmarks reproducibles de cada etapa del reconocimiento sobre datos sintéticos
+        
+        Args:
+            generator: SyntheticSkeletonGenerator (se crea uno por defecto si es None)
+            repeats: Repeticiones cronometradas por etapa
+            warmup: Repeticiones previas sin medir
+            batch_size: Clips por llamada en las etapas por lotes
+            clips_per_class: Clips por clase para entrenar el clasificador de prueba
+            work_dir: Carpeta para los CSV y el modelo temporales (None = carpeta temporal)
+            quiet: Silenciar los print de las etapas medidas
+        """
+        self.generator = generator or SyntheticSkeletonGenerator()
+        self.repeats = repeats
+        self.warmup = warmup
+        self.batch_size = batch_size
+        self.clips_per_class = clips_per_class
+        self.work_dir = work_dir
+        self.quiet = quiet
+        self._owns_work_dir = work_dir is None
+        self._prepared = False
+    
+    def setup(self):
+        """Genera los datos, los archivos de entrada y entrena un clasificador con datos sintéticos"""
+        if self._prepared:
+            return
+        if self.work_dir is None:
+            self.work_dir = tempfile.mkdtemp(prefix="har_bench_")
+        os.makedirs(self.work_dir, exist_ok=True)
+        
+        with _quiet_context(self.quiet):
+            self.preprocessor = DataPreprocessor()
+            self.feature_extractor = FeatureExtractor()
+            
+            # Dataset de entrenamiento con el mismo formato que src/data/dataset.csv
+            clips, labels = self.generator.generate_dataset(self.clips_per_class)
+            processed = [self.preprocessor.process_frames(clip) for clip in clips]
+            features = self.feature_extractor.extract_features_batch(processed)
+            dataset = pd.DataFrame(features, columns=self.feature_extractor.create_feature_names())
+            dataset["actividad"] = labels
+            dataset_path = os.path.join(self.work_dir, "dataset.csv")
+            dataset.to_csv(dataset_path, index=False)
+            write_dataset_info(dataset_path, FEATURE_VERSION, self.preprocessor.feature_config())
+            
+            self.classifier = ActivityClassifier(os.path.join(self.work_dir, "models", "benchmark.pkl"))
+            self.classifier.train_model(dataset_path)
+            
+            self.pipeline = ActivityRecognitionPipeline(self.preprocessor, self.feature_extractor, self.classifier)
+            
+            # Entradas de cada etapa
+            self.clip, _ = self.generator.generate(0)
+            self.batch = [self.generator.generate(i % self.generator.n_classes)[0] for i in range(self.batch_size)]
+            self.raw_file = os.path.join(self.work_dir, "benchmark_raw.csv")
+            pd.DataFrame(self.clip, columns=create_column_names()).to_csv(self.raw_file, index=False)
+            self.processed_file = self.preprocessor.process_raw_data(self.raw_file)
+            self.processed_df = pd.read_csv(self.processed_file)
+            self.features = self.feature_extractor.extract_features(self.processed_file)
+            self.features_matrix = np.tile(np.asarray(self.features), (self.batch_size, 1))
+        
+        self._prepared = True
+    
+    def teardown(self):
+        """Elimina la carpeta temporal si la creó la suite"""
+        if self._owns_work_dir and self.work_dir and os.path.exists(self.work_dir):
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+            self.work_dir = None
+        self._prepared = False
+    
+    def _stage_functions(self):
+        return {
+            "preprocess_frames": (lambda: self.preprocessor.process_frames(self.clip), 1),
+            "process_raw_data": (lambda: self.preprocessor.process_raw_data(self.raw_file), 1),
+            "extract_features": (lambda: self.feature_extractor.extract_features(self.processed_file), 1),
+            "extract_features_from_dataframe": (
+                lambda: self.feature_extractor.extract_features_from_dataframe(self.processed_df), 1),
+            "predict_activity": (lambda: self.classifier.predict_activity(self.features), 1),
+            "predict_batch": (lambda: self.classifier.predict_batch(self.features_matrix), self.batch_size),
+            "end_to_end": (lambda: self.pipeline.run(self.clip), 1),
+            "end_to_end_batch": (lambda: self.pipeline.run_batch(self.batch), self.batch_size),
+        }
+    
+    def run(self, stages=None, track_memory=True):
+        """
+        Ejecuta los benchmarks
+        
+        Args:
+            stages: Nombres de las etapas a medir (None = todas, ver STAGES)
+            track_memory: Medir el pico de memoria de cada etapa
+        
+        Returns:
+            Diccionario nombre -> BenchmarkResult
+        """
+        self.setup()
+        functions = self._stage_functions()
+        stages = stages or self.STAGES
+        
+        results = {}
+        for stage in stages:
+            if stage not in functions:
+                raise ValueError(f"Etapa desconocida: {stage}. Opciones: {self.STAGES}")
+            func, items = functions[stage]
+            results[stage] = run_benchmark(stage, func, self.repeats, self.warmup, items,
+                                           track_memory=track_memory, quiet=self.quiet)
+        return results
+    
+    def metadata(self):
+        """Configuración de la ejecución, guardada junto a la línea base"""
+        g = self.generator
+        return {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "repeats": self.repeats,
+            "batch_size": self.batch_size,
+            "generator": {
+                "n_frames": g.n_frames, "dropout_rate": g.dropout_rate, "jitter": g.jitter,
+                "n_classes": g.n_classes, "seed": g.seed,
+            },
+        }
+
+def format_report(results):
+    """
+    Tabla de resultados en texto
+    
+    Args:
+        results: Diccionario nombre -> BenchmarkResult
+    """
+    header = f"{'Etapa':<34}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'items/s':>12}{'pico KB':>12}"
+    lines = [header, "-" * len(header)]
+    for name, result in results.items():
+        peak = "-" if result.peak_memory_bytes is None else f"{result.peak_memory_bytes / 1024.0:.1f}"
+        lines.append(f"{name:<34}{result.p50_ms:>10.3f}{result.p95_ms:>10.3f}{result.p99_ms:>10.3f}"
+                     f"{result.throughput:>12.1f}{peak:>12}")
+    return "\n".join(lines)
+
+def save_baseline(results, path, metadata=None):
+    """
+    Guarda los resultados como línea base en JSON
+    
+    Args:
+        results: Diccionario nombre -> BenchmarkResult
+        path: Archivo JSON de salida
+        metadata: Información adicional de la ejecución
+    """
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    data = {
+        "metadata": metadata or {},
+        "results": {name: result.to_dict() for name, result in results.items()},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"Línea base guardada en: {path}")
+
+def compare_with_baseline(results, path, tolerance=0.25, min_delta_ms=0.05):
+    """
+    Compara los resultados con una línea base guardada
+    
+    Args:
+        results: Diccionario nombre -> BenchmarkResult
+        path: Archivo JSON con la línea base
+        tolerance: Empeoramiento relativo permitido (0.25 = 25 %)
+        min_delta_ms: Diferencia absoluta mínima en latencia para contar como regresión
+                      (evita falsos positivos en etapas de microsegundos)
+    
+    Returns:
+        Lista de mensajes, uno por métrica que empeoró más de lo tolerado
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        baseline = json.load(f).get("results", {})
+    
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        current = result.to_dict()
+        for metric in BASELINE_METRICS:
+            old, new = baseline[name].get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            if metric.endswith("_ms") and new - old < min_delta_ms:
+                continue
+            if new > old * (1 + tolerance):
+                regressions.append(f"{name}.{metric}: {old:.3f} -> {new:.3f} (+{(new / old - 1) * 100:.0f} %)")
+    return regressions
+
+def check_against_baseline(results, path, tolerance=0.25, min_delta_ms=0.05):
+    """
+    Igual que compare_with_baseline pero lanza una excepción si hay regresiones
+    
+    Raises:
+        BenchmarkRegressionError: Con la lista de métricas que empeoraron
+    """
+    regressions = compare_with_baseline(results, path, tolerance, min_delta_ms)
+    if regressions:
+        raise BenchmarkRegressionError("Regresiones de rendimiento:\n  " + "\n  ".join(regressions))
@@ -0,0 +1,133 @@
+"""
+Generador de secuencias de esqueleto sintéticas con el formato de captura (frames × 99)
+"""
+
+import numpy as np
+
+# Pose de pie de referencia en píxeles (640×480) para los 33 joints de MediaPipe
+BASE_POSE_XY = np.array([
+    (320, 80),                                             # 0 nariz
+    (312, 72), (308, 72), (304, 72), (328, 72), (332, 72), (336, 72),  # 1-6 ojos
+    (298, 78), (342, 78), (314, 92), (326, 92),            # 7-10 orejas y boca
+    (290, 130), (350, 130),                                # 11-12 hombros
+    (275, 190), (365, 190),                                # 13-14 codos
+    (270, 245), (370, 245),                                # 15-16 muñecas
+    (266, 258), (374, 258), (268, 260), (372, 260),        # 17-20 meñiques e índices
+    (274, 255), (366, 255),                                # 21-22 pulgares
+    (300, 255), (340, 255),                                # 23-24 caderas
+    (298, 335), (342, 335),                                # 25-26 rodillas
+    (296, 410), (344, 410),                                # 27-28 tobillos
+    (292, 420), (348, 420),                                # 29-30 talones
+    (306, 425), (334, 425),                                # 31-32 pies
+], dtype=np.float64)
+
+# Grupos de joints que se mueven juntos (brazo/pierna de cada lado)
+LIMB_GROUPS = {
+    'brazo_izq': [13, 15, 17, 19, 21],
+    'brazo_der': [14, 16, 18, 20, 22],
+    'pierna_izq': [25, 27, 29, 31],
+    'pierna_der': [26, 28, 30, 32],
+}
+
+class SyntheticSkeletonGenerator:
+    def __init__(self, n_frames=300, dropout_rate=0.02, jitter=1.5, n_classes=4,
+                 frame_rate=30, depth=2.0, seed=0):
+        """
+        Genera clips crudos reproducibles con movimientos periódicos distintos por clase
+        
+        Args:
+            n_frames: Frames por clip (300 = 10 s a 30 FPS)
+            dropout_rate: Probabilidad de que un joint falte en un frame (se escribe como ceros)
+            jitter: Desviación estándar del ruido en píxeles (y en mm para z)
+            n_classes: Número de actividades sintéticas distintas
+            frame_rate: FPS simulados
+            depth: Distancia media del sujeto a la cámara en metros
+            seed: Semilla para que cada ejecución genere los mismos datos
+        """
+        self.n_frames = n_frames
+        self.dropout_rate = dropout_rate
+        self.jitter = jitter
+        self.n_classes = n_classes
+        self.frame_rate = frame_rate
+        self.depth = depth
+        self.seed = seed
+        self.class_names = [f"actividad_{i}" for i in range(n_classes)]
+        
+        # Parámetros de movimiento por clase: frecuencia y amplitud de cada extremidad
+        params_rng = np.random.default_rng(seed)
+        self._class_params = []
+        for _ in range(n_classes):
+            self._class_params.append({
+                limb: (params_rng.uniform(0.2, 1.5), params_rng.uniform(5, 40), params_rng.uniform(0, 2 * np.pi))
+                for limb in LIMB_GROUPS
+            })
+        
+        self._rng = np.random.default_rng(seed + 1)
+    
+    def generate(self, label=None, n_frames=None):
+        """
+        Genera un clip crudo
+        
+        Args:
+            label: Índice o nombre de la clase (None = aleatoria)
+            n_frames: Frames del clip (None = valor del generador)
+        
+        Returns:
+            Tupla con (arreglo frames × 99, nombre_de_clase)
+        """
+        if label is None:
+            class_idx = int(self._rng.integers(self.n_classes))
+        elif isinstance(label, str):
+            class_idx = self.class_names.index(label)
+        else:
+            class_idx = int(label)
+        n_frames = n_frames or self.n_frames
+        
+        t = np.arange(n_frames) / self.frame_rate
+        joints = np.empty((n_frames, 33, 3))
+        joints[:, :, :2] = BASE_POSE_XY
+        joints[:, :, 2] = self.depth
+        
+        # Balanceo del cuerpo completo y movimiento periódico de cada extremidad
+        sway = 3.0 * np.sin(2 * np.pi * 0.3 * t + self._rng.uniform(0, 2 * np.pi))
+        joints[:, :, 0] += sway[:, np.newaxis]
+        for limb, ids in LIMB_GROUPS.items():
+            freq, amplitude, phase = self._class_params[class_idx][limb]
+            wave = np.sin(2 * np.pi * freq * t + phase)
+            # Los joints más alejados del tronco se mueven más
+            gains = np.linspace(0.5, 1.0, len(ids))
+            joints[:, ids, 0] += amplitude * np.outer(wave, gains)
+            joints[:, ids, 1] -= 0.5 * amplitude * np.outer(np.abs(wave), gains)
+            joints[:, ids, 2] += 0.002 * amplitude * np.outer(wave, gains)
+        
+        # Ruido de detección
+        if self.jitter > 0:
+            joints[:, :, :2] += self._rng.normal(0, self.jitter, (n_frames, 33, 2))
+            joints[:, :, 2] += self._rng.normal(0, self.jitter / 1000, (n_frames, 33))
+        joints[:, :, 0] = np.clip(np.round(joints[:, :, 0]), 0, 639)
+        joints[:, :, 1] = np.clip(np.round(joints[:, :, 1]), 0, 479)
+        
+        # Joints perdidos: la captura los escribe como ceros
+        if self.dropout_rate > 0:
+            missing = self._rng.random((n_frames, 33)) < self.dropout_rate
+            joints[missing] = 0.0
+        
+        return joints.reshape(n_frames, 99), self.class_names[class_idx]
+    
+    def generate_dataset(self, clips_per_class=10):
+        """
+        Genera clips balanceados para todas las clases
+        
+        Args:
+            clips_per_class: Clips por cada clase
+        
+        Returns:
+            Tupla con (lista de clips, lista de etiquetas)
+        """
+        clips, labels = [], []
+        for class_idx in range(self.n_classes):
+            for _ in range(clips_per_class):
+                clip, label = self.generate(class_idx)
+                clips.append(clip)
+                labels.append(label)
+        return clips, labels
@@ -4,5 +4,9 @@ Módulo de captura de datos con cámaras RealSense y detección de poses
 
 from .pose_detector import PoseDetector
 from .realsense_capture import RealSenseCapture
+from .capture_buffer import CaptureBuffer
+from .motion_gate import MotionGate
+from .replay_source import ReplayPipeline, ReplayFinished, open_recording, save_npz_recording
 
-__all__ = ['PoseDetector', 'RealSenseCapture']
+__all__ = ['PoseDetector', 'RealSenseCapture', 'CaptureBuffer', 'MotionGate', 'ReplayPipeline', 'ReplayFinished',
+           'open_recording', 'save_npz_recording']
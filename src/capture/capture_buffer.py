@@ -0,0 +1,106 @@
+"""
+Buffer de captura preasignado: coordenadas, máscara de validez y reloj de la cámara por frame
+"""
+
+import numpy as np
+from ..utils.skeleton_sequence import SkeletonSequence
+
+class CaptureBuffer:
+    def __init__(self, capacity, n_joints=33):
+        """
+        Arreglos de tamaño fijo en los que el bucle de captura escribe cada frame sin crear listas
+        
+        Un joint no detectado (o sin profundidad) se marca en la máscara en lugar de escribirse
+        como ceros, así una coordenada real igual a 0 no se confunde con un joint perdido.
+        
+        Args:
+            capacity: Frames máximos (frame_rate × segundos de captura)
+            n_joints: Joints por frame
+        """
+        self.capacity = capacity
+        self.n_joints = n_joints
+        self._joints = np.zeros((capacity, n_joints, 3), dtype=np.float32)
+        self._valid = np.zeros((capacity, n_joints), dtype=bool)
+        self._timestamps = np.full(capacity, np.nan)
+        self._frame_numbers = np.full(capacity, -1, dtype=np.int64)
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def is_full(self):
+        return self.count >= self.capacity
+    
+    def write(self, joints, valid, timestamp=None, frame_number=None):
+        """
+        Copia un frame en la siguiente posición libre
+        
+        Args:
+            joints: Arreglo (n_joints × 3) con x, y en píxeles y z en metros
+            valid: Máscara (n_joints,) de joints detectados con profundidad
+            timestamp: Segundos según el reloj de la cámara (None = desconocido)
+            frame_number: Contador de frames de la cámara (None = desconocido)
+        """
+        if self.count >= self.capacity:
+            raise IndexError(f"El buffer de captura está lleno ({self.capacity} frames)")
+        i = self.count
+        self._joints[i] = joints
+        self._valid[i] = valid
+        self._timestamps[i] = np.nan if timestamp is None else timestamp
+        self._frame_numbers[i] = -1 if frame_number is None else frame_number
+        self.count += 1
+    
+    def clear(self):
+        """Vacía el buffer sin liberar la memoria"""
+        self.count = 0
+    
+    @property
+    def joints(self):
+        """Vista (frames × n_joints × 3) de los frames escritos"""
+        return self._joints[:self.count]
+    
+    @property
+    def valid(self):
+        """Vista (frames × n_joints) de la máscara de validez"""
+        return self._valid[:self.count]
+    
+    @property
+    def timestamps(self):
+        """
+        Segundos desde el primer frame, o None si la fuente no expuso el reloj de algún frame
+        """
+        times = self._timestamps[:self.count]
+        if self.count == 0 or np.isnan(times).any():
+            return None
+        return times - times[0]
+    
+    @property
+    def frame_numbers(self):
+        """Números de frame de la cámara, o None si la fuente no los expuso"""
+        numbers = self._frame_numbers[:self.count]
+        if self.count == 0 or (numbers < 0).any():
+            return None
+        return numbers
+    
+    def skipped_frames(self):
+        """Frames de la cámara que no llegaron al buffer (saltos en el contador)"""
+        numbers = self.frame_numbers
+        if numbers is None or len(numbers) < 2:
+            return 0
+        return int(np.clip(np.diff(numbers) - 1, 0, None).sum())
+    
+    def to_sequence(self):
+        """
+        SkeletonSequence sobre los frames escritos (las coordenadas y la máscara no se copian)
+        """
+        return SkeletonSequence(self.joints, self.valid, self.timestamps)
+    
+    def frame_vectors(self):
+        """
+        Frames con el formato de los CSV de captura (ceros en los joints inválidos)
+        
+        Returns:
+            Arreglo (frames × n_joints·3) float64
+        """
+        vectors = np.where(self.valid[:, :, np.newaxis], self.joints, 0.0)
+        return vectors.reshape(self.count, -1).astype(np.float64)
@@ -0,0 +1,83 @@
+"""
+Muestreo vectorizado de profundidad para los landmarks de un frame
+"""
+
+import warnings
+import numpy as np
+
+class DepthSampler:
+    def __init__(self, depth_scale=0.001, neighborhood=0):
+        """
+        Inicializa el muestreador de profundidad
+        
+        Args:
+            depth_scale: Metros por unidad z16 del sensor (0.001 por defecto en cámaras D400)
+            neighborhood: Radio en píxeles de la mediana local (0 = solo el píxel, igual a get_distance);
+                          los píxeles sin profundidad (0) se ignoran para rellenar huecos
+        """
+        self.depth_scale = depth_scale
+        self.neighborhood = int(neighborhood)
+        
+        # Desplazamientos de la ventana (2r+1)×(2r+1) precalculados
+        r = self.neighborhood
+        dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+        self._offsets_x = dx.ravel()
+        self._offsets_y = dy.ravel()
+    
+    @classmethod
+    def from_profile(cls, profile, neighborhood=0):
+        """
+        Crea un muestreador con la escala de profundidad del dispositivo
+        
+        Args:
+            profile: pipeline_profile devuelto por pipeline.start()
+            neighborhood: Radio de la mediana local
+        """
+        depth_scale = profile.get_device().first_depth_sensor().get_depth_scale()
+        return cls(depth_scale, neighborhood)
+    
+    def depth_image(self, depth):
+        """
+        Devuelve el buffer z16 como arreglo numpy (vista sin copia)
+        
+        Args:
+            depth: depth_frame de RealSense o arreglo (alto × ancho)
+        """
+        if isinstance(depth, np.ndarray):
+            return depth
+        return np.asanyarray(depth.get_data())
+    
+    def sample(self, depth, xs, ys):
+        """
+        Obtiene la profundidad en metros de varios píxeles con una sola indexación
+        
+        Args:
+            depth: depth_frame de RealSense o arreglo z16 (alto × ancho)
+            xs: Coordenadas x en píxeles
+            ys: Coordenadas y en píxeles
+            
+        Returns:
+            Arreglo float con la profundidad en metros (0 para píxeles fuera de la imagen o sin dato)
+        """
+        image = self.depth_image(depth)
+        h, w = image.shape[:2]
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+        inside = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+        
+        if self.neighborhood == 0:
+            raw = image[np.clip(ys, 0, h - 1), np.clip(xs, 0, w - 1)].astype(np.float64)
+        else:
+            # Ventana alrededor de cada punto, recortada a los bordes de la imagen
+            px = np.clip(xs[:, np.newaxis] + self._offsets_x, 0, w - 1)
+            py = np.clip(ys[:, np.newaxis] + self._offsets_y, 0, h - 1)
+            patches = image[py, px].astype(np.float64)
+            patches[patches == 0] = np.nan
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                raw = np.nanmedian(patches, axis=1)
+            raw[np.isnan(raw)] = 0.0
+        
+        depths = raw * self.depth_scale
+        depths[~inside] = 0.0
+        return depths
@@ -0,0 +1,441 @@
+"""
+Distribución de frames: un único productor por pipeline y múltiples suscriptores
+(vista previa, grabación, reconocimiento) que comparten el mismo frame y la misma pose
+"""
+
+import threading
+import time
+from collections import deque
+import numpy as np
+from ..utils.rate_meter import RateMeter
+from ..utils.stage_timer import STAGE_TIMER
+from ..utils.trace_recorder import TRACER
+from .replay_source import ReplayFinished
+
+class FramePacket:
+    """Frame de color/profundidad con la pose ya inferida. Se comparte entre suscriptores: tratar como solo lectura"""
+    
+    __slots__ = ('index', 'timestamp', 'frames', 'color_image', 'depth_frame',
+                 'pose_results', 'joints_3d', 'frame_vector', 'device_timestamp', 'frame_number',
+                 'joint_coords', 'joint_valid', 'pose_reused')
+    
+    def __init__(self, index, timestamp, frames, color_image, depth_frame,
+                 pose_results=None, joints_3d=None, frame_vector=None,
+                 device_timestamp=None, frame_number=None, joint_coords=None, joint_valid=None):
+        self.index = index
+        self.timestamp = timestamp
+        self.device_timestamp = device_timestamp  # Segundos según el reloj de la cámara
+        self.frame_number = frame_number          # Contador de la cámara (los saltos son frames perdidos)
+        self.joint_coords = joint_coords          # Arreglo float32 33 × 3 (x, y en píxeles, z en metros)
+        self.joint_valid = joint_valid            # Máscara (33,) de joints detectados con profundidad
+        self.frames = frames              # Frameset de RealSense (se mantiene vivo con keep())
+        self.color_image = color_image    # Vista numpy del buffer de color (sin copia)
+        self.depth_frame = depth_frame
+        self.pose_results = pose_results
+        self.joints_3d = joints_3d or []
+        self.frame_vector = frame_vector  # 99 valores con el formato de captura
+        self.pose_reused = False          # La pose es la del último frame inferido (MotionGate)
+
+def read_frame_clock(frame):
+    """
+    Marca de tiempo y número de frame asignados por la cámara
+    
+    Args:
+        frame: Frame o frameset de RealSense (o de ReplayPipeline)
+        
+    Returns:
+        Tupla (segundos, número_de_frame); (None, None) si la fuente no los expone
+    """
+    try:
+        return frame.get_timestamp() / 1000.0, int(frame.get_frame_number())
+    except (AttributeError, RuntimeError):
+        return None, None
+
+class FrameSubscriber:
+    def __init__(self, producer, name, queue_size=0):
+        """
+        Suscriptor de un FrameProducer
+        
+        Args:
+            producer: Productor al que está suscrito
+            name: Nombre del consumidor (para diagnóstico)
+            queue_size: 0 = solo el frame más reciente; >0 = cola acotada con todos los frames
+        """
+        self.producer = producer
+        self.name = name
+        self.queue_size = queue_size
+        self.dropped = 0
+        self.closed = False
+        
+        self._condition = threading.Condition()
+        self._queue = deque() if queue_size > 0 else None
+        self._latest = None
+        self._last_index = -1
+    
+    def _has_data(self):
+        if self._queue is not None:
+            return len(self._queue) > 0
+        return self._latest is not None and self._latest.index > self._last_index
+    
+    def _publish(self, packet):
+        """Recibe un paquete del productor (llamado desde el hilo productor)"""
+        with self._condition:
+            if self._queue is not None:
+                if len(self._queue) >= self.queue_size:
+                    self._queue.popleft()
+                    self.dropped += 1
+                self._queue.append(packet)
+            else:
+                if self._has_data():
+                    self.dropped += 1
+                self._latest = packet
+            self._condition.notify_all()
+    
+    def get(self, timeout=None):
+        """
+        Obtiene el siguiente frame: el más antiguo de la cola o el más reciente no leído
+        
+        Args:
+            timeout: Segundos máximos de espera (None = esperar indefinidamente)
+            
+        Returns:
+            FramePacket o None si se agotó el tiempo o el productor se detuvo
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._has_data() or self.closed, timeout):
+                return None
+            if not self._has_data():
+                return None
+            if self._queue is not None:
+                return self._queue.popleft()
+            self._last_index = self._latest.index
+            return self._latest
+    
+    def close(self):
+        """Cancela la suscripción"""
+        self.producer.unsubscribe(self)
+        self._mark_closed()
+    
+    def _mark_closed(self):
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+class FrameProducer:
+    def __init__(self, pipeline, pose_detector=None, name="camera_1", pose_pool=None, motion_gate=None):
+        """
+        Inicializa el productor de frames de un pipeline
+        
+        Args:
+            pipeline: Pipeline de RealSense del que se leen los frames
+            pose_detector: Detector con detect_pose/get_joint_coordinates/joints_to_frame
+                           (None = no inferir pose)
+            name: Nombre del hilo productor
+            pose_pool: PoseWorkerPool opcional; si se indica, el hilo de captura solo
+                       marca y encola los frames y la pose se infiere en el pool
+                       (el productor se encarga de iniciarlo y detenerlo)
+            motion_gate: MotionGate opcional; en los frames que descarta se reutiliza
+                         la última pose en lugar de inferirla
+        """
+        self.pipeline = pipeline
+        self.pose_detector = pose_detector
+        self.name = name
+        self.pose_pool = pose_pool
+        self.motion_gate = motion_gate
+        
+        self.frames_produced = 0
+        self.frames_gated = 0              # Frames publicados con la pose reutilizada
+        self.capture_rate = RateMeter()    # FPS leídos del sensor
+        self.inference_rate = RateMeter()  # FPS con pose inferida
+        self._subscribers = []
+        self._subscribers_lock = threading.Lock()
+        self._running = False
+        self._thread = None
+        
+        # Paquetes esperando su turno de publicación con pool, por índice de frame y en orden de
+        # captura: los enviados al pool esperan su pose y los omitidos por la compuerta, a que se
+        # publiquen los anteriores (así reutilizan la pose del frame inferido que los precede)
+        self._pending_packets = {}
+        self._pending_lock = threading.Lock()
+        self._publish_lock = threading.Lock()  # Publicaciones del pool y de frames omitidos, en orden
+        self._publisher_thread = None
+        
+        # Última pose inferida (resultados, joints 3D, coordenadas, máscara, vector) para los frames omitidos
+        self._last_pose = None
+        self._pose_requested = False
+        self._full_rate_holds = 0
+        self._holds_lock = threading.Lock()
+    
+    def hold_full_rate(self, hold=True):
+        """
+        Desactiva la compuerta de movimiento mientras haya retenciones activas (p. ej. al grabar
+        una actividad, donde cada frame debe tener su propia pose)
+        
+        Args:
+            hold: True agrega una retención, False libera una
+        """
+        with self._holds_lock:
+            self._full_rate_holds = self._full_rate_holds + 1 if hold else max(0, self._full_rate_holds - 1)
+    
+    def subscribe(self, name, queue_size=0):
+        """
+        Registra un nuevo consumidor
+        
+        Args:
+            name: Nombre del consumidor
+            queue_size: 0 = solo el frame más reciente; >0 = cola acotada
+            
+        Returns:
+            FrameSubscriber
+        """
+        subscriber = FrameSubscriber(self, name, queue_size)
+        with self._subscribers_lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber):
+        """Elimina un consumidor"""
+        with self._subscribers_lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+    
+    def is_running(self):
+        """Indica si el hilo productor está activo"""
+        return self._running
+    
+    def dropped_frames(self):
+        """
+        Frames descartados por el pool de pose y por los suscriptores con cola acotada
+        (los de solo el más reciente saltan frames por diseño y no se cuentan)
+        
+        Returns:
+            Diccionario origen -> frames descartados
+        """
+        dropped = {}
+        if self.pose_pool is not None:
+            dropped['pose_pool'] = self.pose_pool.frames_dropped
+        with self._subscribers_lock:
+            for subscriber in self._subscribers:
+                if subscriber.queue_size > 0:
+                    dropped[subscriber.name] = subscriber.dropped
+        return dropped
+    
+    def start(self):
+        """Inicia el hilo productor"""
+        if self._running:
+            return
+        self._running = True
+        
+        if self.pose_pool is not None:
+            self.pose_pool.start()
+            self._publisher_thread = threading.Thread(target=self._publish_loop,
+                                                      name=f"{self.name}_publisher", daemon=True)
+            self._publisher_thread.start()
+        
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Detiene el hilo productor y cierra todas las suscripciones"""
+        self._running = False
+        for thread in (self._thread, self._publisher_thread):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=2.0)
+        self._thread = None
+        self._publisher_thread = None
+        
+        if self.pose_pool is not None:
+            self.pose_pool.stop()
+        with self._pending_lock:
+            self._pending_packets.clear()
+        
+        self._close_subscribers()
+    
+    def _close_subscribers(self):
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+        for subscriber in subscribers:
+            subscriber._mark_closed()
+    
+    def _run(self):
+        """Bucle del productor: un wait_for_frames y una inferencia de pose por frame"""
+        while self._running:
+            try:
+                with STAGE_TIMER.stage("capture.wait_for_frames"):
+                    frames = self.pipeline.wait_for_frames()
+                
+                color_frame = frames.get_color_frame()
+                depth_frame = frames.get_depth_frame()
+                if not color_frame or not depth_frame:
+                    continue
+                
+                self.capture_rate.tick()
+                
+                # Mantener el frameset vivo mientras los consumidores lo usan
+                frames.keep()
+                color_image = np.asanyarray(color_frame.get_data())
+                
+                device_timestamp, frame_number = read_frame_clock(color_frame)
+                packet = FramePacket(self.frames_produced, time.time(), frames, color_image, depth_frame,
+                                     device_timestamp=device_timestamp, frame_number=frame_number)
+                self.frames_produced += 1
+                
+                if not self._should_infer(packet):
+                    # Escena vacía o quieta: se reutiliza la última pose sin llamar a MediaPipe
+                    packet.pose_reused = True
+                    if self.pose_pool is None:
+                        self._reuse_pose(packet)
+                        self._publish(packet)
+                    else:
+                        # Detrás de los frames que siguen en el pool, para no adelantarlos
+                        with self._pending_lock:
+                            self._pending_packets[packet.index] = packet
+                        self._publish_reused()
+                    continue
+                
+                self._pose_requested = True
+                if self.pose_pool is not None:
+                    # Solo marcar y encolar: la inferencia ocurre en el pool
+                    with self._pending_lock:
+                        self._pending_packets[packet.index] = packet
+                    self.pose_pool.submit(packet.index, packet.timestamp, color_image)
+                    continue
+                
+                if self.pose_detector is not None:
+                    self._complete_packet(packet, self.pose_detector.detect_pose(color_image))
+                
+                self._publish(packet)
+                
+            except ReplayFinished:
+                # Fin de una grabación: publicar lo que quede en el pool y cerrar los suscriptores
+                print(f"Productor de frames '{self.name}': fin de la reproducción")
+                self._drain_pending()
+                self._running = False
+                self._close_subscribers()
+                break
+            except Exception as e:
+                if self._running:
+                    print(f"Error en productor de frames '{self.name}': {e}")
+                    time.sleep(0.1)
+    
+    def _should_infer(self, packet):
+        """
+        Consulta la compuerta de movimiento (si hay) para decidir si inferir la pose del paquete
+        
+        La compuerta evalúa todos los frames para mantener su estado, pero se infiere igualmente
+        si aún no se pidió ninguna pose o si hay retenciones de velocidad completa. Con pool, los
+        frames omitidos no esperan a la inferencia: se publican en orden tras los que tienen delante.
+        """
+        if self.motion_gate is None:
+            return True
+        
+        depth_image = None
+        depth_sampler = getattr(self.pose_detector, 'depth_sampler', None)
+        if depth_sampler is not None and packet.depth_frame is not None:
+            depth_image = depth_sampler.depth_image(packet.depth_frame)
+        
+        with STAGE_TIMER.stage("pose.motion_gate"):
+            infer = self.motion_gate.should_infer(packet.color_image, depth_image)
+        
+        return infer or not self._pose_requested or self._full_rate_holds > 0
+    
+    def _reuse_pose(self, packet):
+        """Copia al paquete (por referencia, son de solo lectura) la última pose inferida"""
+        if self._last_pose is None:
+            # El pool descartó las inferencias anteriores: el frame sale sin pose
+            packet.joint_coords = np.zeros((33, 3), dtype=np.float32)
+            packet.joint_valid = np.zeros(33, dtype=bool)
+            packet.frame_vector = np.zeros(99)
+        else:
+            (packet.pose_results, packet.joints_3d, packet.joint_coords,
+             packet.joint_valid, packet.frame_vector) = self._last_pose
+        packet.pose_reused = True
+        self.frames_gated += 1
+    
+    def _publish_reused(self):
+        """Publica los frames omitidos que encabezan la cola de pendientes (ya no tienen nada delante)"""
+        with self._publish_lock:
+            while True:
+                with self._pending_lock:
+                    if not self._pending_packets:
+                        return
+                    index = next(iter(self._pending_packets))
+                    packet = self._pending_packets[index]
+                    if not packet.pose_reused:
+                        return
+                    del self._pending_packets[index]
+                
+                self._reuse_pose(packet)
+                self._publish(packet)
+    
+    def _drain_pending(self, timeout=5.0):
+        """Espera a que el pool publique los frames ya encolados"""
+        deadline = time.monotonic() + timeout
+        while self.pose_pool is not None and time.monotonic() < deadline:
+            with self._pending_lock:
+                if not self._pending_packets:
+                    return
+            time.sleep(0.01)
+    
+    def _publish_loop(self):
+        """Recibe del pool los resultados ya ordenados por índice y publica los paquetes"""
+        while self._running:
+            item = self.pose_pool.get_result(timeout=0.5)
+            if item is None:
+                continue
+            index, _, results = item
+            
+            with self._publish_lock:
+                with self._pending_lock:
+                    if index not in self._pending_packets:
+                        continue
+                    # Los índices menores que siguen pendientes son frames omitidos (se publican
+                    # antes, con la pose anterior) o frames que el pool descartó
+                    ready = []
+                    for pending_index in list(self._pending_packets):
+                        if pending_index > index:
+                            break
+                        packet = self._pending_packets.pop(pending_index)
+                        if pending_index == index or packet.pose_reused:
+                            ready.append(packet)
+                
+                for packet in ready:
+                    try:
+                        if packet.pose_reused:
+                            self._reuse_pose(packet)
+                        else:
+                            self._complete_packet(packet, results)
+                        self._publish(packet)
+                    except Exception as e:
+                        print(f"Error publicando frame {packet.index} en '{self.name}': {e}")
+            
+            # Frames omitidos que esperaban a este
+            self._publish_reused()
+    
+    @TRACER.traced("producer.complete_packet", "capture")
+    def _complete_packet(self, packet, pose_results):
+        """Agrega al paquete la pose, los joints 3D, las coordenadas con su máscara y el vector de 99 valores"""
+        packet.pose_results = pose_results
+        self.inference_rate.tick()
+        if self.pose_detector is not None and pose_results is not None:
+            packet.joints_3d = self.pose_detector.get_joint_coordinates(pose_results, packet.depth_frame)
+            packet.joint_coords, packet.joint_valid = self.pose_detector.joints_to_arrays(packet.joints_3d)
+            packet.frame_vector = np.where(packet.joint_valid[:, np.newaxis], packet.joint_coords, 0.0).ravel()
+        else:
+            packet.joint_coords = np.zeros((33, 3), dtype=np.float32)
+            packet.joint_valid = np.zeros(33, dtype=bool)
+            packet.frame_vector = np.zeros(99)
+        
+        self._last_pose = (packet.pose_results, packet.joints_3d, packet.joint_coords,
+                           packet.joint_valid, packet.frame_vector)
+        if self.motion_gate is not None:
+            self.motion_gate.report_pose(getattr(pose_results, 'pose_landmarks', None) is not None)
+    
+    @TRACER.traced("producer.publish", "capture")
+    def _publish(self, packet):
+        """Entrega el paquete a todos los suscriptores"""
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber._publish(packet)
@@ -5,20 +5,31 @@ Detector de poses mejorado usando MediaPipe - Compatible con test_camera.py
 import cv2
 import numpy as np
 import mediapipe as mp
+from .depth_sampler import DepthSampler
+from .pose_workers import warm_up_pose
+from .pose_roi import PoseROI, process_pose
+from ..utils.stage_timer import STAGE_TIMER
 
 class GUIPoseDetector:
     """Detector de poses optimizado para la GUI - Idéntico a test_camera.py"""
     
-    def __init__(self):
+    def __init__(self, roi_size=None):
+        """
+        Args:
+            roi_size: Lado de la imagen de inferencia recortada alrededor de la persona (PoseROI);
+                      None = procesar siempre el frame completo
+        """
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,
-            smooth_landmarks=True,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        # El grafo de MediaPipe se crea al inferir por primera vez: con un PoseWorkerPool
+        # este detector solo dibuja y lee profundidad, y nunca necesita su propio Pose
+        self._pose = None
+        
+        # Región de interés: recorte alrededor de la persona del frame anterior
+        self.roi = PoseROI(roi_size) if roi_size else None
+        
+        # Lectura vectorizada de profundidad (RealSenseCapture asigna la escala del dispositivo)
+        self.depth_sampler = DepthSampler()
         
         # Diccionario de nombres de joints en español
         self.joint_names = {
@@ -33,10 +44,33 @@ class GUIPoseDetector:
             29: "Talón Izq", 30: "Talón Der", 31: "Pie Izq", 32: "Pie Der"
         }
     
+    @property
+    def pose(self):
+        """Instancia de mp.solutions.pose.Pose del detector (se crea al primer uso)"""
+        if self._pose is None:
+            self._pose = self.mp_pose.Pose(
+                static_image_mode=False,
+                model_complexity=1,
+                smooth_landmarks=True,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
+        return self._pose
+    
+    def warm_up(self, resolution=(640, 480)):
+        """
+        Inferencia de prueba sobre un frame negro (fuera de STAGE_TIMER) para que la primera
+        detección real no sea lenta
+        
+        Args:
+            resolution: (ancho, alto) de los frames de la cámara
+        """
+        warm_up_pose(self.pose, resolution)
+    
     def detect_pose(self, image):
         """Detecta poses en la imagen - Idéntico a test_camera.py"""
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        results = self.pose.process(image_rgb)
+        with STAGE_TIMER.stage("pose.mediapipe"):
+            results = process_pose(self.pose, image, self.roi)
         return results
     
     def draw_landmarks(self, image, results, show_names=False):
@@ -62,29 +96,66 @@ class GUIPoseDetector:
                                   cv2.FONT_HERSHEY_SIMPLEX, 0.3, (255, 255, 0), 1)
     
     def get_joint_coordinates(self, results, depth_frame=None):
-        """Extrae coordenadas 3D de los joints detectados - Idéntico a test_camera.py"""
+        """Extrae coordenadas 3D de los joints detectados - Profundidad leída en bloque para los 33 joints"""
         joints_3d = []
         if results.pose_landmarks:
             h, w = 480, 640  # Resolución de la cámara
             
-            for idx, landmark in enumerate(results.pose_landmarks.landmark):
-                x = int(landmark.x * w)
-                y = int(landmark.y * h)
-                
-                # Obtener coordenada Z del sensor de profundidad si está disponible
-                z = 0
-                if depth_frame and 0 <= x < w and 0 <= y < h:
-                    z = depth_frame.get_distance(x, y)
-                
+            landmarks = results.pose_landmarks.landmark
+            normalized = np.array([(lm.x, lm.y, lm.visibility) for lm in landmarks])
+            xs = (normalized[:, 0] * w).astype(int)
+            ys = (normalized[:, 1] * h).astype(int)
+            
+            # Obtener coordenada Z del sensor de profundidad si está disponible
+            if depth_frame is not None:
+                with STAGE_TIMER.stage("pose.depth_lookup"):
+                    zs = self.depth_sampler.sample(depth_frame, xs, ys)
+            else:
+                zs = np.zeros(len(xs))
+            
+            for idx in range(len(xs)):
                 joints_3d.append({
                     'id': idx,
                     'name': self.joint_names[idx],
-                    'x': x, 'y': y, 'z': z,
-                    'confidence': landmark.visibility
+                    'x': int(xs[idx]), 'y': int(ys[idx]), 'z': float(zs[idx]),
+                    'confidence': float(normalized[idx, 2])
                 })
         
         return joints_3d
     
+    def joints_to_arrays(self, joints_3d, resolution=(640, 480)):
+        """
+        Convierte la lista de joints en coordenadas y máscara de validez
+        
+        Args:
+            joints_3d: Lista de diccionarios devuelta por get_joint_coordinates
+            resolution: Resolución (ancho, alto) para validar coordenadas
+            
+        Returns:
+            Tupla (arreglo float32 33 × 3, máscara (33,) de joints dentro de la imagen y con profundidad)
+        """
+        coords = np.zeros((33, 3), dtype=np.float32)
+        valid = np.zeros(33, dtype=bool)
+        for joint in joints_3d:
+            x, y, z = joint['x'], joint['y'], joint['z']
+            coords[joint['id']] = (x, y, z)
+            valid[joint['id']] = 0 <= x < resolution[0] and 0 <= y < resolution[1] and z > 0
+        return coords, valid
+    
+    def joints_to_frame(self, joints_3d, resolution=(640, 480)):
+        """
+        Convierte la lista de joints en un frame de 99 valores con el formato de captura
+        
+        Args:
+            joints_3d: Lista de diccionarios devuelta por get_joint_coordinates
+            resolution: Resolución (ancho, alto) para validar coordenadas
+            
+        Returns:
+            Lista con x, y, z de los 33 joints (ceros para joints inválidos o sin profundidad)
+        """
+        coords, valid = self.joints_to_arrays(joints_3d, resolution)
+        return np.where(valid[:, np.newaxis], coords, 0.0).ravel().tolist()
+    
     def count_detected_joints(self, results):
         """Cuenta cuántos joints fueron detectados"""
         if results.pose_landmarks:
@@ -0,0 +1,151 @@
+"""
+Compuerta de inferencia de pose por movimiento y presencia: evita ejecutar MediaPipe en cada
+frame cuando la escena está vacía o quieta
+"""
+
+import numpy as np
+
+GATE_STATES = ("motion", "static", "empty")
+
+class MotionGate:
+    def __init__(self, downscale=8, pixel_threshold=20, motion_fraction=0.005,
+                 depth_scale=0.001, presence_margin=0.15, presence_fraction=0.01,
+                 static_interval=5, idle_interval=15, background_rate=0.02):
+        """
+        Decide frame a frame si hace falta inferir la pose
+        
+        Trabaja sobre una versión reducida de la imagen (un píxel de cada downscale, sin copiar ni
+        redimensionar): la energía de movimiento es la fracción de píxeles cuyo gris cambió más de
+        pixel_threshold respecto al frame anterior, y la ocupación es la fracción de píxeles con
+        profundidad más cercana que el fondo aprendido. Con movimiento se infiere en el mismo frame;
+        con una persona quieta, cada static_interval frames; con la escena vacía, cada idle_interval.
+        
+        Args:
+            downscale: Paso de muestreo de la imagen (8 → 80 × 60 para 640 × 480)
+            pixel_threshold: Cambio mínimo de gris (0-255) para contar un píxel como movido
+            motion_fraction: Fracción de píxeles movidos a partir de la cual hay movimiento
+            depth_scale: Metros por unidad z16 del sensor
+            presence_margin: Metros que un píxel debe estar por delante del fondo para ser primer plano
+            presence_fraction: Fracción de píxeles en primer plano a partir de la cual hay alguien
+            static_interval: Frames entre inferencias con una persona quieta
+            idle_interval: Frames entre inferencias con la escena vacía y quieta
+            background_rate: Adaptación del fondo por frame mientras no se detecta a nadie
+        """
+        self.downscale = max(1, int(downscale))
+        self.pixel_threshold = pixel_threshold
+        self.motion_fraction = motion_fraction
+        self.depth_scale = depth_scale
+        self.presence_margin = presence_margin
+        self.presence_fraction = presence_fraction
+        self.static_interval = max(1, int(static_interval))
+        self.idle_interval = max(1, int(idle_interval))
+        self.background_rate = background_rate
+        
+        self.frames_seen = 0
+        self.frames_inferred = 0
+        self.state = "motion"
+        self.motion = 0.0
+        self.occupancy = 0.0
+        self.reset()
+    
+    def reset(self):
+        """Olvida el frame anterior y el fondo; el siguiente frame siempre se infiere"""
+        self._gray = None
+        self._previous_gray = None
+        self._background = None
+        self._person_detected = False
+        self._since_inference = None
+    
+    def should_infer(self, color_image, depth_image=None):
+        """
+        Evalúa el frame y decide si inferir la pose
+        
+        Args:
+            color_image: Imagen BGR (alto × ancho × 3)
+            depth_image: Buffer z16 (alto × ancho) alineado, o None para decidir solo por movimiento
+        
+        Returns:
+            True si hay que inferir; False si basta con reutilizar la última pose
+        """
+        self.frames_seen += 1
+        step = self.downscale
+        
+        self.motion = self._motion_energy(color_image[::step, ::step])
+        if depth_image is not None:
+            self.occupancy = self._occupancy(depth_image[::step, ::step])
+            present = self.occupancy >= self.presence_fraction or self._person_detected
+        else:
+            present = self._person_detected
+        
+        if self.motion >= self.motion_fraction:
+            self.state, interval = "motion", 1
+        elif present:
+            self.state, interval = "static", self.static_interval
+        else:
+            self.state, interval = "empty", self.idle_interval
+        
+        if self._since_inference is not None and self._since_inference + 1 < interval:
+            self._since_inference += 1
+            return False
+        
+        self._since_inference = 0
+        self.frames_inferred += 1
+        return True
+    
+    def report_pose(self, detected):
+        """
+        Informa el resultado de la última inferencia
+        
+        Mientras no se detecta a nadie el fondo de profundidad se adapta a la escena.
+        
+        Args:
+            detected: MediaPipe encontró una persona
+        """
+        self._person_detected = bool(detected)
+    
+    def skip_ratio(self):
+        """Fracción de frames en los que no se infirió la pose"""
+        if self.frames_seen == 0:
+            return 0.0
+        return 1.0 - self.frames_inferred / self.frames_seen
+    
+    def _motion_energy(self, small):
+        """Fracción de píxeles cuyo gris cambió más de pixel_threshold desde el frame anterior"""
+        if self._gray is None or self._gray.shape != small.shape[:2]:
+            self._gray = np.empty(small.shape[:2], dtype=np.int32)
+            self._previous_gray = None
+        
+        # Gris como suma de canales (0-765) en un buffer reutilizado; se alterna con el anterior.
+        # Dos sumas de canales separados son ~10x más rápidas que reducir el eje de 3 elementos.
+        np.add(small[..., 0], small[..., 1], out=self._gray, dtype=np.int32)
+        np.add(self._gray, small[..., 2], out=self._gray)
+        previous = self._previous_gray
+        if previous is None:
+            self._previous_gray = self._gray.copy()
+            self._gray = np.empty_like(self._gray)
+            return 1.0
+        
+        changed = np.abs(self._gray - previous) > 3 * self.pixel_threshold
+        self._gray, self._previous_gray = previous, self._gray
+        return float(changed.mean())
+    
+    def _occupancy(self, small_depth):
+        """Fracción de píxeles con profundidad válida que están por delante del fondo"""
+        depth = small_depth.astype(np.float32) * self.depth_scale
+        valid = depth > 0
+        if self._background is None or self._background.shape != depth.shape:
+            self._background = np.where(valid, depth, 0.0).astype(np.float32)
+            return 0.0
+        
+        background = self._background
+        known = valid & (background > 0)
+        foreground = known & (depth < background - self.presence_margin)
+        occupancy = float(foreground.sum()) / max(int(valid.sum()), 1)
+        
+        # El fondo es lo más lejano visto en cada píxel; sin nadie en escena además sigue
+        # lentamente a la profundidad actual para absorber objetos que se movieron
+        np.maximum(background, np.where(valid, depth, 0.0), out=background)
+        if not self._person_detected:
+            background += np.where(valid, self.background_rate * (depth - background), 0.0).astype(np.float32)
+        
+        return occupancy
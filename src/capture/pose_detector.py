@@ -5,9 +5,10 @@ Detector de poses usando MediaPipe para la captura de coordenadas 3D
 import cv2
 import numpy as np
 import mediapipe as mp
+from .pose_roi import PoseROI, process_pose
 
 class PoseDetector:
-    def __init__(self, mode=False, upBody=False, smooth=True, detectionCon=True, trackCon=0.5):
+    def __init__(self, mode=False, upBody=False, smooth=True, detectionCon=True, trackCon=0.5, roi_size=None):
         """
         Inicializa el detector de poses usando MediaPipe
         
@@ -17,6 +18,8 @@ class PoseDetector:
             smooth: Si True, suaviza las coordenadas entre frames
             detectionCon: Confianza mínima para detección
             trackCon: Confianza mínima para tracking
+            roi_size: Lado de la imagen de inferencia recortada alrededor de la persona (PoseROI);
+                      None = procesar siempre el frame completo
         """
         self.mode = mode
         self.upBody = upBody
@@ -26,13 +29,21 @@ class PoseDetector:
 
         self.mpDraw = mp.solutions.drawing_utils
         self.mpPose = mp.solutions.pose
-        self.pose = self.mpPose.Pose(
-            self.mode, 
-            self.upBody, 
-            self.smooth, 
-            self.detectionCon, 
-            self.trackCon
-        )
+        self._pose = None  # Se crea en el primer findPose (los productores con workers no lo usan)
+        self.roi = PoseROI(roi_size) if roi_size else None
+
+    @property
+    def pose(self):
+        """Instancia de mp.solutions.pose.Pose del detector (se crea al primer uso)"""
+        if self._pose is None:
+            self._pose = self.mpPose.Pose(
+                self.mode, 
+                self.upBody, 
+                self.smooth, 
+                self.detectionCon, 
+                self.trackCon
+            )
+        return self._pose
 
     def findPose(self, img, draw=True):
         """
@@ -45,9 +56,9 @@ class PoseDetector:
         Returns:
             Tupla con (imagen_con_poses, esqueleto_en_fondo_negro)
         """
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
         blackBG = np.zeros((img.shape[0], img.shape[1], 3), np.uint8)
-        self.results = self.pose.process(imgRGB)
+        # Landmarks siempre normalizados respecto a img, aunque se infiera sobre un recorte
+        self.results = process_pose(self.pose, img, self.roi)
         
         if self.results.pose_landmarks:
             if draw:
@@ -0,0 +1,143 @@
+"""
+Inferencia de pose sobre una región de interés: recorte alrededor de la persona, redimensionado
+a un tamaño de inferencia pequeño y landmarks devueltos en coordenadas del frame completo
+"""
+
+import cv2
+import numpy as np
+
+class PoseROI:
+    def __init__(self, inference_size=256, padding=0.25, min_visibility=0.5, min_landmarks=6):
+        """
+        Región de interés que sigue a la persona entre frames
+        
+        El recorte es cuadrado (no se deforma al redimensionarlo a inference_size × inference_size)
+        y rodea el rectángulo de los landmarks visibles del frame anterior con un margen de padding.
+        Solo se mueve cuando la persona se acerca a su borde o pasa a ocupar mucho menos, así
+        MediaPipe no pierde el seguimiento en cada frame. Sin persona detectada, o si el recorte no
+        sería menor que el frame, se procesa el frame completo.
+        
+        Args:
+            inference_size: Lado en píxeles de la imagen que recibe MediaPipe
+            padding: Margen a cada lado, como fracción del lado mayor del rectángulo de la persona
+            min_visibility: Visibilidad mínima de un landmark para usarlo al ubicar la región
+            min_landmarks: Landmarks visibles necesarios para recortar (con menos, frame completo)
+        """
+        self.inference_size = int(inference_size)
+        self.padding = padding
+        self.min_visibility = min_visibility
+        self.min_landmarks = min_landmarks
+        self.reset()
+    
+    def reset(self):
+        """Vuelve al frame completo"""
+        self.region = None
+        self.frames_cropped = 0
+        self.frames_full = 0
+    
+    def prepare(self, image):
+        """
+        Imagen RGB que se pasa a MediaPipe
+        
+        Args:
+            image: Frame BGR completo
+        
+        Returns:
+            Tupla (imagen_rgb, región) con región = (x0, y0, lado) en píxeles, o None para el frame completo
+        """
+        region = self.region
+        if region is None:
+            self.frames_full += 1
+            return cv2.cvtColor(image, cv2.COLOR_BGR2RGB), None
+        
+        x0, y0, side = region
+        size = self.inference_size
+        crop = image[y0:y0 + side, x0:x0 + side]
+        interpolation = cv2.INTER_AREA if side > size else cv2.INTER_LINEAR
+        resized = cv2.resize(crop, (size, size), interpolation=interpolation)
+        self.frames_cropped += 1
+        return cv2.cvtColor(resized, cv2.COLOR_BGR2RGB), region
+    
+    def update(self, results, region, frame_shape):
+        """
+        Lleva los landmarks del recorte al frame completo (en sitio) y elige la región del siguiente frame
+        
+        Args:
+            results: Resultado de pose.process sobre la imagen de prepare
+            region: Región devuelta por prepare para esa imagen
+            frame_shape: Forma del frame completo (alto, ancho, ...)
+        
+        Returns:
+            True si la región cambió (el seguimiento de MediaPipe quedó en otras coordenadas)
+        """
+        height, width = frame_shape[:2]
+        landmarks = getattr(results, 'pose_landmarks', None)
+        
+        if landmarks is not None and region is not None:
+            x0, y0, side = region
+            for landmark in landmarks.landmark:
+                landmark.x = (x0 + landmark.x * side) / width
+                landmark.y = (y0 + landmark.y * side) / height
+                landmark.z = landmark.z * side / width
+        
+        next_region = self._next_region(landmarks, width, height)
+        changed = next_region != self.region
+        self.region = next_region
+        return changed
+    
+    def _next_region(self, landmarks, width, height):
+        """Región cuadrada alrededor de los landmarks visibles (None = frame completo)"""
+        if landmarks is None:
+            return None
+        
+        points = np.array([(lm.x, lm.y, lm.visibility) for lm in landmarks.landmark])
+        visible = points[:, 2] >= self.min_visibility
+        if visible.sum() < self.min_landmarks:
+            return None
+        
+        xs = points[visible, 0] * width
+        ys = points[visible, 1] * height
+        left, right, top, bottom = xs.min(), xs.max(), ys.min(), ys.max()
+        extent = max(right - left, bottom - top)
+        
+        # Mantener la región actual mientras contenga a la persona con medio margen y no le sobre demasiado
+        if self.region is not None:
+            x0, y0, side = self.region
+            margin = 0.5 * self.padding * extent
+            inside = (left - margin >= x0 and right + margin <= x0 + side and
+                      top - margin >= y0 and bottom + margin <= y0 + side)
+            if inside and extent >= 0.4 * side:
+                return self.region
+        
+        # Lado mínimo de medio tamaño de inferencia: como mucho se amplía 2x
+        side = int(round(max(extent * (1 + 2 * self.padding), self.inference_size / 2)))
+        if side >= min(width, height):
+            return None
+        
+        center_x, center_y = (left + right) / 2, (top + bottom) / 2
+        x0 = int(np.clip(round(center_x - side / 2), 0, width - side))
+        y0 = int(np.clip(round(center_y - side / 2), 0, height - side))
+        return (x0, y0, side)
+
+def process_pose(pose, image, roi=None):
+    """
+    Convierte BGR→RGB e infiere la pose, sobre la región de interés si se indica
+    
+    Args:
+        pose: Instancia de mp.solutions.pose.Pose
+        image: Frame BGR completo
+        roi: PoseROI del detector (None = frame completo)
+    
+    Returns:
+        Resultado de MediaPipe con los landmarks normalizados respecto al frame completo
+    """
+    if roi is None:
+        return pose.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    
+    image_rgb, region = roi.prepare(image)
+    results = pose.process(image_rgb)
+    if roi.update(results, region, image.shape) and hasattr(pose, 'reset'):
+        # El suavizado y el seguimiento de MediaPipe trabajan en coordenadas de la imagen
+        # que reciben: al cambiar de región se reinician en lugar de mezclar dos sistemas
+        pose.reset()
+    return results
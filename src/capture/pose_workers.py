@@ -0,0 +1,301 @@
+"""
+Pool de workers de inferencia de pose desacoplado del hilo de captura
+"""
+
+import queue
+import threading
+import time
+import multiprocessing as mp_proc
+from collections import deque
+from types import SimpleNamespace
+import numpy as np
+from ..utils.stage_timer import STAGE_TIMER
+
+# Misma configuración que GUIPoseDetector
+DEFAULT_POSE_OPTIONS = {
+    'static_image_mode': False,
+    'model_complexity': 1,
+    'smooth_landmarks': True,
+    'min_detection_confidence': 0.5,
+    'min_tracking_confidence': 0.5
+}
+
+def _create_pose(pose_options):
+    """Crea una instancia propia de mp.solutions.pose.Pose para un worker (ya calentada)"""
+    import mediapipe as mp
+    pose = mp.solutions.pose.Pose(**pose_options)
+    warm_up_pose(pose)
+    return pose
+
+def warm_up_pose(pose, resolution=(640, 480)):
+    """
+    Ejecuta una inferencia sobre un frame negro para que la primera real no pague la
+    inicialización del grafo de MediaPipe (carga del modelo, reserva de buffers)
+    
+    Args:
+        pose: Instancia de mp.solutions.pose.Pose
+        resolution: (ancho, alto) del frame de prueba
+    """
+    width, height = resolution
+    pose.process(np.zeros((height, width, 3), dtype=np.uint8))
+    # Sin persona en el frame de prueba no queda seguimiento, pero se reinicia por si acaso
+    if hasattr(pose, 'reset'):
+        pose.reset()
+
+def _create_roi(roi_size):
+    """Región de interés propia de un worker (None = frame completo)"""
+    if not roi_size:
+        return None
+    from .pose_roi import PoseROI
+    return PoseROI(roi_size)
+
+def _process_image(pose, image, roi=None):
+    """Convierte BGR→RGB e infiere la pose (sobre la región de interés del worker si tiene)"""
+    from .pose_roi import process_pose
+    return process_pose(pose, image, roi)
+
+def _process_worker(input_queue, output_queue, pose_options, roi_size=None, ready=None):
+    """
+    Worker en proceso separado. Devuelve los landmarks serializados (protobuf),
+    ya que los resultados de MediaPipe no se pueden enviar entre procesos
+    """
+    pose = _create_pose(pose_options)
+    roi = _create_roi(roi_size)
+    if ready is not None:
+        ready.release()
+    while True:
+        item = input_queue.get()
+        if item is None:
+            break
+        index, timestamp, image = item
+        start = time.perf_counter()
+        try:
+            results = _process_image(pose, image, roi)
+            payload = results.pose_landmarks.SerializeToString() if results.pose_landmarks else b''
+        except Exception as e:
+            print(f"Error en worker de pose: {e}")
+            payload = None
+        # La duración viaja con el resultado: el temporizador de etapas vive en el proceso principal
+        output_queue.put((index, timestamp, payload, time.perf_counter() - start))
+    pose.close()
+
+class PoseWorkerPool:
+    def __init__(self, num_workers=2, mode="thread", pose_options=None, max_pending=None, roi_size=None):
+        """
+        Inicializa el pool de workers de pose
+        
+        Con más de un worker cada instancia de Pose ve uno de cada N frames, por lo
+        que su seguimiento temporal trabaja con un intervalo N veces mayor.
+        
+        Args:
+            num_workers: Número de workers (cada uno con su propio mp.solutions.pose.Pose)
+            mode: "thread" o "process"
+            pose_options: Parámetros de mp.solutions.pose.Pose (por defecto los de la GUI)
+            max_pending: Frames máximos en espera; al llenarse se descarta el más antiguo
+            roi_size: Lado de la imagen de inferencia recortada alrededor de la persona
+                      (PoseROI, una región por worker); None = frame completo
+        """
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Modo de workers desconocido: {mode}")
+        
+        self.num_workers = max(1, int(num_workers))
+        self.mode = mode
+        self.pose_options = dict(pose_options or DEFAULT_POSE_OPTIONS)
+        self.roi_size = roi_size
+        self.max_pending = max_pending or self.num_workers * 2
+        
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        
+        if mode == "process":
+            self._input_queue = mp_proc.Queue(self.max_pending)
+            self._output_queue = mp_proc.Queue()
+            self._ready = mp_proc.Semaphore(0)
+        else:
+            self._input_queue = queue.Queue(self.max_pending)
+            self._output_queue = queue.Queue()
+            self._ready = threading.Semaphore(0)
+        # Workers de la ejecución actual con su Pose ya creado y calentado
+        self.workers_ready = 0
+        
+        # Índices enviados y aún no entregados, en orden de llegada
+        self._outstanding = deque()
+        self._completed = {}
+        self._lock = threading.Lock()
+        self._workers = []
+        self._running = False
+    
+    def start(self):
+        """Lanza los workers"""
+        if self._running:
+            return
+        self._running = True
+        self.workers_ready = 0
+        for i in range(self.num_workers):
+            if self.mode == "process":
+                worker = mp_proc.Process(
+                    target=_process_worker,
+                    args=(self._input_queue, self._output_queue, self.pose_options, self.roi_size, self._ready),
+                    name=f"pose_worker_{i + 1}",
+                    daemon=True
+                )
+            else:
+                worker = threading.Thread(target=self._thread_worker, name=f"pose_worker_{i + 1}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+    
+    def wait_ready(self, timeout=None):
+        """
+        Espera a que todos los workers hayan creado y calentado su instancia de Pose
+        
+        Permite lanzar el pool durante el arranque para que el primer frame real no espere
+        la carga del modelo.
+        
+        Args:
+            timeout: Segundos máximos de espera (None = sin límite)
+            
+        Returns:
+            True si todos los workers están listos
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._running and self.workers_ready < self.num_workers:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not self._ready.acquire(timeout=remaining):
+                return False
+            self.workers_ready += 1
+        return self.workers_ready >= self.num_workers
+    
+    def stop(self):
+        """Detiene los workers y descarta los frames pendientes"""
+        if not self._running:
+            return
+        self._running = False
+        
+        # Vaciar la cola de entrada y enviar una señal de fin por worker
+        self._drain_input()
+        for _ in self._workers:
+            try:
+                self._input_queue.put(None, timeout=1.0)
+            except queue.Full:
+                pass
+        for worker in self._workers:
+            worker.join(timeout=2.0)
+            if self.mode == "process" and worker.is_alive():
+                worker.terminate()
+        self._workers = []
+        
+        # Avisos de workers listos que nadie esperó: no cuentan para la próxima ejecución
+        while self._ready.acquire(timeout=0):
+            pass
+        self.workers_ready = 0
+        
+        with self._lock:
+            self._outstanding.clear()
+            self._completed.clear()
+    
+    def submit(self, index, timestamp, image):
+        """
+        Encola un frame sin bloquear el hilo de captura
+        
+        Args:
+            index: Índice creciente del frame
+            timestamp: Marca de tiempo de captura
+            image: Imagen BGR
+        """
+        with self._lock:
+            self._outstanding.append(index)
+        self.frames_submitted += 1
+        
+        item = (index, timestamp, image)
+        while True:
+            try:
+                self._input_queue.put_nowait(item)
+                return
+            except queue.Full:
+                # Descartar el frame más antiguo en espera para no frenar la captura
+                self._discard_oldest()
+    
+    def get_result(self, timeout=None):
+        """
+        Devuelve el siguiente resultado en orden de índice de frame
+        
+        Args:
+            timeout: Segundos máximos de espera
+            
+        Returns:
+            Tupla (index, timestamp, results) o None si se agotó el tiempo.
+            results expone pose_landmarks igual que los resultados de MediaPipe
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self._outstanding and self._outstanding[0] in self._completed:
+                    index = self._outstanding.popleft()
+                    return self._completed.pop(index)
+            
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            try:
+                index, timestamp, payload, elapsed = self._output_queue.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            
+            if STAGE_TIMER.enabled:
+                STAGE_TIMER.record("pose.mediapipe", elapsed)
+            
+            with self._lock:
+                if index in self._outstanding:
+                    self._completed[index] = (index, timestamp, self._to_results(payload))
+    
+    def _to_results(self, payload):
+        """Normaliza la salida del worker a un objeto con pose_landmarks"""
+        if self.mode == "thread":
+            return payload if payload is not None else SimpleNamespace(pose_landmarks=None)
+        if not payload:
+            return SimpleNamespace(pose_landmarks=None)
+        from mediapipe.framework.formats import landmark_pb2
+        return SimpleNamespace(pose_landmarks=landmark_pb2.NormalizedLandmarkList.FromString(payload))
+    
+    def _discard_oldest(self):
+        """Saca de la cola el frame más antiguo que aún no tomó ningún worker"""
+        try:
+            item = self._input_queue.get_nowait()
+        except queue.Empty:
+            return
+        if item is None:
+            return
+        self.frames_dropped += 1
+        with self._lock:
+            try:
+                self._outstanding.remove(item[0])
+            except ValueError:
+                pass
+    
+    def _drain_input(self):
+        while True:
+            try:
+                self._input_queue.get_nowait()
+            except queue.Empty:
+                return
+    
+    def _thread_worker(self):
+        """Worker en hilo: instancia propia de Pose"""
+        pose = _create_pose(self.pose_options)
+        roi = _create_roi(self.roi_size)
+        self._ready.release()
+        try:
+            while True:
+                item = self._input_queue.get()
+                if item is None:
+                    break
+                index, timestamp, image = item
+                try:
+                    start = time.perf_counter()
+                    results = _process_image(pose, image, roi)
+                except Exception as e:
+                    print(f"Error en worker de pose: {e}")
+                    results = None
+                self._output_queue.put((index, timestamp, results, time.perf_counter() - start))
+        finally:
+            pose.close()
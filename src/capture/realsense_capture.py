@@ -6,18 +6,36 @@ import os
 import threading
 import time
 import cv2
-import pyrealsense2 as rs
 import numpy as np
 import pandas as pd
 from datetime import datetime
 from .pose_detector import PoseDetector
+from .gui_pose_detector import GUIPoseDetector
+from .frame_hub import FrameProducer, read_frame_clock
+from .motion_gate import MotionGate
+from .pose_workers import PoseWorkerPool
+from .depth_sampler import DepthSampler
+from .capture_buffer import CaptureBuffer
+from .replay_source import ReplayFinished
+from ..utils.stage_timer import STAGE_TIMER
+
+try:
+    import pyrealsense2 as rs
+except ImportError:
+    # Sin SDK solo se puede trabajar con fuentes de reproducción (frame_source)
+    rs = None
 
 class RealSenseCapture:
     def __init__(self, 
                  frame_rate=30, 
                  capture_seconds=10, 
                  resolution=(640, 480),
-                 output_path="temp_data"):
+                 output_path="temp_data",
+                 pose_workers=0,
+                 pose_worker_mode="thread",
+                 depth_neighborhood=0,
+                 frame_source=None,
+                 pose_roi_size=None):
         """
         Inicializa el capturador de RealSense
         
@@ -26,22 +44,50 @@ class RealSenseCapture:
             capture_seconds: Duración de captura en segundos
             resolution: Resolución de captura (ancho, alto)
             output_path: Carpeta donde guardar los datos
+            pose_workers: Workers de pose por cámara en los productores (0 = inferir en el hilo de captura)
+            pose_worker_mode: "thread" o "process" para el pool de workers de pose
+            depth_neighborhood: Radio de la mediana local al leer la profundidad (0 = píxel único)
+            frame_source: Pipeline o lista de pipelines con la interfaz de rs.pipeline (p. ej. ReplayPipeline)
+                          a usar en lugar de las cámaras conectadas
+            pose_roi_size: Lado de la imagen de inferencia recortada alrededor de la persona
+                           (PoseROI) en los detectores y workers de pose; None = frame completo
         """
         self.FRAME_RATE = frame_rate
         self.CAPTURE_SECONDS = capture_seconds
         self.RESOLUTION = resolution
         self.OUTPUT_PATH = output_path
+        self.POSE_WORKERS = pose_workers
+        self.POSE_WORKER_MODE = pose_worker_mode
+        self.DEPTH_NEIGHBORHOOD = depth_neighborhood
+        self.POSE_ROI_SIZE = pose_roi_size
         self.imgs2take = frame_rate * capture_seconds
         self.capture = False
         
         # Inicializar el detector de poses
-        self.detector = PoseDetector()
+        self.detector = PoseDetector(roi_size=pose_roi_size)
         self.object_to_track = range(0, 33)  # 33 joints de MediaPipe
         
+        self.pipelines = []
+        self.depth_samplers = []  # Uno por pipeline, con la escala de profundidad del dispositivo
+        
+        # Productores compartidos de frames (uno por pipeline) y sus pools de workers de pose
+        self.frame_producers = []
+        self.pose_pools = []
+        
+        if frame_source is not None:
+            # Fuente sin cámara: misma interfaz que rs.pipeline
+            self.context = None
+            self.devices = []
+            sources = frame_source if isinstance(frame_source, (list, tuple)) else [frame_source]
+            self._setup_frame_sources(sources)
+            return
+        
+        if rs is None:
+            raise Exception("pyrealsense2 no está instalado; usa frame_source para reproducir una grabación.")
+        
         # Configurar pipelines de RealSense
         self.context = rs.context()
         self.devices = self.context.devices
-        self.pipelines = []
         
         if len(self.devices) == 0:
             raise Exception("No se encontró ningún dispositivo RealSense conectado.")
@@ -75,10 +121,24 @@ class RealSenseCapture:
             )
 
             # Iniciar pipeline
-            pipeline.start(config)
+            profile = pipeline.start(config)
             self.pipelines.append(pipeline)
+            self.depth_samplers.append(DepthSampler.from_profile(profile, self.DEPTH_NEIGHBORHOOD))
             print(f"Cámara {i + 1} conectada, serial: {serial}")
 
+    def _setup_frame_sources(self, sources):
+        """
+        Inicia pipelines externos (p. ej. ReplayPipeline) en lugar de cámaras físicas
+        
+        Args:
+            sources: Lista de objetos con start/stop/wait_for_frames
+        """
+        for i, source in enumerate(sources):
+            profile = source.start()
+            self.pipelines.append(source)
+            self.depth_samplers.append(DepthSampler.from_profile(profile, self.DEPTH_NEIGHBORHOOD))
+            print(f"Fuente {i + 1} iniciada: {getattr(source, 'name', type(source).__name__)}")
+
     def capture_activity(self, activity_name="unknown"):
         """
         Captura una actividad completa y guarda los datos
@@ -89,83 +149,224 @@ class RealSenseCapture:
         Returns:
             Ruta donde se guardaron los datos
         """
-        print(f"Iniciando captura de '{activity_name}' por {self.CAPTURE_SECONDS} segundos...")
+        buffer = self.capture_frames(activity_name)
+        if buffer is None:
+            return None
         
         # Crear timestamp para la sesión
         timestamp = datetime.now().strftime('%Y_%m_%d_%H_%M_%S')
         session_path = os.path.join(self.OUTPUT_PATH, f"{activity_name}_{timestamp}")
         
+        # Guardar datos capturados
+        return self._save_captured_data(buffer.frame_vectors(), session_path, activity_name, buffer.timestamps)
+
+    def capture_frames(self, activity_name="unknown"):
+        """
+        Captura una actividad completa y devuelve los frames en memoria, sin escribir a disco
+        
+        Args:
+            activity_name: Nombre de la actividad a capturar
+            
+        Returns:
+            CaptureBuffer con coordenadas, máscara de validez y reloj de la cámara,
+            o None si hubo un error
+        """
+        print(f"Iniciando captura de '{activity_name}' por {self.CAPTURE_SECONDS} segundos...")
+        
         # Preparar datos para captura
         self.capture = True
-        captured_data = []
+        buffer = CaptureBuffer(self.imgs2take, len(self.object_to_track))
+        subscriber = None
+        frame_iterator = None
+        held_producer = None
         
         try:
-            # Usar solo la primera cámara para simplicidad
-            pipeline = self.pipelines[0]
-            imgsCount = 0
+            if self.frame_producers and self.frame_producers[0].is_running():
+                # Cada frame grabado necesita su propia pose: sin compuerta de movimiento durante la
+                # captura. Se retiene antes de suscribirse para que ningún frame grabado llegue omitido
+                held_producer = self.frame_producers[0]
+                held_producer.hold_full_rate()
+                # Consumir del productor compartido: la pose ya se infirió una sola vez por frame
+                subscriber = held_producer.subscribe("recorder", queue_size=self.FRAME_RATE * 2)
+                frame_iterator = self._frames_from_subscriber(subscriber)
+            else:
+                # Usar solo la primera cámara para simplicidad
+                frame_iterator = self._frames_from_pipeline(self.pipelines[0])
+            
+            while not buffer.is_full() and self.capture:
+                item = next(frame_iterator, None)
+                if item is None:
+                    break
+                
+                buffer.write(*item)
+                
+                # Mostrar progreso
+                if len(buffer) % 30 == 0:  # Cada segundo
+                    print(f"Capturados {len(buffer)}/{self.imgs2take} frames...")
+            
+            skipped = buffer.skipped_frames()
+            if skipped:
+                print(f"Se perdieron {skipped} frames de la cámara durante la captura")
+            return buffer
             
-            while imgsCount < self.imgs2take and self.capture:
-                frames = pipeline.wait_for_frames()
-                frame_depth = frames.get_depth_frame()
-                frame_color = frames.get_color_frame()
+        except Exception as e:
+            print(f"Error durante la captura: {e}")
+            return None
+        finally:
+            if frame_iterator is not None:
+                frame_iterator.close()
+            if subscriber is not None:
+                subscriber.close()
+            if held_producer is not None:
+                held_producer.hold_full_rate(False)
+            self.capture = False
 
-                if not frame_color:
+    def _frames_from_subscriber(self, subscriber):
+        """
+        Genera (coordenadas 33 × 3, máscara de validez, segundos de la cámara, número de frame)
+        a partir de un suscriptor del productor compartido
+        
+        Args:
+            subscriber: FrameSubscriber con cola acotada
+        """
+        try:
+            while self.capture:
+                packet = subscriber.get(timeout=2.0)
+                if packet is None:
+                    if subscriber.closed:
+                        return
                     continue
+                yield packet.joint_coords, packet.joint_valid, packet.device_timestamp, packet.frame_number
+        finally:
+            subscriber.close()
+
+    def _frames_from_pipeline(self, pipeline):
+        """
+        Genera (coordenadas 33 × 3, máscara de validez, segundos de la cámara, número de frame)
+        leyendo directamente del pipeline (sin productor compartido)
+        
+        Args:
+            pipeline: Pipeline de RealSense
+        """
+        depth_sampler = self.depth_samplers[self.pipelines.index(pipeline)]
+        coords = np.zeros((len(self.object_to_track), 3), dtype=np.float32)
+        valid = np.zeros(len(self.object_to_track), dtype=bool)
+        while self.capture:
+            try:
+                with STAGE_TIMER.stage("capture.wait_for_frames"):
+                    frames = pipeline.wait_for_frames()
+            except ReplayFinished:
+                return
+            frame_depth = frames.get_depth_frame()
+            frame_color = frames.get_color_frame()
+
+            if not frame_color:
+                continue
 
-                image_color = np.asanyarray(frame_color.get_data())
+            device_timestamp, frame_number = read_frame_clock(frame_color)
+            image_color = np.asanyarray(frame_color.get_data())
+            with STAGE_TIMER.stage("pose.mediapipe"):
                 pose, skeleton = self.detector.findPose(image_color)
                 lmList = self.detector.getPosition(pose)
 
-                # Procesar joints para obtener coordenadas 3D
-                frame_data = []
-                if len(lmList) != 0:
-                    for obj in self.object_to_track:
-                        if obj < len(lmList):
-                            _, x, y = lmList[obj]
-                            
-                            # Validar coordenadas
-                            if (x < 0 or x >= self.RESOLUTION[0] or 
-                                y < 0 or y >= self.RESOLUTION[1]):
-                                frame_data.extend([0, 0, 0])
-                                continue
-                                
-                            # Obtener coordenada Z del sensor de profundidad
-                            z = frame_depth.get_distance(x, y)
-                            if z <= 0:
-                                frame_data.extend([0, 0, 0])
-                                continue
-                                
-                            frame_data.extend([x, y, z])
-                        else:
-                            frame_data.extend([0, 0, 0])
-                else:
-                    # Si no se detectaron poses, llenar con ceros
-                    frame_data = [0] * 99  # 33 joints × 3 coordenadas
-
-                captured_data.append(frame_data)
-                imgsCount += 1
+            # Procesar joints para obtener coordenadas 3D (arreglos reutilizados: el buffer de captura copia)
+            coords[:] = 0.0
+            valid[:] = False
+            if len(lmList) != 0:
+                landmarks = np.asarray(lmList)[:len(self.object_to_track)]
+                ids, xs, ys = landmarks[:, 0], landmarks[:, 1], landmarks[:, 2]
                 
-                # Mostrar progreso
-                if imgsCount % 30 == 0:  # Cada segundo
-                    print(f"Capturados {imgsCount}/{self.imgs2take} frames...")
+                # Obtener la coordenada Z de todos los joints con una sola lectura del buffer
+                with STAGE_TIMER.stage("pose.depth_lookup"):
+                    zs = depth_sampler.sample(frame_depth, xs, ys)
+                
+                # Validar coordenadas y profundidad
+                ok = ((xs >= 0) & (xs < self.RESOLUTION[0]) & 
+                      (ys >= 0) & (ys < self.RESOLUTION[1]) & (zs > 0))
+                
+                coords[ids, 0] = xs
+                coords[ids, 1] = ys
+                coords[ids, 2] = zs
+                valid[ids] = ok
+
+            yield coords, valid, device_timestamp, frame_number
 
-            # Guardar datos capturados
-            return self._save_captured_data(captured_data, session_path, activity_name)
+    def prepare_pose_workers(self, timeout=30.0):
+        """
+        Lanza los pools de workers de pose antes de abrir los productores, para que cada worker
+        cree y caliente su instancia de Pose durante el arranque y no con el primer frame real
+        
+        Args:
+            timeout: Segundos máximos de espera por pool
             
-        except Exception as e:
-            print(f"Error durante la captura: {e}")
-            return None
-        finally:
-            self.capture = False
+        Returns:
+            True si todos los workers quedaron listos (también si no hay workers configurados)
+        """
+        if self.POSE_WORKERS <= 0:
+            return True
+        
+        ready = True
+        for i in range(len(self.pipelines)):
+            pool = self._pose_pool(i)
+            pool.start()
+            ready = pool.wait_ready(timeout) and ready
+        return ready
+
+    def _pose_pool(self, index):
+        """Pool de workers de pose del pipeline indicado (se crea la primera vez)"""
+        while len(self.pose_pools) <= index:
+            self.pose_pools.append(PoseWorkerPool(self.POSE_WORKERS, mode=self.POSE_WORKER_MODE,
+                                                  roi_size=self.POSE_ROI_SIZE))
+        return self.pose_pools[index]
+
+    def start_frame_producers(self, pose_detector=None, motion_gate=True):
+        """
+        Inicia un hilo productor por pipeline; la vista previa, la grabación y el
+        reconocimiento se suscriben a él en lugar de llamar a wait_for_frames
+        
+        Args:
+            pose_detector: Detector de poses para la primera cámara (GUIPoseDetector);
+                           las cámaras adicionales reciben su propio detector
+            motion_gate: Omitir la inferencia de pose con la escena vacía o quieta (MotionGate)
+            
+        Returns:
+            Lista de FrameProducer
+        """
+        if self.frame_producers:
+            return self.frame_producers
+        
+        for i, pipeline in enumerate(self.pipelines):
+            detector = pose_detector if (i == 0 and pose_detector is not None) else GUIPoseDetector(self.POSE_ROI_SIZE)
+            detector.depth_sampler = self.depth_samplers[i]
+            
+            # Con workers, el hilo de captura solo encola frames y la pose se infiere en paralelo
+            # (si prepare_pose_workers ya lanzó el pool, sus workers llegan calentados)
+            pose_pool = self._pose_pool(i) if self.POSE_WORKERS > 0 else None
+            
+            gate = MotionGate(depth_scale=self.depth_samplers[i].depth_scale) if motion_gate else None
+            
+            producer = FrameProducer(pipeline, detector, name=f"camera_{i + 1}_producer",
+                                     pose_pool=pose_pool, motion_gate=gate)
+            producer.start()
+            self.frame_producers.append(producer)
+        
+        return self.frame_producers
+
+    def stop_frame_producers(self):
+        """Detiene los hilos productores"""
+        for producer in self.frame_producers:
+            producer.stop()
+        self.frame_producers = []
 
-    def _save_captured_data(self, data, session_path, activity_name):
+    def _save_captured_data(self, data, session_path, activity_name, timestamps=None):
         """
         Guarda los datos capturados en formato CSV
         
         Args:
-            data: Lista de frames con coordenadas
+            data: Arreglo o lista de frames con coordenadas
             session_path: Ruta de la sesión
             activity_name: Nombre de la actividad
+            timestamps: Segundos de captura de cada frame (se guardan en la columna 'timestamp')
             
         Returns:
             Ruta del archivo guardado
@@ -179,6 +380,8 @@ class RealSenseCapture:
         
         # Crear DataFrame y guardar
         df = pd.DataFrame(data, columns=columns)
+        if timestamps is not None:
+            df['timestamp'] = timestamps
         output_file = os.path.join(session_path, f"{activity_name}_raw.csv")
         df.to_csv(output_file, index=False)
         
@@ -188,6 +391,7 @@ class RealSenseCapture:
     def stop_capture(self):
         """Detiene la captura y libera recursos"""
         self.capture = False
+        self.stop_frame_producers()
         for pipeline in self.pipelines:
             pipeline.stop()
         print("Captura detenida y recursos liberados.")
@@ -0,0 +1,390 @@
+"""
+Fuente de frames sin cámara: reproduce sesiones grabadas con la misma interfaz que el pipeline
+de RealSense (start / wait_for_frames / get_color_frame / get_depth_frame / get_distance)
+"""
+
+import json
+import os
+import threading
+import time
+import numpy as np
+from ..utils.rate_meter import FramePacer
+
+PACING_MODES = ("realtime", "max", "fixed")
+
+class ReplayFinished(RuntimeError):
+    """La grabación terminó y el pipeline no está en modo bucle"""
+
+class ReplayFrame:
+    """Frame de color o profundidad reproducido; imita rs.frame / rs.depth_frame"""
+    
+    def __init__(self, data, timestamp, frame_number, depth_scale=None):
+        self._data = data
+        self._timestamp = timestamp
+        self._frame_number = frame_number
+        self._depth_scale = depth_scale
+    
+    def __bool__(self):
+        return self._data is not None
+    
+    def get_data(self):
+        return self._data
+    
+    def get_width(self):
+        return self._data.shape[1]
+    
+    def get_height(self):
+        return self._data.shape[0]
+    
+    def get_timestamp(self):
+        """Marca de tiempo en milisegundos, como en RealSense"""
+        return self._timestamp * 1000.0
+    
+    def get_frame_number(self):
+        return self._frame_number
+    
+    def get_units(self):
+        return self._depth_scale
+    
+    def get_distance(self, x, y):
+        """
+        Profundidad en metros de un píxel (solo frames de profundidad)
+        
+        Args:
+            x: Columna en píxeles
+            y: Fila en píxeles
+        """
+        return float(self._data[int(y), int(x)]) * self._depth_scale
+    
+    def keep(self):
+        pass
+
+class ReplayFrameset:
+    """Par color/profundidad reproducido; imita rs.composite_frame"""
+    
+    def __init__(self, color_frame, depth_frame):
+        self._color_frame = color_frame
+        self._depth_frame = depth_frame
+    
+    def get_color_frame(self):
+        return self._color_frame
+    
+    def get_depth_frame(self):
+        return self._depth_frame
+    
+    def get_timestamp(self):
+        return self._color_frame.get_timestamp()
+    
+    def get_frame_number(self):
+        return self._color_frame.get_frame_number()
+    
+    def keep(self):
+        # Los buffers ya son arreglos propios: no hay nada que retener
+        pass
+
+class _ReplayDepthSensor:
+    def __init__(self, depth_scale):
+        self._depth_scale = depth_scale
+    
+    def get_depth_scale(self):
+        return self._depth_scale
+
+class _ReplayDevice:
+    def __init__(self, name, depth_scale):
+        self._name = name
+        self._sensor = _ReplayDepthSensor(depth_scale)
+    
+    def first_depth_sensor(self):
+        return self._sensor
+    
+    def get_info(self, info=None):
+        return self._name
+
+class ReplayProfile:
+    """Imita rs.pipeline_profile para que DepthSampler.from_profile funcione igual"""
+    
+    def __init__(self, name, depth_scale):
+        self._device = _ReplayDevice(name, depth_scale)
+    
+    def get_device(self):
+        return self._device
+
+class NpzRecording:
+    def __init__(self, path):
+        """
+        Sesión guardada como volcado de arreglos (ver save_npz_recording)
+        
+        Args:
+            path: Archivo .npz con color (N × alto × ancho × 3, BGR uint8),
+                  depth (N × alto × ancho, z16), timestamps (N, segundos) y depth_scale
+        """
+        self.path = path
+        with np.load(path) as data:
+            self.color = data["color"]
+            self.depth = data["depth"]
+            self.timestamps = data["timestamps"].astype(np.float64)
+            self.depth_scale = float(data["depth_scale"]) if "depth_scale" in data else 0.001
+        
+        if not (len(self.color) == len(self.depth) == len(self.timestamps)):
+            raise ValueError(f"La grabación {path} tiene longitudes distintas de color, profundidad y tiempos")
+    
+    def __len__(self):
+        return len(self.color)
+    
+    def open(self):
+        pass
+    
+    def close(self):
+        pass
+    
+    def read(self):
+        """
+        Generador de (timestamp, imagen_color, imagen_profundidad)
+        """
+        for i in range(len(self.color)):
+            yield self.timestamps[i], self.color[i], self.depth[i]
+
+class VideoJointsRecording:
+    # Radio del parche con la profundidad del joint: la pose reinferida no cae exactamente
+    # en el mismo píxel que la original
+    DEPTH_PATCH_RADIUS = 8
+    
+    def __init__(self, video_path, jsonl_path=None, depth_scale=0.001):
+        """
+        Sesión grabada por test_camera.py: video mp4 + un registro JSONL de joints por frame
+        
+        El mp4 no incluye el stream de profundidad, así que se reconstruye un mapa disperso
+        con la z registrada alrededor de cada joint. El video es la imagen mostrada en pantalla
+        (con las anotaciones dibujadas).
+        
+        Args:
+            video_path: Ruta al realsense_record_<ts>.mp4
+            jsonl_path: Ruta al realsense_joints_<ts>.jsonl (se deduce del nombre del video si es None)
+            depth_scale: Metros por unidad del mapa de profundidad reconstruido
+        """
+        if jsonl_path is None:
+            folder, name = os.path.split(video_path)
+            name = os.path.splitext(name)[0].replace("realsense_record_", "realsense_joints_")
+            jsonl_path = os.path.join(folder, name + ".jsonl")
+        
+        self.video_path = video_path
+        self.jsonl_path = jsonl_path
+        self.depth_scale = depth_scale
+        self.records = []
+        if os.path.exists(jsonl_path):
+            with open(jsonl_path, "r", encoding="utf-8") as f:
+                self.records = [json.loads(line) for line in f if line.strip()]
+        else:
+            print(f"No se encontró el registro de joints {jsonl_path}; la profundidad será 0")
+        self._capture = None
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def open(self):
+        import cv2
+        self._capture = cv2.VideoCapture(self.video_path)
+        if not self._capture.isOpened():
+            raise IOError(f"No se pudo abrir el video {self.video_path}")
+        self._fps = self._capture.get(cv2.CAP_PROP_FPS) or 30.0
+    
+    def close(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+    
+    def read(self):
+        """
+        Generador de (timestamp, imagen_color, imagen_profundidad)
+        """
+        if self._capture is None:
+            self.open()
+        
+        index = 0
+        while True:
+            ok, color = self._capture.read()
+            if not ok:
+                return
+            
+            record = self.records[index] if index < len(self.records) else None
+            if record is not None:
+                timestamp = float(record["timestamp"])
+            else:
+                timestamp = index / self._fps
+            
+            depth = self._depth_from_joints(record["joints"] if record else [], color.shape[:2])
+            yield timestamp, color, depth
+            index += 1
+    
+    def _depth_from_joints(self, joints, shape):
+        """
+        Reconstruye un mapa z16 disperso con la profundidad registrada de cada joint
+        
+        Args:
+            joints: Lista de joints del registro JSONL (x, y en píxeles, z en metros)
+            shape: (alto, ancho) de la imagen
+        """
+        depth = np.zeros(shape, dtype=np.uint16)
+        h, w = shape
+        r = self.DEPTH_PATCH_RADIUS
+        
+        # Los más lejanos primero, para que los cercanos queden encima si se solapan
+        for joint in sorted(joints, key=lambda j: j.get("z", 0), reverse=True):
+            z = joint.get("z", 0)
+            if z <= 0:
+                continue
+            x, y = int(joint["x"]), int(joint["y"])
+            if not (0 <= x < w and 0 <= y < h):
+                continue
+            depth[max(y - r, 0):y + r + 1, max(x - r, 0):x + r + 1] = min(int(round(z / self.depth_scale)), 65535)
+        return depth
+
+class ReplayPipeline:
+    def __init__(self, recording, pacing="realtime", fps=30, loop=False, speed=1.0, name="replay"):
+        """
+        Sustituto de rs.pipeline que reproduce una grabación
+        
+        Args:
+            recording: NpzRecording, VideoJointsRecording o ruta (.npz o .mp4)
+            pacing: "realtime" (respeta los timestamps), "max" (sin esperas) o "fixed" (a fps constantes)
+            fps: Frames por segundo en modo "fixed"
+            loop: Volver al inicio al terminar en lugar de lanzar ReplayFinished
+            speed: Factor de velocidad en modo "realtime" (2.0 = el doble de rápido)
+            name: Nombre del dispositivo simulado
+        """
+        if pacing not in PACING_MODES:
+            raise ValueError(f"Ritmo de reproducción desconocido: {pacing}. Opciones: {PACING_MODES}")
+        
+        self.recording = open_recording(recording) if isinstance(recording, (str, os.PathLike)) else recording
+        self.pacing = pacing
+        self.fps = fps
+        self.loop = loop
+        self.speed = speed
+        self.name = name
+        self.frames_delivered = 0
+        
+        self._lock = threading.Lock()
+        self._iterator = None
+        self._started = False
+        self._pacer = None
+        self._first_timestamp = None
+        self._wall_start = None
+    
+    def start(self, config=None):
+        """
+        Inicia la reproducción (config se ignora; existe por compatibilidad con rs.pipeline)
+        
+        Returns:
+            ReplayProfile con la escala de profundidad de la grabación
+        """
+        with self._lock:
+            self.recording.open()
+            self._iterator = self.recording.read()
+            self._pacer = FramePacer(self.fps) if self.pacing == "fixed" else None
+            self._first_timestamp = None
+            self._started = True
+        return ReplayProfile(self.name, self.recording.depth_scale)
+    
+    def stop(self):
+        """Detiene la reproducción y libera la grabación"""
+        with self._lock:
+            self._started = False
+            self._iterator = None
+            self.recording.close()
+    
+    def wait_for_frames(self, timeout_ms=5000):
+        """
+        Devuelve el siguiente frameset respetando el ritmo configurado
+        
+        Raises:
+            ReplayFinished: Si la grabación terminó y loop es False
+        """
+        with self._lock:
+            if not self._started:
+                raise RuntimeError("wait_for_frames() llamado antes de start()")
+            
+            item = next(self._iterator, None)
+            if item is None and self.loop:
+                self.recording.close()
+                self.recording.open()
+                self._iterator = self.recording.read()
+                self._first_timestamp = None
+                item = next(self._iterator, None)
+            if item is None:
+                raise ReplayFinished(f"Fin de la grabación '{self.name}'")
+            
+            timestamp, color, depth = item
+            self._pace(timestamp)
+            
+            frame_number = self.frames_delivered
+            self.frames_delivered += 1
+        
+        return ReplayFrameset(
+            ReplayFrame(color, timestamp, frame_number),
+            ReplayFrame(depth, timestamp, frame_number, self.recording.depth_scale)
+        )
+    
+    def try_wait_for_frames(self, timeout_ms=5000):
+        """
+        Igual que wait_for_frames pero sin excepciones al terminar
+        
+        Returns:
+            Tupla (éxito, frameset)
+        """
+        try:
+            return True, self.wait_for_frames(timeout_ms)
+        except ReplayFinished:
+            return False, None
+    
+    def _pace(self, timestamp):
+        if self.pacing == "max":
+            return
+        if self.pacing == "fixed":
+            self._pacer.wait()
+            return
+        
+        now = time.monotonic()
+        if self._first_timestamp is None:
+            self._first_timestamp = timestamp
+            self._wall_start = now
+            return
+        
+        remaining = self._wall_start + (timestamp - self._first_timestamp) / self.speed - now
+        if remaining > 0:
+            time.sleep(remaining)
+
+def open_recording(path, depth_scale=0.001):
+    """
+    Abre una grabación según su extensión
+    
+    Args:
+        path: Archivo .npz (volcado de arreglos) o .mp4 (video + JSONL de test_camera.py)
+        depth_scale: Escala de profundidad para el mapa reconstruido de los .mp4
+    
+    Returns:
+        NpzRecording o VideoJointsRecording
+    """
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension == ".npz":
+        return NpzRecording(path)
+    if extension in (".mp4", ".avi", ".mkv"):
+        return VideoJointsRecording(path, depth_scale=depth_scale)
+    raise ValueError(f"Formato de grabación no soportado: {path}")
+
+def save_npz_recording(path, color_frames, depth_frames, timestamps, depth_scale=0.001):
+    """
+    Guarda una sesión color + profundidad como volcado de arreglos reproducible con ReplayPipeline
+    
+    Args:
+        path: Archivo .npz de salida
+        color_frames: Secuencia de imágenes BGR (alto × ancho × 3)
+        depth_frames: Secuencia de imágenes z16 (alto × ancho)
+        timestamps: Segundos de cada frame
+        depth_scale: Metros por unidad z16
+    """
+    np.savez(path,
+             color=np.asarray(color_frames, dtype=np.uint8),
+             depth=np.asarray(depth_frames, dtype=np.uint16),
+             timestamps=np.asarray(timestamps, dtype=np.float64),
+             depth_scale=np.float64(depth_scale))
+    print(f"Grabación guardada en: {path}")
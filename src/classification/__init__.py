@@ -2,6 +2,13 @@
 Módulo de clasificación de actividades
 """
 
-from .activity_classifier import ActivityClassifier
+from .activity_classifier import ActivityClassifier, INFERENCE_ENGINES
+from .flat_forest import FlatForest
+from .model_artifact import (ARTIFACT_FORMAT_VERSION, save_artifact, load_artifact, read_metadata, check_compatibility,
+                             write_dataset_info, read_dataset_info)
 
-__all__ = ['ActivityClassifier']
+__all__ = [
+    'ActivityClassifier', 'FlatForest', 'INFERENCE_ENGINES',
+    'ARTIFACT_FORMAT_VERSION', 'save_artifact', 'load_artifact', 'read_metadata', 'check_compatibility',
+    'write_dataset_info', 'read_dataset_info'
+]
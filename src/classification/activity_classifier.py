@@ -6,23 +6,39 @@ import numpy as np
 import pandas as pd
 import joblib
 import os
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, accuracy_score
+from joblib import parallel_config
+from ..utils.stage_timer import STAGE_TIMER
+from ..features.feature_extractor import FEATURE_VERSION
+from .flat_forest import FlatForest
+from .model_artifact import (artifact_path, hash_file, save_artifact, read_metadata, check_compatibility, load_artifact,
+                             read_dataset_info)
+
+INFERENCE_ENGINES = ("flat", "sklearn")
 
 class ActivityClassifier:
-    def __init__(self, model_path="models/activity_classifier.pkl"):
+    def __init__(self, model_path="models/activity_classifier.pkl", inference="flat"):
         """
         Inicializa el clasificador de actividades
         
         Args:
             model_path: Ruta donde guardar/cargar el modelo entrenado
+            inference: "flat" predice con el bosque aplanado en NumPy (scaler incluido en los umbrales);
+                "sklearn" usa scaler.transform + predict_proba de scikit-learn
         """
+        if inference not in INFERENCE_ENGINES:
+            raise ValueError(f"Motor de inferencia desconocido: {inference}. Opciones: {INFERENCE_ENGINES}")
+        
         self.model_path = model_path
+        self.artifact_path = artifact_path(model_path)
+        self.inference = inference
         self.model = None
         self.scaler = None
         self.classes = None
+        self.flat_forest = None
+        self.feature_names = None
+        self.training_data_hash = None
+        self.feature_version = None
+        self.preprocessing = None
         
         # Crear directorio de modelos si no existe
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
@@ -30,13 +46,26 @@ class ActivityClassifier:
         # Intentar cargar modelo existente
         self._load_model()
     
-    def train_model(self, dataset_path):
+    def train_model(self, dataset_path, preprocessing=None, feature_version=None):
         """
         Entrena el modelo usando un dataset existente
         
+        La versión de las características y el preprocesamiento que se guardan con el modelo son los
+        del dataset: los indicados o, si no, los de su archivo de información (write_dataset_info).
+        Un dataset sin información se trata como los originales (versión 1, preprocesamiento desconocido).
+        
         Args:
             dataset_path: Ruta del archivo CSV con el dataset
+            preprocessing: Parámetros del preprocesamiento con el que se generó el dataset
+                (DataPreprocessor.feature_config; None = leerlos del archivo de información)
+            feature_version: Versión de las características del dataset (None = leerla del archivo de información)
         """
+        # scikit-learn solo hace falta para entrenar: servir usa el artefacto del bosque aplanado
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import classification_report, accuracy_score
+        
         print(f"Entrenando modelo con dataset: {dataset_path}")
         
         # Cargar dataset
@@ -46,6 +75,14 @@ class ActivityClassifier:
         X = df.iloc[:, :-1].values  # Todas las columnas excepto la última
         y = df.iloc[:, -1].values   # Última columna (etiquetas)
         
+        # Identificación del dataset y de las características para el artefacto
+        self.feature_names = self._dataset_feature_names(df)
+        self.training_data_hash = hash_file(dataset_path)
+        saved_version, saved_preprocessing = read_dataset_info(dataset_path)
+        self.feature_version = feature_version or saved_version
+        self.preprocessing = preprocessing if preprocessing is not None else saved_preprocessing
+        self._warn_feature_version()
+        
         # Guardar clases únicas
         self.classes = np.unique(y)
         print(f"Clases detectadas: {self.classes}")
@@ -70,6 +107,7 @@ class ActivityClassifier:
         )
         
         self.model.fit(X_train_scaled, y_train)
+        self._build_inference_engine()
         
         # Evaluar modelo
         y_pred = self.model.predict(X_test_scaled)
@@ -94,52 +132,236 @@ class ActivityClassifier:
         Returns:
             Tupla con (actividad_predicha, probabilidades)
         """
-        if self.model is None:
+        predictions, probabilities = self.predict_batch(np.asarray(features).reshape(1, -1))
+        
+        # Crear diccionario de probabilidades por clase
+        prob_dict = dict(zip(self.classes, probabilities[0]))
+        
+        return predictions[0], prob_dict
+    
+    def predict_batch(self, features_matrix, n_jobs=None):
+        """
+        Predice muchas muestras a la vez con una sola normalización y un solo predict_proba
+        
+        Args:
+            features_matrix: Matriz (muestras × 64) con las características
+            n_jobs: Hilos usados por el bosque de scikit-learn en esta llamada (None = configuración
+                del modelo). Se ignora con el motor "flat", que predice en una sola pasada vectorizada
+            
+        Returns:
+            Tupla con (actividades_predichas, probabilidades) donde probabilidades es una
+            matriz (muestras × clases) en el orden de self.classes
+        """
+        if not self.is_trained():
             raise ValueError("Modelo no entrenado. Entrena primero o carga un modelo.")
         
-        # Convertir a array 2D para el scaler
-        features_array = np.array(features).reshape(1, -1)
+        features_array = np.asarray(features_matrix, dtype=np.float64)
+        if features_array.ndim == 1:
+            features_array = features_array.reshape(1, -1)
+        
+        if self.flat_forest is not None:
+            # Bosque aplanado: recibe las características crudas, sin validaciones ni hilos por llamada
+            with STAGE_TIMER.stage("classifier.predict"):
+                probabilities = self.flat_forest.predict_proba(features_array)
+            predictions = self.flat_forest.classes.take(np.argmax(probabilities, axis=1))
+            return predictions, probabilities
         
         # Normalizar características
-        features_scaled = self.scaler.transform(features_array)
+        with STAGE_TIMER.stage("classifier.scale"):
+            features_scaled = self.scaler.transform(features_array)
         
-        # Predecir
-        prediction = self.model.predict(features_scaled)[0]
-        probabilities = self.model.predict_proba(features_scaled)[0]
+        # Una sola pasada por el bosque; la etiqueta es la clase más probable. El paralelismo se
+        # pasa por el contexto de joblib (local a cada hilo) sin modificar el modelo compartido,
+        # así la GUI y el reconocedor continuo pueden predecir a la vez; solo aplica si el modelo
+        # se entrenó sin n_jobs fijo, como los de train_model
+        with parallel_config(n_jobs=n_jobs), STAGE_TIMER.stage("classifier.predict"):
+            probabilities = self.model.predict_proba(features_scaled)
         
-        # Crear diccionario de probabilidades por clase
-        prob_dict = dict(zip(self.classes, probabilities))
+        predictions = self.model.classes_.take(np.argmax(probabilities, axis=1))
         
-        return prediction, prob_dict
+        return predictions, probabilities
     
     def _save_model(self):
-        """Guarda el modelo entrenado, scaler y clases"""
+        """Guarda el modelo entrenado, scaler y clases, y el artefacto del bosque aplanado"""
         model_data = {
             'model': self.model,
             'scaler': self.scaler,
-            'classes': self.classes
+            'classes': self.classes,
+            'feature_names': self.feature_names,
+            'training_data_hash': self.training_data_hash,
+            'feature_version': self.feature_version,
+            'preprocessing': self.preprocessing
         }
         
         joblib.dump(model_data, self.model_path)
         print(f"Modelo guardado en: {self.model_path}")
+        
+        self._save_artifact()
+    
+    def _save_artifact(self):
+        """Guarda el bosque aplanado en la carpeta del artefacto (arreglos mapeables en memoria)"""
+        import sklearn
+        
+        flat_forest = self.flat_forest if self.flat_forest is not None else self.export_flat_forest()
+        save_artifact(
+            self.artifact_path,
+            flat_forest,
+            feature_names=self.feature_names,
+            training_data_hash=self.training_data_hash,
+            sklearn_version=sklearn.__version__,
+            feature_version=self.feature_version,
+            preprocessing=self.preprocessing
+        )
+        print(f"Artefacto del modelo guardado en: {self.artifact_path}")
     
     def _load_model(self):
         """Carga un modelo previamente entrenado"""
-        if os.path.exists(self.model_path):
+        if self.inference == "flat" and self._load_artifact():
+            return
+        
+        if self._load_pickled_model() and self.inference == "flat":
+            # Modelo anterior al formato de artefacto: se convierte una vez para las próximas cargas
             try:
-                model_data = joblib.load(self.model_path)
-                self.model = model_data['model']
-                self.scaler = model_data['scaler']
-                self.classes = model_data['classes']
-                print(f"Modelo cargado desde: {self.model_path}")
-                print(f"Clases disponibles: {self.classes}")
-            except Exception as e:
-                print(f"Error al cargar modelo: {e}")
-                self.model = None
+                self._save_artifact()
+            except OSError as e:
+                print(f"No se pudo guardar el artefacto del modelo: {e}")
+    
+    def _load_artifact(self):
+        """
+        Carga el bosque aplanado desde el artefacto, sin deserializar scikit-learn
+        
+        Returns:
+            True si se cargó; False si no existe o no es compatible
+        """
+        metadata = read_metadata(self.artifact_path)
+        if metadata is None:
+            return False
+        
+        try:
+            self.flat_forest, metadata = load_artifact(self.artifact_path)
+        except (OSError, ValueError) as e:
+            print(f"Error al cargar artefacto del modelo: {e}")
+            self.flat_forest = None
+            return False
+        
+        self.classes = self.flat_forest.classes
+        self.feature_names = metadata.get('feature_names')
+        self.training_data_hash = metadata.get('training_data_hash')
+        self.feature_version = metadata.get('feature_version') or 1
+        self.preprocessing = metadata.get('preprocessing')
+        print(f"Modelo cargado desde: {self.artifact_path}")
+        print(f"Clases disponibles: {self.classes}")
+        self._warn_feature_version()
+        return True
+    
+    def _load_pickled_model(self):
+        """
+        Carga el modelo de scikit-learn serializado con joblib
+        
+        Returns:
+            True si se cargó
+        """
+        if not os.path.exists(self.model_path):
+            return False
+        
+        try:
+            model_data = joblib.load(self.model_path)
+            self.model = model_data['model']
+            self.scaler = model_data['scaler']
+            self.classes = model_data['classes']
+            self.feature_names = model_data.get('feature_names')
+            self.training_data_hash = model_data.get('training_data_hash')
+            # Los pickles anteriores a este campo se entrenaron con las características originales
+            self.feature_version = model_data.get('feature_version') or 1
+            self.preprocessing = model_data.get('preprocessing')
+            self._build_inference_engine()
+            print(f"Modelo cargado desde: {self.model_path}")
+            print(f"Clases disponibles: {self.classes}")
+            self._warn_feature_version()
+            return True
+        except Exception as e:
+            print(f"Error al cargar modelo: {e}")
+            self.model = None
+            return False
+    
+    def _dataset_feature_names(self, df):
+        """
+        Nombres de las características del dataset de entrenamiento
+        
+        Si el dataset tiene las 64 columnas del extractor se usan los nombres de
+        FeatureExtractor.create_feature_names; si no, los encabezados del CSV.
+        """
+        from ..features import FeatureExtractor
+        
+        feature_names = FeatureExtractor().create_feature_names()
+        if df.shape[1] - 1 == len(feature_names):
+            return feature_names
+        return [str(column) for column in df.columns[:-1]]
+    
+    def check_compatibility(self, feature_names=None, preprocessing=None):
+        """
+        Comprueba el artefacto guardado leyendo solo su cabecera
+        
+        La versión de las características se compara siempre con la del extractor actual.
+        
+        Args:
+            feature_names: Características que producirá el extractor (None = no comprobar)
+            preprocessing: Parámetros del preprocesamiento actual (None = no comprobar)
+            
+        Returns:
+            Lista de problemas encontrados (vacía si es compatible)
+        """
+        metadata = read_metadata(self.artifact_path)
+        if metadata is None:
+            return [f"No hay un artefacto de modelo en: {self.artifact_path}"]
+        return check_compatibility(metadata, feature_names, FEATURE_VERSION, preprocessing)
+    
+    def _warn_feature_version(self):
+        """Avisa si el modelo cargado espera otra versión de las características"""
+        if self.feature_version != FEATURE_VERSION:
+            print(f"Advertencia: el modelo usa la versión {self.feature_version} de las características "
+                  f"y el extractor produce la versión {FEATURE_VERSION}; reentrena el modelo")
+    
+    def warm_up(self):
+        """
+        Predice una muestra de ceros para cargar las páginas del modelo antes de la primera
+        predicción real
+        
+        Returns:
+            True si el modelo está entrenado y se realizó la predicción
+        """
+        if not self.is_trained():
+            return False
+        
+        if self.feature_names is not None:
+            n_features = len(self.feature_names)
+        elif self.model is not None:
+            n_features = self.model.n_features_in_
+        else:
+            return False
+        
+        self.predict_batch(np.zeros((1, n_features)))
+        return True
+    
+    def export_flat_forest(self):
+        """
+        Aplana el bosque entrenado y su scaler en arreglos de NumPy
+        
+        Returns:
+            FlatForest que predice a partir de las características sin normalizar
+        """
+        if self.model is None:
+            raise ValueError("Modelo no entrenado.")
+        
+        return FlatForest.from_sklearn(self.model, self.scaler)
+    
+    def _build_inference_engine(self):
+        """Prepara el bosque aplanado si es el motor de inferencia configurado"""
+        self.flat_forest = self.export_flat_forest() if self.inference == "flat" else None
     
     def is_trained(self):
         """Verifica si el modelo está entrenado"""
-        return self.model is not None
+        return self.model is not None or self.flat_forest is not None
     
     def get_feature_importance(self):
         """
@@ -148,7 +370,7 @@ class ActivityClassifier:
         Returns:
             Array con la importancia de cada característica
         """
-        if self.model is None:
+        if self.model is None and not self._load_pickled_model():
             raise ValueError("Modelo no entrenado.")
         
         return self.model.feature_importances_
@@ -0,0 +1,153 @@
+"""
+Bosque aleatorio aplanado en arreglos contiguos para predecir con NumPy puro
+"""
+
+import numpy as np
+
+class FlatForest:
+    def __init__(self, feature, threshold, children, missing_left, leaf_proba, roots, max_depth, classes):
+        """
+        Nodos de todos los árboles concatenados en arreglos planos
+        
+        Las hojas apuntan a sí mismas en children, así todas las muestras avanzan max_depth
+        pasos sin comprobar en qué nivel terminó cada árbol.
+        
+        Args:
+            feature: Característica evaluada en cada nodo (n_nodos,)
+            threshold: Umbral de cada nodo en unidades de las características crudas (n_nodos,)
+            children: Hijos izquierdo y derecho de cada nodo (n_nodos × 2)
+            missing_left: Los valores NaN van al hijo izquierdo (n_nodos,)
+            leaf_proba: Probabilidades por clase de cada nodo (n_nodos × clases)
+            roots: Nodo raíz de cada árbol (n_árboles,)
+            max_depth: Profundidad máxima entre todos los árboles
+            classes: Clases en el orden de las columnas de leaf_proba
+        """
+        self.feature = np.ascontiguousarray(feature, dtype=np.intp)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.children = np.ascontiguousarray(children, dtype=np.intp)
+        self.missing_left = np.ascontiguousarray(missing_left, dtype=bool)
+        self.leaf_proba = np.ascontiguousarray(leaf_proba, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.intp)
+        self.max_depth = int(max_depth)
+        self.classes = np.asarray(classes)
+    
+    @classmethod
+    def from_sklearn(cls, model, scaler=None):
+        """
+        Exporta un RandomForestClassifier entrenado (y opcionalmente su StandardScaler)
+        
+        Los árboles solo comparan cada característica con un umbral, así que la normalización
+        (x - media) / escala se traslada a los umbrales: x ≤ umbral · escala + media. El bosque
+        exportado recibe las características crudas y no necesita el scaler.
+        
+        Args:
+            model: RandomForestClassifier entrenado con una sola salida
+            scaler: StandardScaler aplicado antes del bosque (None = sin normalización)
+        
+        Returns:
+            FlatForest con las mismas probabilidades que model.predict_proba(scaler.transform(X))
+        """
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        if any(tree.n_outputs != 1 for tree in trees):
+            raise ValueError("Solo se pueden aplanar bosques con una sola salida")
+        
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        feature, threshold, children, missing_left, leaf_proba = [], [], [], [], []
+        
+        for offset, tree in zip(offsets, trees):
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left < 0
+            
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, 0.0, tree.threshold))
+            children.append(np.column_stack([
+                np.where(is_leaf, nodes, tree.children_left),
+                np.where(is_leaf, nodes, tree.children_right)
+            ]) + offset)
+            missing_left.append(np.asarray(tree.missing_go_to_left, dtype=bool) & ~is_leaf)
+            
+            # Fracción de muestras de entrenamiento por clase, como DecisionTreeClassifier.predict_proba
+            counts = tree.value[:, 0, :]
+            totals = counts.sum(axis=1, keepdims=True)
+            leaf_proba.append(np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0))
+        
+        feature = np.concatenate(feature)
+        threshold = np.concatenate(threshold)
+        
+        if scaler is not None:
+            n_features = model.n_features_in_
+            mean = np.zeros(n_features) if scaler.mean_ is None else scaler.mean_
+            scale = np.ones(n_features) if scaler.scale_ is None else scaler.scale_
+            threshold = threshold * scale[feature] + mean[feature]
+        
+        return cls(
+            feature=feature,
+            threshold=threshold,
+            children=np.concatenate(children),
+            missing_left=np.concatenate(missing_left),
+            leaf_proba=np.concatenate(leaf_proba),
+            roots=offsets[:-1],
+            max_depth=max(tree.max_depth for tree in trees),
+            classes=model.classes_
+        )
+    
+    @property
+    def n_trees(self):
+        return len(self.roots)
+    
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+    
+    def apply(self, features_matrix):
+        """
+        Hoja alcanzada en cada árbol
+        
+        Args:
+            features_matrix: Matriz (muestras × características) sin normalizar, o un solo vector
+        
+        Returns:
+            Matriz (muestras × árboles) con índices de nodo
+        """
+        X = np.asarray(features_matrix, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        
+        rows = np.arange(len(X))[:, np.newaxis]
+        nodes = np.repeat(self.roots[np.newaxis, :], len(X), axis=0)
+        has_missing = np.isnan(X).any()
+        
+        # Todas las muestras y árboles avanzan un nivel por iteración
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[nodes]]
+            go_right = ~(values <= self.threshold[nodes])
+            if has_missing:
+                go_right &= ~(np.isnan(values) & self.missing_left[nodes])
+            nodes = self.children[nodes, go_right.astype(np.intp)]
+        
+        return nodes
+    
+    def predict_proba(self, features_matrix):
+        """
+        Probabilidad media de los árboles para cada clase
+        
+        Args:
+            features_matrix: Matriz (muestras × características) sin normalizar, o un solo vector
+        
+        Returns:
+            Matriz (muestras × clases) en el orden de self.classes
+        """
+        leaves = self.apply(features_matrix)
+        return self.leaf_proba[leaves].sum(axis=1) / self.n_trees
+    
+    def predict(self, features_matrix):
+        """
+        Clase más probable de cada muestra
+        
+        Args:
+            features_matrix: Matriz (muestras × características) sin normalizar, o un solo vector
+        
+        Returns:
+            Arreglo con una clase por muestra
+        """
+        return self.classes.take(np.argmax(self.predict_proba(features_matrix), axis=1))
@@ -0,0 +1,238 @@
+"""
+Artefacto versionado del clasificador: cabecera JSON pequeña y arreglos .npy mapeables en memoria
+"""
+
+import os
+import json
+import hashlib
+import datetime
+import numpy as np
+from .flat_forest import FlatForest
+
+ARTIFACT_FORMAT_VERSION = 1
+
+METADATA_FILE = "metadata.json"
+
+ARRAY_NAMES = ('feature', 'threshold', 'children', 'missing_left', 'leaf_proba', 'roots')
+
+def artifact_path(model_path):
+    """
+    Carpeta del artefacto asociada a la ruta del modelo (models/x.pkl → models/x/)
+    
+    Args:
+        model_path: Ruta del modelo serializado con joblib
+    """
+    return os.path.splitext(model_path)[0]
+
+def hash_file(path, chunk_size=1 << 20):
+    """
+    SHA-256 del contenido de un archivo (identifica el dataset de entrenamiento)
+    
+    Args:
+        path: Ruta del archivo
+        chunk_size: Bytes leídos por bloque
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def dataset_info_path(dataset_path):
+    """
+    Archivo con el origen de las características de un dataset (data/dataset.csv → data/dataset.info.json)
+    
+    Args:
+        dataset_path: Ruta del CSV de características
+    """
+    return os.path.splitext(dataset_path)[0] + ".info.json"
+
+def write_dataset_info(dataset_path, feature_version, preprocessing=None):
+    """
+    Guarda junto al dataset la versión de las características y el preprocesamiento con que se generó
+    
+    Args:
+        dataset_path: Ruta del CSV de características ya escrito
+        feature_version: Versión de las características (FEATURE_VERSION del extractor)
+        preprocessing: Parámetros del preprocesamiento (DataPreprocessor.feature_config)
+    
+    Returns:
+        Diccionario con la información guardada
+    """
+    info = {
+        'feature_version': feature_version,
+        'preprocessing': preprocessing,
+        'data_hash': hash_file(dataset_path)
+    }
+    with open(dataset_info_path(dataset_path), 'w', encoding='utf-8') as f:
+        json.dump(info, f, indent=2, ensure_ascii=False)
+    return info
+
+def read_dataset_info(dataset_path):
+    """
+    Lee el origen de las características de un dataset
+    
+    Sin archivo de información, o si el CSV cambió desde que se escribió, el dataset se trata como
+    los originales: versión 1 de las características y preprocesamiento desconocido.
+    
+    Args:
+        dataset_path: Ruta del CSV de características
+    
+    Returns:
+        Tupla (feature_version, preprocessing o None)
+    """
+    info_file = dataset_info_path(dataset_path)
+    if not os.path.exists(info_file):
+        return 1, None
+    with open(info_file, encoding='utf-8') as f:
+        info = json.load(f)
+    
+    if info.get('data_hash') not in (None, hash_file(dataset_path)):
+        print(f"Advertencia: {info_file} no corresponde al contenido actual de {dataset_path}; se ignora")
+        return 1, None
+    return info.get('feature_version') or 1, info.get('preprocessing')
+
+def save_artifact(path, flat_forest, feature_names=None, training_data_hash=None, sklearn_version=None,
+                  feature_version=None, preprocessing=None):
+    """
+    Guarda el bosque aplanado como un .npy por arreglo más la cabecera metadata.json
+    
+    La cabecera se escribe al final: una carpeta sin metadata.json es un artefacto incompleto.
+    
+    Args:
+        path: Carpeta de destino
+        flat_forest: FlatForest exportado del clasificador
+        feature_names: Nombres de las características de entrada, en orden
+        training_data_hash: SHA-256 del dataset de entrenamiento
+        sklearn_version: Versión de scikit-learn con la que se entrenó
+        feature_version: Versión de las características (FEATURE_VERSION del extractor)
+        preprocessing: Parámetros del preprocesamiento (DataPreprocessor.feature_config)
+    
+    Returns:
+        Diccionario con los metadatos guardados
+    """
+    os.makedirs(path, exist_ok=True)
+    metadata_file = os.path.join(path, METADATA_FILE)
+    if os.path.exists(metadata_file):
+        os.remove(metadata_file)
+    
+    arrays = {}
+    for name in ARRAY_NAMES:
+        array = np.ascontiguousarray(getattr(flat_forest, name))
+        np.save(os.path.join(path, f"{name}.npy"), array)
+        arrays[name] = {'dtype': array.dtype.str, 'shape': list(array.shape)}
+    
+    metadata = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'classes': np.asarray(flat_forest.classes).tolist(),
+        'feature_names': None if feature_names is None else list(feature_names),
+        'feature_version': feature_version,
+        'preprocessing': preprocessing,
+        'training_data_hash': training_data_hash,
+        'sklearn_version': sklearn_version,
+        'n_trees': flat_forest.n_trees,
+        'n_nodes': flat_forest.n_nodes,
+        'max_depth': flat_forest.max_depth,
+        'arrays': arrays
+    }
+    
+    temp_file = metadata_file + ".tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    os.replace(temp_file, metadata_file)
+    
+    return metadata
+
+def read_metadata(path):
+    """
+    Lee solo la cabecera del artefacto (sin tocar los arreglos)
+    
+    Args:
+        path: Carpeta del artefacto
+    
+    Returns:
+        Diccionario con los metadatos, o None si la carpeta no contiene un artefacto completo
+    """
+    metadata_file = os.path.join(path, METADATA_FILE)
+    if not os.path.exists(metadata_file):
+        return None
+    with open(metadata_file, encoding='utf-8') as f:
+        return json.load(f)
+
+def check_compatibility(metadata, feature_names=None, feature_version=None, preprocessing=None):
+    """
+    Comprueba que el artefacto se puede usar sin cargarlo
+    
+    El formato y los arreglos se comprueban siempre; nombres, versión de las características y
+    preprocesamiento solo si se indican (un modelo con otras características carga, pero predice mal).
+    
+    Args:
+        metadata: Cabecera leída con read_metadata
+        feature_names: Características que producirá el extractor (None = no comprobar)
+        feature_version: Versión de las características del extractor (None = no comprobar)
+        preprocessing: Parámetros del preprocesamiento actual (None = no comprobar)
+    
+    Returns:
+        Lista de problemas encontrados (vacía si es compatible)
+    """
+    problems = []
+    if metadata.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        problems.append(f"Versión de formato {metadata.get('format_version')} no soportada "
+                        f"(se esperaba {ARTIFACT_FORMAT_VERSION})")
+    
+    missing = [name for name in ARRAY_NAMES if name not in metadata.get('arrays', {})]
+    if missing:
+        problems.append(f"Faltan arreglos en el artefacto: {missing}")
+    
+    expected = metadata.get('feature_names')
+    if feature_names is not None and expected is not None and list(feature_names) != list(expected):
+        problems.append(f"El modelo espera {len(expected)} características con otros nombres u orden "
+                        f"que las {len(feature_names)} del extractor")
+    
+    # Artefactos sin el campo: anteriores a la versión de las características, como los modelos originales
+    saved_version = metadata.get('feature_version') or 1
+    if feature_version is not None and saved_version != feature_version:
+        problems.append(f"El modelo se entrenó con la versión {saved_version} de las características y el "
+                        f"extractor produce la versión {feature_version}; hay que reentrenarlo")
+    
+    saved_preprocessing = metadata.get('preprocessing')
+    if preprocessing is not None and saved_preprocessing is not None and saved_preprocessing != preprocessing:
+        problems.append(f"El modelo se entrenó con el preprocesamiento {saved_preprocessing} "
+                        f"y el actual es {preprocessing}")
+    
+    return problems
+
+def load_artifact(path, mmap=True):
+    """
+    Carga el bosque aplanado de un artefacto
+    
+    Con mmap los arreglos se mapean en memoria: la carga no lee los datos y los procesos
+    que abren el mismo artefacto comparten las páginas del sistema operativo.
+    
+    Args:
+        path: Carpeta del artefacto
+        mmap: Mapear los arreglos en memoria de solo lectura (False = leerlos completos)
+    
+    Returns:
+        Tupla con (FlatForest, metadatos)
+    """
+    metadata = read_metadata(path)
+    if metadata is None:
+        raise FileNotFoundError(f"No hay un artefacto de modelo en: {path}")
+    
+    problems = check_compatibility(metadata)
+    if problems:
+        raise ValueError("; ".join(problems))
+    
+    mmap_mode = 'r' if mmap else None
+    arrays = {}
+    for name in ARRAY_NAMES:
+        array = np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+        expected = metadata['arrays'][name]
+        if array.dtype.str != expected['dtype'] or list(array.shape) != expected['shape']:
+            raise ValueError(f"El arreglo {name} no coincide con la cabecera del artefacto")
+        arrays[name] = array
+    
+    flat_forest = FlatForest(max_depth=metadata['max_depth'], classes=metadata['classes'], **arrays)
+    return flat_forest, metadata
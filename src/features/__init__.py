@@ -2,6 +2,6 @@
 Módulo de extracción de características
 """
 
-from .feature_extractor import FeatureExtractor
+from .feature_extractor import FeatureExtractor, FEATURE_VERSION
 
-__all__ = ['FeatureExtractor']
+__all__ = ['FeatureExtractor', 'FEATURE_VERSION']
@@ -5,6 +5,14 @@ Módulo para extraer características de distancias y velocidades
 import pandas as pd
 import numpy as np
 import os
+from joblib import Parallel, delayed
+from ..utils.stage_timer import STAGE_TIMER
+from ..utils.skeleton_sequence import SkeletonSequence
+
+# Versión del significado de las 64 características; se guarda con cada modelo entrenado.
+# 1: velocidades siempre con intervalo de 1/30 s entre frames remuestreados (modelos originales)
+# 2: con timestamps de la cámara, velocidades con el intervalo real entre muestras
+FEATURE_VERSION = 2
 
 class FeatureExtractor:
     def __init__(self):
@@ -21,7 +29,13 @@ class FeatureExtractor:
             'joint30'   # Talón derecho
         ]
         
-        # Intervalo de tiempo entre frames (asumiendo 30 FPS)
+        # Índices numéricos de los joints objetivo dentro del arreglo (frames × 33 × 3)
+        self.target_joint_ids = [int(joint.replace('joint', '')) for joint in self.target_joints]
+        
+        # Joints usados para calcular la espina cuando no viene precalculada
+        self.spine_joint_ids = [11, 12, 23, 24]
+        
+        # Intervalo entre frames cuando los datos no traen columna 'timestamp' (CSV antiguos, 30 FPS)
         self.time_interval = 1.0 / 30.0  # 0.033 segundos
         
     def extract_features(self, processed_file):
@@ -39,111 +53,212 @@ class FeatureExtractor:
         # Leer datos procesados
         df = pd.read_csv(processed_file)
         
-        # Calcular distancias
-        distances_df = self._calculate_distances(df)
-        
-        # Calcular velocidades
-        velocities_df = self._calculate_velocities(distances_df)
-        
-        # Extraer características estadísticas
-        features = self._extract_statistical_features(distances_df, velocities_df)
+        features = self.extract_features_from_dataframe(df)
         
         print(f"Extraídas {len(features)} características")
         return features
     
-    def _calculate_distances(self, df):
+    def extract_features_batch(self, sources, n_jobs=1):
         """
-        Calcula distancias euclidianas de joints específicos hacia la espina
+        Extrae las características de muchos clips a la vez
         
         Args:
-            df: DataFrame con coordenadas de joints y espina
+            sources: Lista de rutas a CSV procesados, DataFrames procesados,
+                     SkeletonSequence procesadas o arreglos (frames × joints × 3)
+            n_jobs: Procesos en paralelo (1 = secuencial, -1 = todos los núcleos)
             
         Returns:
-            DataFrame con distancias calculadas
+            Matriz (clips × 64) con las características de cada clip
         """
-        print("Calculando distancias...")
+        print(f"Extrayendo características de {len(sources)} clips (n_jobs={n_jobs})...")
         
-        distances = []
+        if n_jobs == 1:
+            rows = [self._features_from_source(source) for source in sources]
+        else:
+            rows = Parallel(n_jobs=n_jobs)(
+                delayed(self._features_from_source)(source) for source in sources
+            )
         
-        for _, row in df.iterrows():
-            espina_x, espina_y, espina_z = row['espina_x'], row['espina_y'], row['espina_z']
+        features_matrix = np.asarray(rows, dtype=np.float64).reshape(len(rows), -1)
+        print(f"Extraídas {features_matrix.shape[1]} características por clip")
+        return features_matrix
+    
+    def _features_from_source(self, source):
+        """
+        Obtiene las 64 características de una ruta, DataFrame o arreglo
+        
+        Args:
+            source: Ruta a CSV procesado, DataFrame procesado, SkeletonSequence o arreglo (frames × joints × 3)
             
-            frame_distances = []
-            for joint in self.target_joints:
-                joint_x = row[f'{joint}_x']
-                joint_y = row[f'{joint}_y'] 
-                joint_z = row[f'{joint}_z']
-                
-                # Calcular distancia euclidiana
-                distance = np.sqrt(
-                    (joint_x - espina_x)**2 + 
-                    (joint_y - espina_y)**2 + 
-                    (joint_z - espina_z)**2
-                )
-                frame_distances.append(distance)
+        Returns:
+            Lista con las 64 características
+        """
+        if isinstance(source, SkeletonSequence):
+            return self.extract_features_from_sequence(source)
+        if isinstance(source, (str, os.PathLike)):
+            return self.extract_features_from_dataframe(pd.read_csv(source))
+        if isinstance(source, pd.DataFrame):
+            return self.extract_features_from_dataframe(source)
+        return self.extract_features_from_array(source)
+    
+    def extract_features_from_dataframe(self, df):
+        """
+        Extrae las 64 características de un DataFrame procesado ya cargado en memoria
+        
+        Args:
+            df: DataFrame con columnas joint{i}_x/y/z, espina_x/y/z y opcionalmente timestamp
             
-            distances.append(frame_distances)
+        Returns:
+            Lista con las 64 características
+        """
+        # Convertir a arreglos y calcular todas las características de una vez
+        joints, spine, timestamps = self._dataframe_to_arrays(df)
+        return self.extract_features_from_array(joints, spine, timestamps)
+    
+    def extract_features_from_sequence(self, sequence):
+        """
+        Extrae las 64 características de una SkeletonSequence procesada
         
-        # Crear DataFrame con distancias
-        columns = [f'Distancia_{i+1}' for i in range(len(self.target_joints))]
-        distances_df = pd.DataFrame(distances, columns=columns)
+        Args:
+            sequence: SkeletonSequence con 33 joints (la espina se calcula si no viene precalculada)
+            
+        Returns:
+            Lista con las 64 características
+        """
+        return self.extract_features_from_array(sequence.joints, sequence.spine(), sequence.timestamps)
+    
+    def extract_features_from_array(self, joints, spine=None, timestamps=None):
+        """
+        Extrae las 64 características directamente de un arreglo de coordenadas
         
-        return distances_df
+        Args:
+            joints: Arreglo (frames × joints × 3) con coordenadas x, y, z
+            spine: Arreglo (frames × 3) con la espina; si es None se calcula
+                   como centroide de hombros y caderas
+            timestamps: Segundos de cada frame (None = frames separados por time_interval)
+            
+        Returns:
+            Lista con las 64 características
+        """
+        with STAGE_TIMER.stage("features.extract"):
+            joints = np.asarray(joints, dtype=np.float64)
+            if spine is None:
+                spine = joints[:, self.spine_joint_ids, :].mean(axis=1)
+            else:
+                spine = np.asarray(spine, dtype=np.float64)
+            
+            distances = self._calculate_distances(joints, spine)
+            velocities = self._calculate_velocities(distances, timestamps)
+            
+            return self._extract_statistical_features(distances, velocities).tolist()
     
-    def _calculate_velocities(self, distances_df):
+    def _dataframe_to_arrays(self, df):
         """
-        Calcula velocidades como cambio de distancia entre frames consecutivos
+        Convierte un DataFrame procesado (joint{i}_x/y/z + espina_x/y/z) en arreglos
         
         Args:
-            distances_df: DataFrame con distancias
+            df: DataFrame con coordenadas de joints y espina
             
         Returns:
-            DataFrame con velocidades
+            Tupla con (joints (frames × 33 × 3), espina (frames × 3), timestamps o None)
+        """
+        joint_columns = [f'joint{i}_{coord}' for i in range(33) for coord in ('x', 'y', 'z')]
+        joints = df[joint_columns].to_numpy(dtype=np.float64).reshape(len(df), 33, 3)
+        spine = df[['espina_x', 'espina_y', 'espina_z']].to_numpy(dtype=np.float64)
+        timestamps = df['timestamp'].to_numpy(dtype=np.float64) if 'timestamp' in df.columns else None
+        return joints, spine, timestamps
+    
+    def _calculate_distances(self, joints, spine):
         """
-        print("Calculando velocidades...")
+        Calcula distancias euclidianas de joints específicos hacia la espina
         
-        # Calcular diferencias entre frames consecutivos y dividir por tiempo
-        velocities_df = distances_df.diff().iloc[1:] / self.time_interval
+        Args:
+            joints: Arreglo (frames × joints × 3) con coordenadas
+            spine: Arreglo (frames × 3) con coordenadas de la espina
+            
+        Returns:
+            Arreglo (frames × 8) con distancias calculadas
+        """
+        delta = joints[:, self.target_joint_ids, :] - spine[:, np.newaxis, :]
+        return np.sqrt(delta[..., 0]**2 + delta[..., 1]**2 + delta[..., 2]**2)
+    
+    def _calculate_velocities(self, distances, timestamps=None):
+        """
+        Calcula velocidades como cambio de distancia entre frames consecutivos
         
-        # Renombrar columnas
-        velocities_df.columns = [f'Velocidad_{i+1}' for i in range(len(self.target_joints))]
+        Args:
+            distances: Arreglo (frames × 8) con distancias
+            timestamps: Segundos de cada frame (None = time_interval entre frames)
+            
+        Returns:
+            Arreglo (frames - 1 × 8) con velocidades
+        """
+        # Calcular diferencias entre frames consecutivos y dividir por el tiempo transcurrido
+        if timestamps is None:
+            return np.diff(distances, axis=0) / self.time_interval
         
-        return velocities_df
+        dt = np.diff(np.asarray(timestamps, dtype=np.float64))
+        # Intervalos nulos o inválidos (reloj repetido) usan el intervalo nominal
+        dt = np.where(np.isfinite(dt) & (dt > 0), dt, self.time_interval)
+        return np.diff(distances, axis=0) / dt[:, np.newaxis]
     
-    def _extract_statistical_features(self, distances_df, velocities_df):
+    def _extract_statistical_features(self, distances, velocities):
         """
         Extrae características estadísticas de distancias y velocidades
         
         Args:
-            distances_df: DataFrame con distancias
-            velocities_df: DataFrame con velocidades
+            distances: Arreglo (frames × 8) con distancias
+            velocities: Arreglo (frames - 1 × 8) con velocidades
+            
+        Returns:
+            Arreglo con 64 características (8 distancias × 4 métricas + 8 velocidades × 4 métricas)
+        """
+        return np.concatenate([
+            self._column_statistics(distances),
+            self._column_statistics(velocities)
+        ])
+    
+    def _column_statistics(self, values):
+        """
+        Calcula media, varianza muestral, máximo y mínimo por columna
+        
+        Args:
+            values: Arreglo (frames × columnas)
             
         Returns:
-            Lista con 64 características (8 distancias × 4 métricas + 8 velocidades × 4 métricas)
-        """
-        print("Extrayendo características estadísticas...")
-        
-        features = []
-        
-        # Características de distancias
-        for column in distances_df.columns:
-            features.extend([
-                distances_df[column].mean(),    # Media
-                distances_df[column].var(),     # Varianza
-                distances_df[column].max(),     # Máximo
-                distances_df[column].min()      # Mínimo
-            ])
-        
-        # Características de velocidades
-        for column in velocities_df.columns:
-            features.extend([
-                velocities_df[column].mean(),   # Media
-                velocities_df[column].var(),    # Varianza
-                velocities_df[column].max(),    # Máximo
-                velocities_df[column].min()     # Mínimo
-            ])
+            Arreglo aplanado [media, varianza, max, min] por cada columna
+        """
+        # Igual que pandas: se ignoran los NaN y la varianza usa ddof=1
+        missing = np.isnan(values)
+        if missing.any():
+            # Sin np.nanmean/np.nanmax: avisan (RuntimeWarning) en columnas sin ningún valor válido.
+            # Columnas vacías → NaN; con un único valor, varianza NaN como en pandas
+            valid = ~missing
+            counts = valid.sum(axis=0)
+            filled = np.where(valid, values, 0.0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = filled.sum(axis=0) / counts
+                deviations = np.where(valid, values - mean, 0.0)
+                variance = (deviations ** 2).sum(axis=0) / (counts - 1)
+            variance[counts < 2] = np.nan
+            maximum = np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf)
+            minimum = np.where(valid, values, np.inf).min(axis=0, initial=np.inf)
+            empty = counts == 0
+            maximum[empty] = np.nan
+            minimum[empty] = np.nan
+            stats = np.stack([mean, variance, maximum, minimum], axis=1)
+        elif len(values) == 0:
+            stats = np.full((values.shape[1], 4), np.nan)
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                stats = np.stack([
+                    values.mean(axis=0),
+                    values.var(axis=0, ddof=1),
+                    values.max(axis=0),
+                    values.min(axis=0)
+                ], axis=1)
         
-        return features
+        return stats.ravel()
     
     def create_feature_names(self):
         """
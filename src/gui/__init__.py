@@ -0,0 +1,7 @@
+"""
+Componentes reutilizables de la interfaz gráfica
+"""
+
+from .preview_renderer import PreviewRenderer
+
+__all__ = ['PreviewRenderer']
@@ -0,0 +1,167 @@
+"""
+Renderizado de la vista previa en un canvas de Tkinter sin crear objetos nuevos por frame
+"""
+
+import threading
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+from ..utils.rate_meter import RateMeter
+from ..utils.trace_recorder import TRACER
+
+class PreviewRenderer:
+    def __init__(self, canvas, width=640, height=480, scale=1.0):
+        """
+        Inicializa el renderizador de la vista previa
+        
+        Usa un buffer BGR y uno RGBA preasignados, una única PhotoImage y un único
+        item de imagen en el canvas que se actualizan en sitio. Los textos de estado
+        son items de texto del canvas que solo se modifican cuando cambian.
+        
+        Con scale < 1 el frame se reduce con cv2.resize antes de dibujar y convertir, así
+        la conversión de color y la copia a la PhotoImage (lo que más cuesta en el hilo de Tk)
+        trabajan con menos píxeles. La imagen reducida se centra en el canvas y los textos
+        se colocan y dimensionan en proporción.
+        
+        Args:
+            canvas: tk.Canvas donde se muestra el video
+            width: Ancho del canvas (y de la imagen a escala 1)
+            height: Alto del canvas (y de la imagen a escala 1)
+            scale: Fracción del tamaño del canvas a la que se muestra la imagen (0-1]
+        """
+        if not 0 < scale <= 1:
+            raise ValueError(f"La escala de la vista previa debe estar en (0, 1]: {scale}")
+        
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.image_width = max(1, int(round(width * scale)))
+        self.image_height = max(1, int(round(height * scale)))
+        # Esquina superior izquierda de la imagen centrada en el canvas
+        self._origin = ((width - self.image_width) // 2, (height - self.image_height) // 2)
+        
+        self._bgr = np.empty((self.image_height, self.image_width, 3), dtype=np.uint8)
+        # RGBA para que PIL comparta la memoria del arreglo (en modo RGB la copiaría)
+        self._rgba = np.empty((self.image_height, self.image_width, 4), dtype=np.uint8)
+        self._pil_image = Image.fromarray(self._rgba)
+        
+        self._photo = None
+        self._image_item = None
+        self._text_items = {}     # clave -> id del item de texto en el canvas
+        self._drawn_overlays = {} # clave -> (texto, posición, color, fuente) mostrado
+        self._overlays = {}       # clave -> estado deseado
+        
+        self._lock = threading.Lock()
+        self._pending = False
+        self._generation = 0  # Invalida refrescos programados antes de un reset()
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        self.display_rate = RateMeter()
+    
+    def submit(self, image, draw=None):
+        """
+        Prepara un frame para mostrarlo (llamar desde el hilo de video)
+        
+        Si el bucle de Tk aún no mostró el frame anterior, este se descarta en lugar
+        de acumular trabajo pendiente.
+        
+        Args:
+            image: Imagen BGR (no se modifica)
+            draw: Función opcional que dibuja sobre el buffer BGR (p. ej. landmarks)
+            
+        Returns:
+            True si el frame se programó, False si se descartó
+        """
+        with self._lock:
+            if self._pending:
+                self.frames_skipped += 1
+                return False
+        
+        if image.shape[:2] != (self.image_height, self.image_width):
+            interpolation = cv2.INTER_AREA if image.shape[1] > self.image_width else cv2.INTER_LINEAR
+            cv2.resize(image, (self.image_width, self.image_height), dst=self._bgr,
+                       interpolation=interpolation)
+        else:
+            np.copyto(self._bgr, image)
+        if draw is not None:
+            draw(self._bgr)
+        cv2.cvtColor(self._bgr, cv2.COLOR_BGR2RGBA, dst=self._rgba)
+        
+        with self._lock:
+            self._pending = True
+            generation = self._generation
+        self.canvas.after(0, self._present, generation)
+        return True
+    
+    def set_overlays(self, overlays):
+        """
+        Define los textos superpuestos; los que no aparezcan se ocultan
+        
+        Args:
+            overlays: dict clave -> (texto, (x, y), color, fuente), con (x, y) la esquina inferior
+                izquierda en coordenadas de la imagen a escala 1
+        """
+        with self._lock:
+            self._overlays = dict(overlays)
+    
+    def reset(self):
+        """Olvida los items del canvas (llamar después de canvas.delete('all'))"""
+        with self._lock:
+            self._generation += 1
+            self._photo = None
+            self._image_item = None
+            self._text_items = {}
+            self._drawn_overlays = {}
+            self._pending = False
+    
+    @TRACER.traced("preview.present", "gui")
+    def _present(self, generation):
+        """Copia el buffer a la PhotoImage y actualiza los textos (hilo principal de Tk)"""
+        if generation != self._generation:
+            return
+        try:
+            if self._photo is None:
+                self._photo = ImageTk.PhotoImage(self._pil_image)
+                self._image_item = self.canvas.create_image(*self._origin, anchor='nw', image=self._photo)
+            else:
+                self._photo.paste(self._pil_image)
+            
+            with self._lock:
+                overlays = self._overlays
+            self._update_overlays(overlays)
+            self.frames_rendered += 1
+            self.display_rate.tick()
+        finally:
+            with self._lock:
+                self._pending = False
+    
+    def _update_overlays(self, overlays):
+        """Crea o modifica solo los textos que cambiaron"""
+        for key, spec in overlays.items():
+            if self._drawn_overlays.get(key) == spec:
+                continue
+            text, position, color, font = spec
+            (x, y), font = self._scaled(position, font)
+            item = self._text_items.get(key)
+            if item is None:
+                self._text_items[key] = self.canvas.create_text(x, y, text=text, fill=color,
+                                                                font=font, anchor='sw')
+            else:
+                self.canvas.itemconfigure(item, text=text, fill=color, font=font)
+                self.canvas.coords(item, x, y)
+            self._drawn_overlays[key] = spec
+        
+        for key in list(self._drawn_overlays):
+            if key not in overlays:
+                self.canvas.itemconfigure(self._text_items[key], text="")
+                del self._drawn_overlays[key]
+    
+    def _scaled(self, position, font):
+        """Posición en el canvas y fuente de un texto definido para la imagen a escala 1"""
+        x, y = position
+        x = self._origin[0] + x * self.scale
+        y = self._origin[1] + y * self.scale
+        if self.scale != 1 and isinstance(font, tuple) and len(font) >= 2:
+            font = (font[0], max(6, int(round(font[1] * self.scale)))) + tuple(font[2:])
+        return (x, y), font
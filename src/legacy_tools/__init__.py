@@ -3,6 +3,12 @@ Herramientas legacy para procesamiento de datos históricos y visualización
 """
 
 from .data_processor import LegacyDataProcessor
-from .visualizer import SkeletonVisualizer
 
 __all__ = ['LegacyDataProcessor', 'SkeletonVisualizer']
+
+def __getattr__(name):
+    # El visualizador importa matplotlib: se carga solo cuando se usa
+    if name == 'SkeletonVisualizer':
+        from .visualizer import SkeletonVisualizer
+        return SkeletonVisualizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,8 +2,12 @@
 Herramientas para procesar datos legacy y limpiar estructuras de carpetas antiguas
 """
 
+import io
 import os
+import re
 import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
 
 class LegacyDataProcessor:
@@ -126,15 +130,21 @@ class LegacyDataProcessor:
         print(f"Procesamiento completado. {files_processed} archivos modificados.")
         return True
     
-    def reshape_csvs_to_dataset(self, input_path, output_path, activity_prefix):
+    def reshape_csvs_to_dataset(self, input_path, output_path, activity_prefix, n_jobs=1,
+                                progress_callback=None):
         """
         Convierte archivos CSV de formato 33x3 a 1x99 y los combina en un dataset
         Equivalente a reshapeCSVs.py
         
+        Cada subcarpeta se procesa de forma independiente, así que con n_jobs > 1 se
+        reparten entre procesos. El resultado es idéntico al modo secuencial.
+        
         Args:
             input_path: Ruta donde están los archivos CSV individuales
             output_path: Ruta donde guardar los archivos reestructurados
             activity_prefix: Prefijo para nombrar los archivos de salida
+            n_jobs: Procesos en paralelo (1 = secuencial, None o -1 = todos los núcleos)
+            progress_callback: Función opcional (completadas, total, ruta) llamada al terminar cada subcarpeta
         """
         print(f"Reestructurando CSVs de {input_path} a {output_path}")
         
@@ -159,54 +169,249 @@ class LegacyDataProcessor:
                 if any(f.endswith('.csv') for f in os.listdir(csv_path)):
                     subcarpetas.append(csv_path)
         
+        tareas = [
+            (ruta, os.path.join(output_path, f"{activity_prefix}_{idx:02}.csv"))
+            for idx, ruta in enumerate(subcarpetas, start=1)
+        ]
+        total = len(tareas)
+        
+        if n_jobs is None or n_jobs < 1:
+            n_jobs = os.cpu_count() or 1
+        n_jobs = min(n_jobs, max(total, 1))
+        
         datasets_created = 0
+        completadas = 0
         
-        for idx, ruta in enumerate(subcarpetas, start=1):
-            archivos = [f for f in os.listdir(ruta) if f.endswith('.csv')]
-            todas_las_filas = []
-            
-            for archivo in archivos:
-                archivo_ruta = os.path.join(ruta, archivo)
-                
-                # Comprobar si el archivo está vacío
-                if os.path.getsize(archivo_ruta) == 0:
-                    print(f"Archivo vacío omitido: {archivo}")
-                    continue
-                
-                try:
-                    # Leer el archivo CSV
-                    df = pd.read_csv(archivo_ruta, header=None)
-                    
-                    # Verificar formato esperado (33 filas, 3 columnas)
-                    if df.shape[1] == 3 and df.shape[0] == 33:
-                        # Realizar reshape a una fila con 99 columnas
-                        df_reshaped = df.values.flatten()
-                        
-                        if df_reshaped.size == 99:
-                            todas_las_filas.append(df_reshaped)
-                        else:
-                            print(f"Tamaño incorrecto después del reshape: {archivo}")
-                    else:
-                        print(f"Formato incorrecto ({df.shape[0]}x{df.shape[1]}): {archivo}")
-                        
-                except Exception as e:
-                    print(f"Error procesando {archivo}: {e}")
-            
-            # Guardar dataset si se procesaron archivos
-            if todas_las_filas:
-                # Generar nombres de columnas
-                columnas = [f'joint{i // 3}_{["x", "y", "z"][i % 3]}' for i in range(99)]
-                
-                # Crear DataFrame
-                df_resumen = pd.DataFrame(todas_las_filas, columns=columnas)
-                
-                # Guardar archivo
-                archivo_salida = os.path.join(output_path, f"{activity_prefix}_{idx:02}.csv")
-                df_resumen.to_csv(archivo_salida, index=False)
-                print(f"Dataset creado: {archivo_salida} ({len(todas_las_filas)} filas)")
+        def _reportar(ruta, archivo_salida, filas, mensajes):
+            nonlocal datasets_created, completadas
+            completadas += 1
+            for mensaje in mensajes:
+                print(mensaje)
+            if filas:
+                print(f"Dataset creado: {archivo_salida} ({filas} filas)")
                 datasets_created += 1
             else:
                 print(f"No se procesaron archivos válidos en: {ruta}")
+            print(f"Progreso: {completadas}/{total} subcarpetas")
+            if progress_callback is not None:
+                progress_callback(completadas, total, ruta)
+        
+        if n_jobs == 1:
+            for ruta, archivo_salida in tareas:
+                filas, mensajes = _reshape_folder(ruta, archivo_salida)
+                _reportar(ruta, archivo_salida, filas, mensajes)
+        else:
+            print(f"Procesando {total} subcarpetas con {n_jobs} procesos...")
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                futuros = {
+                    executor.submit(_reshape_folder, ruta, archivo_salida): (ruta, archivo_salida)
+                    for ruta, archivo_salida in tareas
+                }
+                for futuro in as_completed(futuros):
+                    ruta, archivo_salida = futuros[futuro]
+                    filas, mensajes = futuro.result()
+                    _reportar(ruta, archivo_salida, filas, mensajes)
         
         print(f"Reestructuración completada. {datasets_created} datasets creados.")
         return True
+
+
+RESHAPE_COLUMNS = [f'joint{i // 3}_{["x", "y", "z"][i % 3]}' for i in range(99)]
+
+# Archivos 33x3 leídos por cada llamada a pd.read_csv
+READ_BATCH_FILES = 256
+
+# Campos que pandas lee como int64 (hasta 15 cifras, exactos en float64) o como float64
+INTEGER_TOKEN = re.compile(rb'-?\d{1,15}')
+DECIMAL_TOKEN = re.compile(rb'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+
+def _reshape_folder(ruta, archivo_salida):
+    """
+    Reestructura todos los CSV 33x3 de una subcarpeta y guarda el dataset 1x99
+    
+    Se ejecuta en un proceso aparte, por eso los mensajes se devuelven en lugar de imprimirse.
+    
+    Args:
+        ruta: Subcarpeta con los CSV individuales
+        archivo_salida: Ruta del CSV de salida
+        
+    Returns:
+        Tupla con (filas_guardadas, mensajes)
+    """
+    archivos = [f for f in os.listdir(ruta) if f.endswith('.csv')]
+    mensajes = []
+    todas_las_filas = _read_frame_files(ruta, archivos, mensajes)
+    
+    if not todas_las_filas:
+        return 0, mensajes
+    
+    # Con filas de un único tipo se apilan directamente; la inferencia de tipos por
+    # columna de pandas da el mismo resultado que construir desde la lista
+    if len({fila.dtype for fila in todas_las_filas}) == 1 and todas_las_filas[0].dtype.kind in 'if':
+        df_resumen = pd.DataFrame(np.vstack(todas_las_filas), columns=RESHAPE_COLUMNS)
+    else:
+        df_resumen = pd.DataFrame(todas_las_filas, columns=RESHAPE_COLUMNS)
+    
+    df_resumen.to_csv(archivo_salida, index=False)
+    return len(todas_las_filas), mensajes
+
+
+def _read_frame_files(ruta, archivos, mensajes):
+    """
+    Lee los CSV 33x3 de una subcarpeta y devuelve cada uno aplanado a 99 valores
+    
+    Los archivos numéricos con la forma esperada se concatenan en bloques de READ_BATCH_FILES
+    y se leen con una llamada a pd.read_csv por bloque, evitando el coste fijo de pandas por
+    archivo; los decimales pasan por el mismo parser que al leerlos uno a uno. Los archivos
+    atípicos (cabeceras, campos vacíos o de texto, filas de más o de menos) se leen uno a uno
+    como antes, que también genera sus mensajes.
+    
+    Args:
+        ruta: Subcarpeta con los CSV individuales
+        archivos: Nombres de los CSV, en el orden en que deben aparecer en el dataset
+        mensajes: Lista donde se acumulan los avisos por archivo
+        
+    Returns:
+        Lista de arreglos de 99 valores, uno por archivo válido
+    """
+    contenidos = []
+    columnas_enteras = []
+    for archivo in archivos:
+        archivo_ruta = os.path.join(ruta, archivo)
+        
+        # Comprobar si el archivo está vacío
+        if os.path.getsize(archivo_ruta) == 0:
+            mensajes.append(f"Archivo vacío omitido: {archivo}")
+            contenidos.append(None)
+            columnas_enteras.append(None)
+            continue
+        
+        with open(archivo_ruta, 'rb') as f:
+            datos = f.read()
+        contenidos.append(datos)
+        columnas_enteras.append(_integer_columns(datos))
+    
+    rapidos = [i for i, enteras in enumerate(columnas_enteras) if enteras is not None]
+    filas_rapidas = {}
+    for inicio in range(0, len(rapidos), READ_BATCH_FILES):
+        lote = rapidos[inicio:inicio + READ_BATCH_FILES]
+        filas = _parse_block([contenidos[i] for i in lote], [columnas_enteras[i] for i in lote])
+        if filas is not None:
+            filas_rapidas.update(zip(lote, filas))
+    
+    todas_las_filas = []
+    for i, archivo in enumerate(archivos):
+        if contenidos[i] is None:
+            continue
+        if i in filas_rapidas:
+            todas_las_filas.append(filas_rapidas[i])
+            continue
+        
+        fila = _read_single_file(os.path.join(ruta, archivo), archivo, mensajes)
+        if fila is not None:
+            todas_las_filas.append(fila)
+    
+    return todas_las_filas
+
+
+def _integer_columns(datos):
+    """
+    Comprueba que un CSV tenga 33 líneas de 3 números simples y qué columnas son enteras
+    
+    Args:
+        datos: Contenido del archivo en bytes
+        
+    Returns:
+        Arreglo booleano (3,) con True en las columnas donde pandas inferiría int64, o None
+        si el archivo debe leerse por separado
+    """
+    lineas = datos.split(b'\n')
+    if lineas[-1] == b'':
+        lineas.pop()
+    if len(lineas) != 33:
+        return None
+    
+    enteras = np.ones(3, dtype=bool)
+    for linea in lineas:
+        campos = linea.rstrip(b'\r').split(b',')
+        if len(campos) != 3:
+            return None
+        for columna, campo in enumerate(campos):
+            if INTEGER_TOKEN.fullmatch(campo):
+                continue
+            if not DECIMAL_TOKEN.fullmatch(campo):
+                return None
+            enteras[columna] = False
+    return enteras
+
+
+def _parse_block(contenidos, columnas_enteras):
+    """
+    Lee en una sola llamada a pandas varios CSV ya validados con _integer_columns
+    
+    En el bloque una columna es float64 si algún archivo tiene decimales en ella; cada fila
+    recupera lo que daría leer su archivo por separado: int64 si todo el archivo es entero y,
+    si no, sus columnas enteras convertidas a float (un "-0" entero es 0.0, no -0.0).
+    
+    Args:
+        contenidos: Contenido en bytes de cada archivo
+        columnas_enteras: Columnas enteras de cada archivo (resultado de _integer_columns)
+        
+    Returns:
+        Lista de arreglos de 99 valores, o None si el bloque no se pudo leer (se leen uno a uno)
+    """
+    buffer = b''.join(datos if datos.endswith(b'\n') else datos + b'\n' for datos in contenidos)
+    try:
+        df = pd.read_csv(io.BytesIO(buffer), header=None)
+    except Exception:
+        return None
+    if df.shape != (33 * len(contenidos), 3) or any(dtype.kind not in 'if' for dtype in df.dtypes):
+        return None
+    
+    bloque = df.to_numpy(dtype=np.float64) if any(dtype.kind == 'f' for dtype in df.dtypes) else df.to_numpy()
+    bloque = bloque.reshape(len(contenidos), 33, 3)
+    
+    filas = []
+    for valores, enteras in zip(bloque, columnas_enteras):
+        if enteras.all():
+            # Enteros de hasta 15 cifras: exactos también si el bloque los leyó como float
+            filas.append(valores.astype(np.int64).ravel())
+        else:
+            valores = valores.copy()
+            valores[:, enteras] += 0.0
+            filas.append(valores.ravel())
+    return filas
+
+
+def _read_single_file(archivo_ruta, archivo, mensajes):
+    """
+    Lee y aplana un único CSV 33x3 con pandas
+    
+    Args:
+        archivo_ruta: Ruta del CSV
+        archivo: Nombre del archivo, para los mensajes
+        mensajes: Lista donde se acumulan los avisos
+        
+    Returns:
+        Arreglo de 99 valores o None si el archivo no es válido
+    """
+    try:
+        # Leer el archivo CSV
+        df = pd.read_csv(archivo_ruta, header=None)
+        
+        # Verificar formato esperado (33 filas, 3 columnas)
+        if df.shape[1] == 3 and df.shape[0] == 33:
+            # Realizar reshape a una fila con 99 columnas
+            df_reshaped = df.values.flatten()
+            
+            if df_reshaped.size == 99:
+                return df_reshaped
+            mensajes.append(f"Tamaño incorrecto después del reshape: {archivo}")
+        else:
+            mensajes.append(f"Formato incorrecto ({df.shape[0]}x{df.shape[1]}): {archivo}")
+            
+    except Exception as e:
+        mensajes.append(f"Error procesando {archivo}: {e}")
+    
+    return None
@@ -6,7 +6,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 import numpy as np
-from ..utils.joint_utils import JOINT_NAMES, POSE_CONNECTIONS
+from ..utils.joint_utils import JOINT_NAMES, POSE_CONNECTIONS, create_column_names
+from ..utils.skeleton_sequence import SkeletonSequence
 
 class SkeletonVisualizer:
     def __init__(self):
@@ -100,20 +101,19 @@ class SkeletonVisualizer:
                 return
             
             # Separar coordenadas de joints y espina
-            if with_spine:
-                joint_coords = df.iloc[:, :-3]  # Todas excepto las últimas 3
-                espina_coords = df.iloc[:, -3:]  # Últimas 3 columnas
+            if set(create_column_names()) <= set(df.columns):
+                sequence = SkeletonSequence.from_dataframe(df)
             else:
-                joint_coords = df.iloc[:, :99]  # Primeras 99 columnas
-                espina_coords = None
+                # CSV sin los nombres de columna estándar: joints primero y espina en las últimas 3
+                sequence = SkeletonSequence.from_frame_vectors(df.iloc[:, :99].to_numpy())
+                if with_spine:
+                    sequence = sequence.with_spine(df.iloc[:, -3:].to_numpy())
+            joint_coords = sequence.joints
+            espina_coords = sequence.spine() if with_spine else None
             
             # Calcular límites para toda la animación
-            x_min = joint_coords.iloc[:, 0::3].min().min()
-            x_max = joint_coords.iloc[:, 0::3].max().max()
-            y_min = joint_coords.iloc[:, 1::3].min().min()
-            y_max = joint_coords.iloc[:, 1::3].max().max()
-            z_min = joint_coords.iloc[:, 2::3].min().min()
-            z_max = joint_coords.iloc[:, 2::3].max().max()
+            x_min, y_min, z_min = joint_coords.reshape(-1, 3).min(axis=0)
+            x_max, y_max, z_max = joint_coords.reshape(-1, 3).max(axis=0)
             
             # Crear figura
             fig = plt.figure(figsize=(12, 9))
@@ -132,20 +132,12 @@ class SkeletonVisualizer:
                 ax.view_init(elev=90, azim=90)
                 ax.set_xlim(ax.get_xlim()[::-1])  # Invertir eje X
                 
-                # Extraer coordenadas de joints para este frame
-                joints = []
-                for i in range(0, joint_coords.shape[1], 3):
-                    x = joint_coords.iloc[frame, i]
-                    y = joint_coords.iloc[frame, i+1] 
-                    z = joint_coords.iloc[frame, i+2]
-                    joints.append((x, y, z))
+                # Coordenadas de joints para este frame (vista del arreglo, sin recorrer columnas)
+                joints = joint_coords[frame]
                 
                 # Agregar espina si está disponible
                 if with_spine and espina_coords is not None:
-                    espina = espina_coords.iloc[frame].values
-                    joints.append((espina[0], espina[1], espina[2]))
-                
-                joints = np.array(joints)
+                    joints = np.vstack([joints, espina_coords[frame]])
                 
                 # Graficar puntos
                 ax.scatter(joints[:, 0], joints[:, 1], joints[:, 2], 
@@ -0,0 +1,8 @@
+"""
+Pipeline en memoria para reconocimiento de actividades
+"""
+
+from .activity_pipeline import ActivityRecognitionPipeline
+from .streaming_recognizer import SlidingWindowRecognizer
+
+__all__ = ['ActivityRecognitionPipeline', 'SlidingWindowRecognizer']
@@ -0,0 +1,158 @@
+"""
+Pipeline en memoria: frames capturados → preprocesamiento → características → clasificación
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from ..preprocessing import DataPreprocessor
+from ..features import FeatureExtractor
+from ..utils.joint_utils import create_column_names
+
+class ActivityRecognitionPipeline:
+    def __init__(self, preprocessor=None, feature_extractor=None, classifier=None):
+        """
+        Inicializa el pipeline de reconocimiento en memoria
+        
+        Args:
+            preprocessor: Instancia de DataPreprocessor (se crea una si es None)
+            feature_extractor: Instancia de FeatureExtractor (se crea una si es None)
+            classifier: Instancia de ActivityClassifier usada para predecir
+        """
+        self.preprocessor = preprocessor or DataPreprocessor()
+        self.feature_extractor = feature_extractor or FeatureExtractor()
+        self.classifier = classifier
+    
+    def preprocess(self, frames, timestamps=None, valid=None):
+        """
+        Limpia, submuestrea, imputa y calcula la espina de los frames crudos
+        
+        Args:
+            frames: Arreglo (frames × 99), lista de frames, CaptureBuffer o SkeletonSequence
+            timestamps: Segundos de captura de cada frame (None = frames equiespaciados)
+            valid: Máscara de joints válidos (None = los ceros son joints faltantes)
+            
+        Returns:
+            DataFrame procesado
+        """
+        return self.preprocess_sequence(frames, timestamps, valid).to_dataframe()
+    
+    def preprocess_sequence(self, frames, timestamps=None, valid=None):
+        """
+        Igual que preprocess pero devuelve una SkeletonSequence (sin DataFrames intermedios)
+        
+        Args:
+            frames: Arreglo (frames × 99), lista de frames, CaptureBuffer o SkeletonSequence
+            timestamps: Segundos de captura de cada frame (None = los de la entrada o equiespaciados)
+            valid: Máscara de joints válidos (None = la de la entrada o, sin ella, los ceros son faltantes)
+            
+        Returns:
+            SkeletonSequence procesada
+        """
+        if hasattr(frames, 'to_sequence'):
+            # CaptureBuffer: coordenadas, máscara y reloj de la cámara sin copias intermedias
+            frames = frames.to_sequence()
+        return self.preprocessor.process_sequence(frames, timestamps, valid)
+    
+    def extract_features(self, frames, timestamps=None, valid=None):
+        """
+        Obtiene las 64 características a partir de frames crudos, sin pasar por disco
+        
+        Args:
+            frames: Arreglo (frames × 99), lista de frames, CaptureBuffer o SkeletonSequence
+            timestamps: Segundos de captura de cada frame (None = frames equiespaciados)
+            valid: Máscara de joints válidos (None = los ceros son joints faltantes)
+            
+        Returns:
+            Lista con las 64 características
+        """
+        processed = self.preprocess_sequence(frames, timestamps, valid)
+        return self.feature_extractor.extract_features_from_sequence(processed)
+    
+    def run(self, frames, persist_path=None, activity_name="unknown_activity", timestamps=None, valid=None):
+        """
+        Ejecuta el pipeline completo y predice la actividad
+        
+        Args:
+            frames: Arreglo (frames × 99), lista de frames, CaptureBuffer o SkeletonSequence
+            persist_path: Carpeta donde guardar los CSV crudo y procesado (None = no guardar)
+            activity_name: Nombre usado para los archivos guardados
+            timestamps: Segundos de captura de cada frame (None = frames equiespaciados)
+            valid: Máscara de joints válidos (None = los ceros son joints faltantes)
+            
+        Returns:
+            Tupla con (actividad_predicha, probabilidades)
+        """
+        if self.classifier is None:
+            raise ValueError("El pipeline no tiene un clasificador asignado.")
+        
+        processed = self.preprocess_sequence(frames, timestamps, valid)
+        
+        if persist_path:
+            self.persist(frames, processed.to_dataframe(), persist_path, activity_name, timestamps)
+        
+        features = self.feature_extractor.extract_features_from_sequence(processed)
+        return self.classifier.predict_activity(features)
+    
+    def run_batch(self, clips, n_jobs=1, timestamps=None):
+        """
+        Preprocesa, extrae características y clasifica muchos clips crudos a la vez
+        
+        Args:
+            clips: Lista de arreglos (frames × 99), CaptureBuffer o SkeletonSequence con coordenadas crudas
+            n_jobs: Procesos en paralelo para preprocesar y extraer características
+            timestamps: Lista con los segundos de captura de cada clip (None = frames equiespaciados)
+            
+        Returns:
+            Tupla con (actividades_predichas, probabilidades) como en ActivityClassifier.predict_batch
+        """
+        if self.classifier is None:
+            raise ValueError("El pipeline no tiene un clasificador asignado.")
+        
+        if timestamps is None:
+            timestamps = [None] * len(clips)
+        
+        if n_jobs == 1:
+            processed = [self.preprocess_sequence(clip, times) for clip, times in zip(clips, timestamps)]
+        else:
+            processed = Parallel(n_jobs=n_jobs)(
+                delayed(self.preprocess_sequence)(clip, times) for clip, times in zip(clips, timestamps)
+            )
+        
+        features_matrix = self.feature_extractor.extract_features_batch(processed, n_jobs=1)
+        return self.classifier.predict_batch(features_matrix)
+    
+    def persist(self, frames, processed_df, output_path, activity_name, timestamps=None):
+        """
+        Guarda los frames crudos y procesados con el mismo formato que el flujo basado en archivos
+        
+        Args:
+            frames: Frames crudos (frames × 99), CaptureBuffer o SkeletonSequence
+            processed_df: DataFrame procesado
+            output_path: Carpeta de destino
+            activity_name: Nombre de la actividad
+            timestamps: Segundos de captura de cada frame (se guardan en la columna 'timestamp')
+            
+        Returns:
+            Tupla con (ruta_csv_crudo, ruta_csv_procesado)
+        """
+        os.makedirs(output_path, exist_ok=True)
+        
+        raw_file = os.path.join(output_path, f"{activity_name}_raw.csv")
+        processed_file = os.path.join(output_path, f"{activity_name}_processed.csv")
+        
+        if hasattr(frames, 'frame_vectors'):
+            timestamps = frames.timestamps if timestamps is None else timestamps
+            frames = frames.frame_vectors()
+        
+        raw_values = np.asarray(frames, dtype=np.float64)
+        raw_values = raw_values.reshape(len(raw_values), -1)
+        raw_df = pd.DataFrame(raw_values, columns=create_column_names())
+        if timestamps is not None:
+            raw_df['timestamp'] = timestamps
+        raw_df.to_csv(raw_file, index=False)
+        processed_df.to_csv(processed_file, index=False)
+        
+        print(f"Datos guardados en: {raw_file} y {processed_file}")
+        return raw_file, processed_file
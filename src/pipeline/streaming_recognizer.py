@@ -0,0 +1,213 @@
+"""
+Reconocimiento continuo de actividades con ventana deslizante sobre el flujo en vivo
+"""
+
+import threading
+import time
+import numpy as np
+from ..utils.trace_recorder import TRACER
+
+class SlidingWindowRecognizer:
+    def __init__(self,
+                 pipeline,
+                 window_seconds=10,
+                 hop_seconds=0.5,
+                 frame_rate=30,
+                 min_frames=None,
+                 smoothing=0.5,
+                 on_prediction=None):
+        """
+        Inicializa el reconocedor por ventana deslizante
+        
+        Args:
+            pipeline: ActivityRecognitionPipeline con clasificador entrenado
+            window_seconds: Duración de la ventana analizada (igual a la captura de entrenamiento)
+            hop_seconds: Cada cuántos segundos de video se publica una nueva predicción
+            frame_rate: FPS del flujo de entrada
+            min_frames: Frames mínimos en el buffer antes de predecir (por defecto la ventana completa)
+            smoothing: Peso de la predicción nueva en el promedio móvil de probabilidades (1 = sin suavizado)
+            on_prediction: Callback llamado con (actividad, confianza, probabilidades)
+        """
+        self.pipeline = pipeline
+        self.frame_rate = frame_rate
+        self.window_frames = int(round(window_seconds * frame_rate))
+        self.hop_frames = max(1, int(round(hop_seconds * frame_rate)))
+        self.min_frames = min(min_frames or self.window_frames, self.window_frames)
+        self.smoothing = smoothing
+        self.on_prediction = on_prediction
+        
+        # Buffer circular preasignado (frames × 99)
+        self._buffer = np.zeros((self.window_frames, 99), dtype=np.float64)
+        self._timestamps = np.full(self.window_frames, np.nan)
+        self._valid = np.zeros((self.window_frames, 33), dtype=bool)
+        self._write_index = 0
+        self._count = 0
+        self._frames_since_prediction = 0
+        self._lock = threading.Lock()
+        
+        # Hilo de trabajo: procesa la ventana más reciente sin bloquear la captura
+        self._pending = threading.Event()
+        self._running = False
+        self._worker = None
+        self._feeder = None
+        self._subscriber = None
+        
+        self.smoothed_probabilities = None
+        self.latest_prediction = None
+        self.last_latency = None
+    
+    def start(self, subscriber=None):
+        """
+        Inicia el hilo que procesa las ventanas
+        
+        Args:
+            subscriber: FrameSubscriber opcional; si se indica, los frames se leen
+                        directamente del productor compartido en lugar de push_frame
+        """
+        if self._running:
+            return
+        self._running = True
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
+        
+        self._subscriber = subscriber
+        if subscriber is not None:
+            self._feeder = threading.Thread(target=self._feeder_loop, daemon=True)
+            self._feeder.start()
+    
+    def stop(self):
+        """Detiene el hilo de procesamiento"""
+        self._running = False
+        self._pending.set()
+        if self._subscriber is not None:
+            self._subscriber.close()
+            self._subscriber = None
+        for thread in (self._worker, self._feeder):
+            if thread is not None:
+                thread.join(timeout=1.0)
+        self._worker = None
+        self._feeder = None
+    
+    def reset(self):
+        """Vacía el buffer y olvida las predicciones anteriores"""
+        with self._lock:
+            self._write_index = 0
+            self._count = 0
+            self._timestamps[:] = np.nan
+            self._valid[:] = False
+            self._frames_since_prediction = 0
+            self.smoothed_probabilities = None
+            self.latest_prediction = None
+    
+    def push_frame(self, frame_data, timestamp=None, valid=None):
+        """
+        Agrega un frame al buffer circular
+        
+        Args:
+            frame_data: 99 valores (x, y, z de 33 joints)
+            timestamp: Segundos de captura según el reloj de la cámara (None = desconocido)
+            valid: Máscara (33,) de joints válidos (None = los ceros son joints faltantes)
+        """
+        with self._lock:
+            self._buffer[self._write_index] = np.reshape(frame_data, -1)
+            self._timestamps[self._write_index] = np.nan if timestamp is None else timestamp
+            if valid is None:
+                self._valid[self._write_index] = self._buffer[self._write_index].reshape(33, 3).any(axis=1)
+            else:
+                self._valid[self._write_index] = valid
+            self._write_index = (self._write_index + 1) % self.window_frames
+            self._count = min(self._count + 1, self.window_frames)
+            self._frames_since_prediction += 1
+            
+            if self._count >= self.min_frames and self._frames_since_prediction >= self.hop_frames:
+                self._frames_since_prediction = 0
+                self._pending.set()
+    
+    def get_window(self, with_metadata=False):
+        """
+        Devuelve una copia ordenada cronológicamente de los frames en el buffer
+        
+        Args:
+            with_metadata: Devolver también los segundos de captura y la máscara de validez
+        
+        Returns:
+            Arreglo (frames × 99); con with_metadata, tupla (frames, timestamps o None
+            si algún frame de la ventana no tiene marca de tiempo, máscara frames × 33)
+        """
+        with self._lock:
+            if self._count < self.window_frames:
+                window = self._buffer[:self._count].copy()
+                times = self._timestamps[:self._count].copy()
+                valid = self._valid[:self._count].copy()
+            else:
+                window = np.roll(self._buffer, -self._write_index, axis=0)
+                times = np.roll(self._timestamps, -self._write_index)
+                valid = np.roll(self._valid, -self._write_index, axis=0)
+        
+        if not with_metadata:
+            return window
+        if np.isnan(times).any():
+            times = None
+        return window, times, valid
+    
+    @TRACER.traced("recognizer.predict", "recognition")
+    def predict_now(self):
+        """
+        Procesa la ventana actual y publica la predicción
+        
+        Returns:
+            Tupla con (actividad, confianza, probabilidades) o None si no hay suficientes frames
+        """
+        window, timestamps, valid = self.get_window(with_metadata=True)
+        if len(window) < self.min_frames:
+            return None
+        
+        start = time.perf_counter()
+        _, probabilities = self.pipeline.run(window, timestamps=timestamps, valid=valid)
+        self.last_latency = time.perf_counter() - start
+        
+        # Promedio móvil exponencial de las probabilidades
+        if self.smoothed_probabilities is None or self.smoothing >= 1:
+            self.smoothed_probabilities = dict(probabilities)
+        else:
+            alpha = self.smoothing
+            self.smoothed_probabilities = {
+                activity: alpha * prob + (1 - alpha) * self.smoothed_probabilities.get(activity, 0.0)
+                for activity, prob in probabilities.items()
+            }
+        
+        activity = max(self.smoothed_probabilities, key=self.smoothed_probabilities.get)
+        confidence = self.smoothed_probabilities[activity]
+        self.latest_prediction = (activity, confidence, self.smoothed_probabilities)
+        
+        if self.on_prediction:
+            self.on_prediction(activity, confidence, self.smoothed_probabilities)
+        
+        return self.latest_prediction
+    
+    def _feeder_loop(self):
+        """
+        Lee los frames del productor compartido y los agrega al buffer
+        
+        Los frames cuya pose reutilizó la compuerta de movimiento entran como muestras repetidas
+        con su propia marca de tiempo: la compuerta solo los omite con la escena quieta, así que
+        la ventana sigue cubriendo el mismo tiempo que la captura con velocidad casi nula.
+        """
+        subscriber = self._subscriber
+        while self._running and not subscriber.closed:
+            packet = subscriber.get(timeout=0.5)
+            if packet is None or packet.joint_coords is None:
+                continue
+            self.push_frame(packet.joint_coords, packet.device_timestamp, packet.joint_valid)
+    
+    def _worker_loop(self):
+        """Espera a que haya una ventana nueva y la procesa (las intermedias se descartan)"""
+        while self._running:
+            self._pending.wait()
+            self._pending.clear()
+            if not self._running:
+                break
+            try:
+                self.predict_now()
+            except Exception as e:
+                print(f"Error en reconocimiento continuo: {e}")
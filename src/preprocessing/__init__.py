@@ -3,5 +3,7 @@ Módulo de preprocesamiento de datos de esqueleto
 """
 
 from .data_cleaner import DataPreprocessor
+from .temporal_imputer import TemporalImputer, StreamingImputer
+from .resampler import resample_uniform
 
-__all__ = ['DataPreprocessor']
+__all__ = ['DataPreprocessor', 'TemporalImputer', 'StreamingImputer', 'resample_uniform']
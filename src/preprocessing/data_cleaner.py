@@ -4,16 +4,57 @@ Módulo de preprocesamiento de datos de esqueleto
 
 import pandas as pd
 import numpy as np
-from sklearn.impute import KNNImputer
 import os
+from ..utils.joint_utils import create_column_names, get_spine_joint_ids
+from ..utils.skeleton_sequence import SkeletonSequence
+from ..utils.stage_timer import STAGE_TIMER
+from .temporal_imputer import TemporalImputer
+from .resampler import resample_uniform
+
+IMPUTATION_METHODS = ("temporal", "knn")
 
 class DataPreprocessor:
-    def __init__(self):
-        """Inicializa el preprocesador de datos"""
+    def __init__(self, imputation="temporal", interpolation="linear", max_gap=None,
+                 anomaly_threshold_xy=84, anomaly_threshold_z=0.5):
+        """
+        Inicializa el preprocesador de datos
+        
+        Args:
+            imputation: "temporal" (interpolación por joint a lo largo de los frames) o "knn"
+                        (KNNImputer por clip, el de los modelos originales). Los modelos entrenados
+                        con otra imputación o versión de las características se señalan al cargarlos
+                        (check_compatibility) y hay que reentrenarlos
+            interpolation: "linear" o "cubic" para la imputación temporal
+            max_gap: Huecos más largos que esto (en frames submuestreados) no se interpolan (None = sin límite)
+            anomaly_threshold_xy: Salto máximo entre frames en x/y (píxeles)
+            anomaly_threshold_z: Salto máximo entre frames en z (metros)
+        """
+        if imputation not in IMPUTATION_METHODS:
+            raise ValueError(f"Método de imputación desconocido: {imputation}. Opciones: {IMPUTATION_METHODS}")
+        
         self.expected_frames = 100  # Número objetivo de frames
         self.expected_joints = 33   # Número de joints
         self.coords_per_joint = 3   # x, y, z por joint
+        self.frame_rate = 30        # FPS supuestos cuando los frames no traen timestamps
+        self.imputation = imputation
+        self.temporal_imputer = TemporalImputer(method=interpolation, max_gap=max_gap)
+        self.anomaly_threshold_xy = anomaly_threshold_xy
+        self.anomaly_threshold_z = anomaly_threshold_z
+        self.last_cleaning_report = None
         
+    def feature_config(self):
+        """
+        Parámetros del preprocesamiento que cambian las características (se guardan con el modelo)
+        
+        Returns:
+            Diccionario serializable en JSON
+        """
+        config = {'imputation': self.imputation}
+        if self.imputation == "temporal":
+            config['interpolation'] = self.temporal_imputer.method
+            config['max_gap'] = self.temporal_imputer.max_gap
+        return config
+    
     def process_raw_data(self, input_file):
         """
         Procesa un archivo CSV crudo aplicando todo el pipeline de limpieza
@@ -29,149 +70,298 @@ class DataPreprocessor:
         # Leer datos
         df = pd.read_csv(input_file)
         
-        # 1. Validar formato
+        # Aplicar el pipeline en memoria
+        df = self.process_frames(df)
+        
+        # Guardar datos procesados
+        output_file = input_file.replace('_raw.csv', '_processed.csv')
+        df.to_csv(output_file, index=False)
+        
+        print(f"Datos procesados guardados en: {output_file}")
+        return output_file
+    
+    def process_frames(self, data, timestamps=None, valid=None):
+        """
+        Procesa en memoria los frames capturados aplicando todo el pipeline de limpieza
+        
+        Args:
+            data: Arreglo (frames × 99 o frames × 33 × 3), lista de frames, DataFrame o
+                  SkeletonSequence con las coordenadas crudas
+            timestamps: Segundos de captura de cada frame (None = columna 'timestamp' del
+                        DataFrame o, si no existe, frames equiespaciados a frame_rate)
+            valid: Máscara de joints válidos (frames × 33 o frames × 99), como la de CaptureBuffer.
+                   None = los ceros y NaN se consideran joints faltantes (formato de los CSV)
+            
+        Returns:
+            DataFrame procesado con 100 frames, columnas de joints y espina y, si la entrada traía
+            timestamps, 'timestamp' (segundos desde el primer frame)
+        """
+        return self.process_sequence(data, timestamps, valid).to_dataframe()
+    
+    def process_sequence(self, data, timestamps=None, valid=None):
+        """
+        Igual que process_frames pero devuelve una SkeletonSequence, sin construir DataFrames
+        
+        Args:
+            data: SkeletonSequence cruda o cualquier entrada aceptada por process_frames
+            timestamps: Segundos de captura de cada frame (ver process_frames)
+            valid: Máscara de joints válidos (ver process_frames)
+            
+        Returns:
+            SkeletonSequence procesada con 100 frames, espina y timestamps desde el primer frame
+            (None si la entrada no traía timestamps)
+        """
+        if isinstance(data, SkeletonSequence):
+            n_frames = len(data)
+            values = data.joints.reshape(n_frames, -1).astype(np.float64)
+            valid = np.repeat(data.valid, self.coords_per_joint, axis=1)
+            timestamps = data.timestamps if timestamps is None else timestamps
+            return self._process_values(values, timestamps, valid)
+        
+        values, timestamps, valid = self._validate_input(data, timestamps, valid)
+        return self._process_values(values, timestamps, valid)
+    
+    def _validate_input(self, data, timestamps, valid):
+        """
+        Convierte la entrada en un arreglo numérico (frames × 99) y una máscara por coordenada
+        
+        Returns:
+            Tupla (valores, timestamps, máscara o None)
+        """
         expected_cols = self.expected_joints * self.coords_per_joint
-        if df.shape[1] != expected_cols:
-            raise ValueError(f"Archivo debe tener {expected_cols} columnas, tiene {df.shape[1]}")
         
-        # 2. Limpiar datos anómalos
-        df = self._clean_anomalies(df)
+        if isinstance(data, pd.DataFrame):
+            if 'timestamp' in data.columns:
+                if timestamps is None:
+                    timestamps = data['timestamp'].to_numpy(dtype=np.float64)
+                data = data.drop(columns='timestamp')
+            if data.shape[1] != expected_cols:
+                raise ValueError(f"Los datos deben tener {expected_cols} columnas, tienen {data.shape[1]}")
+            # Convertir a numérico de una vez; solo si hay texto se convierte columna a columna
+            try:
+                values = data.to_numpy(dtype=np.float64)
+            except (TypeError, ValueError):
+                values = data.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+        else:
+            values = np.asarray(data, dtype=np.float64)
+            if values.ndim == 3:
+                values = values.reshape(len(values), -1)
+            if values.ndim != 2 or values.shape[1] != expected_cols:
+                raise ValueError(f"Los datos deben tener {expected_cols} columnas, tienen forma {values.shape}")
+        
+        if valid is not None:
+            valid = np.asarray(valid, dtype=bool).reshape(len(values), self.expected_joints, -1)
+            valid = np.broadcast_to(valid, (len(values), self.expected_joints, self.coords_per_joint))
+            valid = valid.reshape(len(values), expected_cols)
+        
+        return values, timestamps, valid
+    
+    def _process_values(self, values, timestamps, valid):
+        """
+        Limpieza, remuestreo, imputación y espina sobre el arreglo (frames × 99)
         
-        # 3. Submuestrear a 100 frames
-        df = self._subsample_data(df)
+        Returns:
+            SkeletonSequence procesada
+        """
+        # 1. Marcar datos anómalos (no se eliminan frames: se enmascaran las muestras)
+        with STAGE_TIMER.stage("preprocess.clean_anomalies"):
+            values, valid = self._clean_anomalies(values, valid)
         
-        # 4. Imputar valores faltantes
-        df = self._impute_missing_values(df)
+        # 2. Remuestrear a 100 frames en una malla de tiempo uniforme
+        with STAGE_TIMER.stage("preprocess.subsample"):
+            values, valid, times = self._subsample_data(values, valid, timestamps)
         
-        # 5. Calcular espina (centroide)
-        df = self._calculate_spine(df)
+        # 3. Imputar valores faltantes y enmascarados
+        with STAGE_TIMER.stage("preprocess.impute"):
+            values = self._impute_missing_values(values, valid)
         
-        # 6. Guardar datos procesados
-        output_file = input_file.replace('_raw.csv', '_processed.csv')
-        df.to_csv(output_file, index=False)
+        # 4. Calcular espina (centroide)
+        joints = values.reshape(len(values), self.expected_joints, self.coords_per_joint)
+        with STAGE_TIMER.stage("preprocess.spine"):
+            spine = self._calculate_spine(joints)
         
-        print(f"Datos procesados guardados en: {output_file}")
-        return output_file
+        # 5. Tiempo de cada muestra desde el inicio, para que las velocidades usen el dt real.
+        # Sin timestamps de la cámara no se inventan tiempos: las velocidades usan el intervalo
+        # nominal de 1/30 s entre frames remuestreados, igual que los modelos ya entrenados
+        if timestamps is not None:
+            times = times - times[0]
+        else:
+            times = None
+        return SkeletonSequence(joints, valid=~np.isnan(joints).any(axis=2), timestamps=times, spine=spine)
     
-    def _clean_anomalies(self, df, threshold=84):
+    def _clean_anomalies(self, values, valid=None):
         """
-        Detecta y limpia saltos bruscos entre frames consecutivos
+        Detecta saltos bruscos entre frames y enmascara las muestras de joint afectadas
+        
+        Cada coordenada se compara con el último valor detectado del mismo joint, con un umbral
+        por eje (píxeles para x/y, metros para z). Si algún eje de un joint salta, se marca el
+        joint completo en ese frame como inválido; el frame se conserva para no deformar la
+        base de tiempo y el imputador rellena la muestra después. Un pico aislado marca dos
+        muestras: la del pico y la de la vuelta al valor normal.
         
         Args:
-            df: DataFrame con los datos
-            threshold: Umbral para detectar saltos bruscos
+            values: Arreglo (frames × 99) con los datos
+            valid: Máscara de muestras válidas de la captura (None = ceros y NaN son faltantes)
             
         Returns:
-            DataFrame limpio
+            Tupla (valores, máscara booleana frames × 99 con True en las muestras válidas)
         """
         print("Limpiando anomalías...")
         
-        # Convertir a numérico y manejar errores
-        for col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+        n_frames = len(values)
+        coords = values.reshape(n_frames, -1, self.coords_per_joint)
+        # Joints no detectados (NaN, fuera de la máscara o, sin máscara, ceros): no cuentan como referencia
+        if valid is None:
+            present = ~(np.isnan(coords) | (coords == 0))
+        else:
+            present = ~np.isnan(coords) & valid.reshape(coords.shape)
+        
+        # Último valor presente anterior de cada coordenada
+        frames = np.arange(n_frames)[:, np.newaxis, np.newaxis]
+        last_seen = np.maximum.accumulate(np.where(present, frames, -1), axis=0)
+        prev_idx = np.empty_like(last_seen)
+        prev_idx[0] = -1
+        prev_idx[1:] = last_seen[:-1]
+        has_prev = prev_idx >= 0
+        prev_values = np.take_along_axis(coords, np.maximum(prev_idx, 0), axis=0)
         
-        # Detectar saltos bruscos
-        rows_to_remove = set()
-        for col in df.columns:
-            diffs = df[col].diff()
-            anomalous_rows = diffs[diffs.abs() > threshold].index
-            rows_to_remove.update(anomalous_rows.tolist())
+        jumps = np.where(present & has_prev, np.abs(coords - prev_values), 0.0)
+        thresholds = np.array([self.anomaly_threshold_xy, self.anomaly_threshold_xy, self.anomaly_threshold_z])
+        anomalous = (jumps > thresholds).any(axis=2)
         
-        if rows_to_remove:
-            print(f"Eliminando {len(rows_to_remove)} filas con anomalías")
-            df = df.drop(rows_to_remove).reset_index(drop=True)
+        valid = present & ~anomalous[:, :, np.newaxis]
+        valid = valid.reshape(n_frames, -1)
         
-        return df
+        masked = int(anomalous.sum())
+        total = anomalous.size
+        self.last_cleaning_report = {
+            'masked_joint_samples': masked,
+            'masked_fraction': masked / total if total else 0.0,
+            'frames_affected': int(anomalous.any(axis=1).sum()),
+            'missing_values': int((~present).sum()),
+        }
+        if masked:
+            print(f"Enmascarando {masked} muestras de joints con anomalías "
+                  f"({100.0 * masked / total:.2f}%, {self.last_cleaning_report['frames_affected']} frames)")
+        
+        return values, valid
     
-    def _subsample_data(self, df):
+    def _subsample_data(self, values, valid, timestamps=None):
         """
-        Reduce los datos a exactamente 100 frames mediante submuestreo
+        Remuestrea los datos a exactamente 100 frames equiespaciados en el tiempo
+        
+        Con timestamps, los frames perdidos durante la captura no deforman la secuencia:
+        cada muestra se interpola en su instante real. Los clips cortos se interpolan
+        sobre su duración en lugar de rellenarse repitiendo el último frame.
         
         Args:
-            df: DataFrame con los datos
+            values: Arreglo (frames × 99) con los datos
+            valid: Máscara de muestras válidas (frames × 99)
+            timestamps: Segundos de captura de cada frame (None = equiespaciados a frame_rate)
             
         Returns:
-            DataFrame con 100 frames
+            Tupla (valores 100 × 99, máscara correspondiente, segundos de cada muestra)
         """
-        current_frames = len(df)
-        print(f"Submuestreando de {current_frames} a {self.expected_frames} frames")
+        current_frames = len(values)
+        print(f"Remuestreando de {current_frames} a {self.expected_frames} frames")
         
-        if current_frames <= self.expected_frames:
-            # Si tenemos menos frames, duplicar algunos
-            while len(df) < self.expected_frames:
-                df = pd.concat([df, df.tail(1)], ignore_index=True)
-        else:
-            # Si tenemos más frames, seleccionar uniformemente
-            indices = np.linspace(0, current_frames - 1, self.expected_frames, dtype=int)
-            df = df.iloc[indices].reset_index(drop=True)
+        if timestamps is None:
+            timestamps = np.arange(current_frames) / self.frame_rate
         
-        return df
+        return resample_uniform(values, self.expected_frames, timestamps=timestamps, valid=valid)
     
-    def _impute_missing_values(self, df):
+    def _impute_missing_values(self, values, valid=None):
         """
-        Imputa valores faltantes usando K-Nearest Neighbors
+        Imputa valores faltantes (ceros o NaN) y enmascarados con el método configurado
         
         Args:
-            df: DataFrame con posibles valores faltantes
+            values: Arreglo (frames × 99) con posibles valores faltantes
+            valid: Máscara de muestras válidas (None = solo ceros y NaN son faltantes)
             
         Returns:
-            DataFrame con valores imputados
+            Arreglo con valores imputados
         """
         print("Imputando valores faltantes...")
         
-        # Verificar si hay valores nulos o ceros
-        if df.isnull().sum().sum() > 0 or (df == 0).sum().sum() > 0:
-            # Reemplazar ceros con NaN para imputación
-            df_temp = df.replace(0, np.nan)
+        if valid is None:
+            missing = (values == 0) | np.isnan(values)
+        else:
+            # Con máscara, un 0 es una coordenada real
+            missing = ~valid | np.isnan(values)
+        
+        if missing.any():
+            if self.imputation == "knn":
+                return self._impute_knn(values, missing)
+            return self._impute_temporal(values, missing)
+        
+        return values
+    
+    def _impute_temporal(self, values, missing):
+        """
+        Interpola cada coordenada entre los frames válidos vecinos (los bordes repiten el valor más cercano)
+        
+        Args:
+            values: Arreglo (frames × 99)
+            missing: Máscara de valores a imputar
             
-            # Aplicar KNN imputation
-            imputer = KNNImputer(n_neighbors=3)
-            df_imputed = pd.DataFrame(
-                imputer.fit_transform(df_temp),
-                columns=df.columns
-            )
+        Returns:
+            Arreglo con valores imputados
             
-            print("Valores faltantes imputados con KNN")
-            return df_imputed
+        Raises:
+            ValueError: Si alguna columna queda sin valores tras interpolar
+        """
+        imputed = self.temporal_imputer.impute(values, missing)
+        
+        # Un joint ausente en todo el clip (o con un hueco mayor que max_gap) no se puede
+        # interpolar: se rechaza el clip en lugar de producir características NaN
+        unfilled = np.isnan(imputed).any(axis=0)
+        if unfilled.any():
+            columns = [col for col, empty in zip(create_column_names(), unfilled) if empty]
+            raise ValueError(f"No se pueden imputar {len(columns)} columnas sin datos suficientes "
+                             f"en el clip: {columns[:6]}")
         
-        return df
+        print("Valores faltantes imputados con interpolación temporal")
+        return imputed
     
-    def _calculate_spine(self, df):
+    def _impute_knn(self, values, missing):
         """
-        Calcula la coordenada de la espina como centroide de hombros y caderas
+        Imputa valores faltantes usando K-Nearest Neighbors
         
         Args:
-            df: DataFrame con coordenadas de joints
+            values: Arreglo (frames × 99) con posibles valores faltantes
+            missing: Máscara de valores a imputar
             
         Returns:
-            DataFrame con columnas de espina agregadas
+            Arreglo con valores imputados
         """
-        print("Calculando coordenadas de espina...")
+        from sklearn.impute import KNNImputer
         
-        # Joints para calcular la espina (hombros y caderas)
-        spine_joints = {
-            'joint11': 'Hombro Izquierdo',
-            'joint12': 'Hombro Derecho', 
-            'joint23': 'Cadera Izquierda',
-            'joint24': 'Cadera Derecha'
-        }
+        # Marcar faltantes y enmascarados como NaN para imputación
+        values_temp = np.where(missing, np.nan, values)
         
-        # Verificar que existan las columnas necesarias
-        required_cols = []
-        for joint in spine_joints.keys():
-            for coord in ['_x', '_y', '_z']:
-                required_cols.append(joint + coord)
+        # Aplicar KNN imputation
+        imputer = KNNImputer(n_neighbors=3)
+        imputed = imputer.fit_transform(values_temp)
+        if imputed.shape != values.shape:
+            raise ValueError("KNNImputer descartó columnas sin ningún valor válido en el clip")
         
-        if not all(col in df.columns for col in required_cols):
-            raise ValueError("Faltan columnas necesarias para calcular la espina")
+        print("Valores faltantes imputados con KNN")
+        return imputed
+    
+    def _calculate_spine(self, joints):
+        """
+        Calcula la coordenada de la espina como centroide de hombros y caderas
+        
+        Args:
+            joints: Arreglo (frames × 33 × 3) con coordenadas de joints
+            
+        Returns:
+            Arreglo (frames × 3) con la espina
+        """
+        print("Calculando coordenadas de espina...")
         
-        # Calcular centroide
-        df['espina_x'] = (df['joint11_x'] + df['joint12_x'] + 
-                         df['joint23_x'] + df['joint24_x']) / 4
-        df['espina_y'] = (df['joint11_y'] + df['joint12_y'] + 
-                         df['joint23_y'] + df['joint24_y']) / 4
-        df['espina_z'] = (df['joint11_z'] + df['joint12_z'] + 
-                         df['joint23_z'] + df['joint24_z']) / 4
+        # Joints para calcular la espina (hombros y caderas)
+        spine = joints[:, get_spine_joint_ids(), :].mean(axis=1)
         
         print("Espina calculada exitosamente")
-        return df
+        return spine
@@ -0,0 +1,63 @@
+"""
+Remuestreo de secuencias de esqueleto a una malla de tiempo uniforme
+"""
+
+import numpy as np
+
+def resample_uniform(values, n_samples, timestamps=None, valid=None):
+    """
+    Remuestrea los frames a n_samples instantes equiespaciados entre el primer y el último frame
+    
+    Cada instante se interpola linealmente entre los dos frames capturados que lo rodean.
+    Si alguno de los dos no es válido en una coordenada, se toma el más cercano en el tiempo
+    (con su validez), así un joint perdido nunca se mezcla con uno detectado.
+    
+    Args:
+        values: Arreglo (frames × columnas)
+        n_samples: Número de muestras de salida
+        timestamps: Segundos de captura de cada frame (None = frames equiespaciados)
+        valid: Máscara booleana (frames × columnas) de valores válidos (None = todos)
+    
+    Returns:
+        Tupla (valores n_samples × columnas, máscara n_samples × columnas, instantes de la malla)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_frames = len(values)
+    if n_frames == 0:
+        raise ValueError("No hay frames para remuestrear")
+    if valid is None:
+        valid = np.ones(values.shape, dtype=bool)
+    
+    if timestamps is None:
+        times = np.arange(n_frames, dtype=np.float64)
+    else:
+        times = np.asarray(timestamps, dtype=np.float64)
+        if times.shape != (n_frames,):
+            raise ValueError(f"Se esperaban {n_frames} timestamps, se recibieron {times.shape}")
+        # Relojes que retroceden (reinicio de la cámara): se tratan como tiempo detenido
+        times = np.maximum.accumulate(times)
+    
+    grid = np.linspace(times[0], times[-1], n_samples)
+    if n_frames == 1:
+        return (np.repeat(values, n_samples, axis=0),
+                np.repeat(valid, n_samples, axis=0), grid)
+    
+    # Par de frames (left, left + 1) que rodea cada instante y peso del derecho
+    left = np.clip(np.searchsorted(times, grid, side='right') - 1, 0, n_frames - 2)
+    right = left + 1
+    span = times[right] - times[left]
+    weight = np.divide(grid - times[left], span, out=np.zeros_like(grid), where=span > 0)
+    weight = np.clip(weight, 0.0, 1.0)[:, np.newaxis]
+    
+    left_values, right_values = values[left], values[right]
+    left_valid, right_valid = valid[left], valid[right]
+    
+    both = left_valid & right_valid
+    nearest_right = weight >= 0.5
+    with np.errstate(invalid='ignore'):
+        blended = left_values + weight * (right_values - left_values)
+    nearest = np.where(nearest_right, right_values, left_values)
+    
+    resampled = np.where(both, blended, nearest)
+    resampled_valid = both | np.where(nearest_right, right_valid, left_valid)
+    return resampled, resampled_valid, grid
@@ -0,0 +1,154 @@
+"""
+Imputación temporal de joints faltantes: interpolación por columna a lo largo de los frames
+"""
+
+import numpy as np
+
+INTERPOLATION_METHODS = ("linear", "cubic")
+
+class TemporalImputer:
+    def __init__(self, method="linear", max_gap=None, edge="hold"):
+        """
+        Rellena huecos de cada coordenada interpolando entre los frames válidos vecinos
+        
+        Trabaja sobre el arreglo completo (frames × columnas) a la vez, en O(frames × columnas).
+        
+        Args:
+            method: "linear" o "cubic" (spline cúbico natural; con menos de 4 puntos válidos se usa lineal)
+            max_gap: Huecos más largos que esto (en frames) se dejan sin rellenar (None = sin límite)
+            edge: "hold" repite el primer/último valor válido en los bordes; "none" los deja sin rellenar
+        """
+        if method not in INTERPOLATION_METHODS:
+            raise ValueError(f"Método de interpolación desconocido: {method}. Opciones: {INTERPOLATION_METHODS}")
+        if edge not in ("hold", "none"):
+            raise ValueError(f"Tratamiento de bordes desconocido: {edge}. Opciones: ('hold', 'none')")
+        
+        self.method = method
+        self.max_gap = max_gap
+        self.edge = edge
+    
+    def impute(self, values, missing=None):
+        """
+        Interpola los valores faltantes de cada columna
+        
+        Args:
+            values: Arreglo (frames × columnas)
+            missing: Máscara booleana de valores faltantes (None = los NaN de values)
+        
+        Returns:
+            Arreglo float con los huecos rellenados (quedan NaN en columnas sin datos,
+            en huecos mayores que max_gap y en bordes con edge="none")
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if missing is None:
+            missing = np.isnan(values)
+        else:
+            missing = np.asarray(missing, dtype=bool) | np.isnan(values)
+        
+        if not missing.any():
+            return values.copy()
+        
+        n_frames, n_cols = values.shape
+        frames = np.arange(n_frames)[:, np.newaxis]
+        cols = np.arange(n_cols)
+        
+        # Índice del último frame válido anterior y del primero válido posterior, por columna
+        prev_idx = np.maximum.accumulate(np.where(missing, -1, frames), axis=0)
+        next_idx = np.minimum.accumulate(np.where(missing, n_frames, frames)[::-1], axis=0)[::-1]
+        has_prev = prev_idx >= 0
+        has_next = next_idx < n_frames
+        
+        prev_values = values[np.clip(prev_idx, 0, n_frames - 1), cols]
+        next_values = values[np.clip(next_idx, 0, n_frames - 1), cols]
+        
+        interior = missing & has_prev & has_next
+        leading = missing & ~has_prev & has_next
+        trailing = missing & has_prev & ~has_next
+        
+        filled = values.copy()
+        filled[missing] = np.nan
+        
+        # Interpolación lineal entre los vecinos válidos
+        span = np.maximum(next_idx - prev_idx, 1)
+        weight = (frames - prev_idx) / span
+        linear = prev_values + weight * (next_values - prev_values)
+        filled[interior] = linear[interior]
+        
+        if self.method == "cubic":
+            self._apply_cubic(values, missing, interior, filled)
+        
+        if self.edge == "hold":
+            filled[leading] = next_values[leading]
+            filled[trailing] = prev_values[trailing]
+        
+        # Huecos demasiado largos: sin datos suficientes para interpolar con confianza
+        if self.max_gap is not None:
+            gap_length = np.where(has_next, next_idx, n_frames) - np.where(has_prev, prev_idx, -1) - 1
+            filled[missing & (gap_length > self.max_gap)] = np.nan
+        
+        return filled
+    
+    def _apply_cubic(self, values, missing, interior, filled):
+        """
+        Sustituye la interpolación lineal de los huecos interiores por un spline cúbico natural
+        
+        Las columnas con el mismo patrón de huecos (x, y, z de un mismo joint) comparten un solo spline.
+        """
+        from scipy.interpolate import CubicSpline
+        
+        frames = np.arange(values.shape[0])
+        columns = np.flatnonzero(interior.any(axis=0))
+        groups = {}
+        for col in columns:
+            groups.setdefault(missing[:, col].tobytes(), []).append(col)
+        
+        for group in groups.values():
+            valid = ~missing[:, group[0]]
+            if valid.sum() < 4:
+                continue
+            targets = interior[:, group[0]]
+            spline = CubicSpline(frames[valid], values[valid][:, group], axis=0, bc_type='natural')
+            filled[np.ix_(targets, group)] = spline(frames[targets])
+
+class StreamingImputer:
+    def __init__(self, n_values=99, max_gap=None):
+        """
+        Versión causal frame a frame para flujos en vivo: mantiene el último valor válido de
+        cada coordenada (no puede interpolar porque aún no conoce los frames futuros)
+        
+        Args:
+            n_values: Valores por frame (99 = 33 joints × 3)
+            max_gap: Frames seguidos que se mantiene un valor antes de darlo por perdido (None = sin límite)
+        """
+        self.n_values = n_values
+        self.max_gap = max_gap
+        self._last = np.full(n_values, np.nan)
+        self._age = np.zeros(n_values, dtype=np.int64)
+    
+    def push(self, frame, missing=None):
+        """
+        Rellena un frame con los últimos valores válidos
+        
+        Args:
+            frame: Arreglo de n_values valores
+            missing: Máscara booleana de valores faltantes (None = ceros y NaN, como en la captura)
+        
+        Returns:
+            Arreglo float con los valores faltantes rellenados (NaN si no hay valor reciente)
+        """
+        frame = np.asarray(frame, dtype=np.float64)
+        if missing is None:
+            missing = (frame == 0) | np.isnan(frame)
+        
+        self._age = np.where(missing, self._age + 1, 0)
+        self._last = np.where(missing, self._last, frame)
+        
+        filled = np.where(missing, self._last, frame)
+        if self.max_gap is not None:
+            filled[self._age > self.max_gap] = np.nan
+        return filled
+    
+    def reset(self):
+        """Olvida los últimos valores válidos"""
+        self._last[:] = np.nan
+        self._age[:] = 0
@@ -12,6 +12,11 @@ from .joint_utils import (
     get_target_joint_ids,
     create_column_names
 )
+from .rate_meter import RateMeter, FramePacer
+from .stage_timer import StageTimer, STAGE_TIMER, stage, timed
+from .trace_recorder import TraceRecorder, TRACER
+from .skeleton_sequence import SkeletonSequence
+from .startup_profiler import StartupProfiler, STARTUP_PROFILER
 
 __all__ = [
     'JOINT_NAMES', 
@@ -21,5 +26,16 @@ __all__ = [
     'get_joint_name',
     'get_spine_joint_ids',
     'get_target_joint_ids',
-    'create_column_names'
+    'create_column_names',
+    'RateMeter',
+    'FramePacer',
+    'StageTimer',
+    'STAGE_TIMER',
+    'stage',
+    'timed',
+    'TraceRecorder',
+    'TRACER',
+    'SkeletonSequence',
+    'StartupProfiler',
+    'STARTUP_PROFILER'
 ]
@@ -0,0 +1,81 @@
+"""
+Medición de FPS y control del ritmo de visualización
+"""
+
+import threading
+import time
+from collections import deque
+
+class RateMeter:
+    def __init__(self, window_seconds=2.0):
+        """
+        Mide la tasa de eventos (FPS) sobre una ventana de tiempo deslizante
+        
+        Args:
+            window_seconds: Duración de la ventana usada para promediar
+        """
+        self.window_seconds = window_seconds
+        self.count = 0
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+    
+    def tick(self, timestamp=None):
+        """Registra un evento"""
+        now = time.monotonic() if timestamp is None else timestamp
+        with self._lock:
+            self.count += 1
+            self._timestamps.append(now)
+            self._trim(now)
+    
+    def rate(self):
+        """
+        Devuelve los eventos por segundo en la ventana actual
+        
+        Returns:
+            FPS medidos (0.0 si no hay suficientes eventos)
+        """
+        with self._lock:
+            self._trim(time.monotonic())
+            if len(self._timestamps) < 2:
+                return 0.0
+            elapsed = self._timestamps[-1] - self._timestamps[0]
+            return (len(self._timestamps) - 1) / elapsed if elapsed > 0 else 0.0
+    
+    def reset(self):
+        """Olvida los eventos registrados"""
+        with self._lock:
+            self.count = 0
+            self._timestamps.clear()
+    
+    def _trim(self, now):
+        limit = now - self.window_seconds
+        while self._timestamps and self._timestamps[0] < limit:
+            self._timestamps.popleft()
+
+class FramePacer:
+    def __init__(self, target_fps=30):
+        """
+        Limita un bucle a una tasa objetivo sin sumar un retardo fijo al tiempo de procesamiento
+        
+        Args:
+            target_fps: Iteraciones por segundo deseadas (None o 0 = sin límite)
+        """
+        self.target_fps = target_fps
+        self._next_deadline = None
+    
+    def wait(self):
+        """Duerme solo lo que falta para el siguiente instante objetivo"""
+        if not self.target_fps:
+            return
+        
+        interval = 1.0 / self.target_fps
+        now = time.monotonic()
+        if self._next_deadline is None or now - self._next_deadline > interval:
+            # Primera iteración o el bucle se retrasó: no intentar recuperar frames perdidos
+            self._next_deadline = now + interval
+            return
+        
+        remaining = self._next_deadline - now
+        if remaining > 0:
+            time.sleep(remaining)
+        self._next_deadline += interval
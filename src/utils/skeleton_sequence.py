@@ -0,0 +1,185 @@
+"""
+Contenedor compacto de secuencias de esqueleto compartido por captura, preprocesamiento,
+características y herramientas legacy
+"""
+
+import numbers
+import numpy as np
+from .joint_utils import JOINT_NAMES, get_spine_joint_ids, create_column_names
+
+SPINE_COLUMNS = ['espina_x', 'espina_y', 'espina_z']
+
+class SkeletonSequence:
+    __slots__ = ('joints', 'valid', 'timestamps', 'joint_ids', '_spine', '_positions')
+    
+    def __init__(self, joints, valid=None, timestamps=None, joint_ids=None, spine=None, dtype=None):
+        """
+        Secuencia de frames como un único arreglo contiguo (frames × joints × 3)
+        
+        Args:
+            joints: Arreglo (frames × joints × 3) con x, y en píxeles y z en metros
+            valid: Máscara (frames × joints) de joints detectados (None = todos válidos)
+            timestamps: Segundos de cada frame (None = desconocidos)
+            joint_ids: IDs de MediaPipe de cada joint del arreglo (None = 0..joints-1)
+            spine: Arreglo (frames × 3) con la espina ya calculada (None = se calcula al pedirla)
+            dtype: Tipo de joints y espina (None = conserva float32 de la captura o float64 de los
+                   datos procesados; cualquier otro tipo de entrada pasa a float64)
+        """
+        joints = np.asarray(joints)
+        if dtype is None:
+            dtype = joints.dtype if joints.dtype in (np.float32, np.float64) else np.float64
+        self.joints = np.ascontiguousarray(joints, dtype=dtype)
+        if self.joints.ndim != 3 or self.joints.shape[2] != 3:
+            raise ValueError(f"Se esperaba un arreglo (frames × joints × 3), se recibió {self.joints.shape}")
+        
+        n_frames, n_joints = self.joints.shape[:2]
+        if valid is None:
+            valid = np.ones((n_frames, n_joints), dtype=bool)
+        self.valid = np.asarray(valid, dtype=bool).reshape(n_frames, n_joints)
+        self.timestamps = None if timestamps is None else np.asarray(timestamps, dtype=np.float64)
+        self.joint_ids = tuple(range(n_joints)) if joint_ids is None else tuple(int(i) for i in joint_ids)
+        self._positions = {joint_id: pos for pos, joint_id in enumerate(self.joint_ids)}
+        self._spine = None if spine is None else np.asarray(spine, dtype=self.joints.dtype)
+    
+    def __len__(self):
+        return self.joints.shape[0]
+    
+    def __repr__(self):
+        return (f"SkeletonSequence(frames={len(self)}, joints={self.n_joints}, "
+                f"validos={self.valid.mean():.1%}, timestamps={self.timestamps is not None})")
+    
+    @property
+    def n_joints(self):
+        return self.joints.shape[1]
+    
+    @property
+    def joint_names(self):
+        return [JOINT_NAMES.get(joint_id, f"Joint_{joint_id}") for joint_id in self.joint_ids]
+    
+    def __getitem__(self, frames):
+        """
+        Subsecuencia de frames (con un slice es una vista sin copia)
+        
+        Args:
+            frames: Entero (Python o NumPy), slice o índices de frames
+        """
+        if isinstance(frames, numbers.Integral):
+            frames = int(frames)
+            frames = slice(frames, frames + 1 if frames != -1 else None)
+        return SkeletonSequence(
+            self.joints[frames], self.valid[frames],
+            None if self.timestamps is None else self.timestamps[frames],
+            self.joint_ids,
+            None if self._spine is None else self._spine[frames]
+        )
+    
+    # Vistas ---------------------------------------------------------------
+    
+    def joint(self, joint_id):
+        """
+        Vista (frames × 3) sin copia de un joint
+        
+        Args:
+            joint_id: ID de MediaPipe del joint
+        """
+        return self.joints[:, self._positions[joint_id], :]
+    
+    def select(self, joint_ids):
+        """
+        Coordenadas (frames × n × 3) de un subconjunto de joints
+        
+        Es una vista sin copia cuando los joints están equiespaciados en el arreglo
+        (p. ej. 11-16); en otro caso NumPy necesita copiar.
+        
+        Args:
+            joint_ids: IDs de MediaPipe de los joints
+        """
+        positions = [self._positions[joint_id] for joint_id in joint_ids]
+        steps = np.diff(positions)
+        if len(positions) == 1 or (len(steps) and steps[0] > 0 and (steps == steps[0]).all()):
+            step = steps[0] if len(steps) else 1
+            return self.joints[:, positions[0]:positions[-1] + 1:step, :]
+        return self.joints[:, positions, :]
+    
+    def spine(self):
+        """
+        Espina (frames × 3): la precalculada o el centroide de hombros y caderas (se calcula una vez)
+        """
+        if self._spine is None:
+            self._spine = self.select(get_spine_joint_ids()).mean(axis=1)
+        return self._spine
+    
+    def with_spine(self, spine):
+        """Devuelve la misma secuencia (sin copiar joints) con la espina indicada"""
+        return SkeletonSequence(self.joints, self.valid, self.timestamps, self.joint_ids, spine)
+    
+    def frame_vectors(self, fill=0.0):
+        """
+        Frames con el formato de captura (frames × joints·3) en float64
+        
+        Args:
+            fill: Valor para los joints inválidos (0.0 = formato de los CSV; np.nan para imputar)
+        """
+        vectors = np.where(self.valid[:, :, np.newaxis], self.joints, fill)
+        return vectors.reshape(len(self), -1).astype(np.float64)
+    
+    # Conversión ------------------------------------------------------------
+    
+    @classmethod
+    def from_frame_vectors(cls, values, valid=None, timestamps=None):
+        """
+        Crea la secuencia a partir de frames con el formato de captura (frames × 99)
+        
+        Args:
+            values: Arreglo (frames × 99) o (frames × 33 × 3)
+            valid: Máscara (frames × 33) o (frames × 99) (None = los ceros y NaN son joints faltantes)
+            timestamps: Segundos de cada frame
+        """
+        values = np.asarray(values, dtype=np.float64)
+        joints = values.reshape(len(values), -1, 3)
+        if valid is None:
+            valid = ~(np.isnan(joints) | (joints == 0)).all(axis=2)
+        else:
+            valid = np.asarray(valid, dtype=bool).reshape(len(values), joints.shape[1], -1).all(axis=2)
+        return cls(joints, valid, timestamps)
+    
+    @classmethod
+    def from_dataframe(cls, df, zeros_are_missing=False):
+        """
+        Crea la secuencia a partir de un DataFrame con columnas joint{i}_x/y/z y, opcionalmente,
+        espina_x/y/z y timestamp
+        
+        Args:
+            df: DataFrame crudo o procesado
+            zeros_are_missing: Marcar como inválidos los joints en (0, 0, 0) (formato de los CSV crudos)
+        """
+        joint_columns = create_column_names()
+        joints = df[joint_columns].to_numpy(dtype=np.float64).reshape(len(df), 33, 3)
+        valid = None
+        if zeros_are_missing:
+            valid = ~(np.isnan(joints) | (joints == 0)).all(axis=2)
+        spine = df[SPINE_COLUMNS].to_numpy(dtype=np.float64) if set(SPINE_COLUMNS) <= set(df.columns) else None
+        timestamps = df['timestamp'].to_numpy(dtype=np.float64) if 'timestamp' in df.columns else None
+        return cls(joints, valid, timestamps, spine=spine)
+    
+    def to_dataframe(self, include_spine=True, include_timestamp=True):
+        """
+        DataFrame con el formato procesado: joint{i}_x/y/z, espina_x/y/z y timestamp
+        
+        Args:
+            include_spine: Agregar las columnas de la espina
+            include_timestamp: Agregar la columna timestamp (si la secuencia tiene tiempos)
+        """
+        blocks = [self.joints.reshape(len(self), -1)]
+        columns = [f'joint{joint_id}_{coord}' for joint_id in self.joint_ids for coord in ('x', 'y', 'z')]
+        if include_spine:
+            blocks.append(self.spine())
+            columns += SPINE_COLUMNS
+        if include_timestamp and self.timestamps is not None:
+            blocks.append(self.timestamps[:, np.newaxis])
+            columns.append('timestamp')
+        # pandas solo se importa al convertir (no hace falta para capturar ni para la GUI)
+        import pandas as pd
+        
+        # Un solo bloque float64 evita el DataFrame fragmentado de agregar columnas una a una
+        return pd.DataFrame(np.hstack([np.asarray(b, dtype=np.float64) for b in blocks]), columns=columns)
@@ -0,0 +1,224 @@
+"""
+Medición de latencia por etapa (cámara, pose, profundidad, limpieza, imputación, características, modelo)
+"""
+
+import functools
+import threading
+import time
+import numpy as np
+
+class _NullStage:
+    """Contexto vacío usado cuando la medición está desactivada"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    __slots__ = ('timer', 'name', 'start')
+    
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.record(self.name, time.perf_counter() - self.start)
+        return False
+
+class _StageWindow:
+    """Últimas duraciones de una etapa en un buffer circular preasignado"""
+    
+    __slots__ = ('values', 'size', 'count', 'position', 'last')
+    
+    def __init__(self, window):
+        self.values = np.zeros(window)
+        self.size = 0
+        self.count = 0
+        self.position = 0
+        self.last = 0.0
+    
+    def add(self, seconds):
+        self.values[self.position] = seconds
+        self.position = (self.position + 1) % len(self.values)
+        self.size = min(self.size + 1, len(self.values))
+        self.count += 1
+        self.last = seconds
+    
+    def recent(self):
+        return self.values[:self.size].copy()
+
+class StageTimer:
+    def __init__(self, window=512, enabled=False):
+        """
+        Registro de duraciones por etapa con ventanas deslizantes
+        
+        Desactivado, stage() devuelve un contexto vacío compartido y timed() solo
+        comprueba un atributo, así que puede quedarse en el código de producción.
+        
+        Args:
+            window: Duraciones recientes que se conservan por etapa
+            enabled: Medir desde el inicio
+        """
+        self.window = window
+        self.enabled = enabled
+        self._stages = {}
+        self._lock = threading.Lock()
+        # Tupla reemplazada (no modificada) al registrar oyentes: record la recorre sin el lock
+        self._listeners = ()
+    
+    def stage(self, name):
+        """
+        Contexto que mide el bloque como la etapa indicada
+            
+            with STAGE_TIMER.stage("preprocess.impute"):
+                ...
+        
+        Args:
+            name: Nombre de la etapa ("grupo.etapa")
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+    
+    def timed(self, name):
+        """
+        Decorador que mide cada llamada a la función como la etapa indicada
+        
+        Args:
+            name: Nombre de la etapa
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+    
+    def record(self, name, seconds):
+        """
+        Registra una duración medida externamente
+        
+        Args:
+            name: Nombre de la etapa
+            seconds: Duración en segundos
+        """
+        with self._lock:
+            window = self._stages.get(name)
+            if window is None:
+                window = self._stages[name] = _StageWindow(self.window)
+            window.add(seconds)
+            listeners = self._listeners
+        for listener in listeners:
+            listener(name, seconds)
+    
+    def add_listener(self, listener):
+        """
+        Registra una función (nombre, segundos) llamada con cada duración registrada
+        
+        Args:
+            listener: Función a llamar
+        """
+        with self._lock:
+            self._listeners = self._listeners + (listener,)
+    
+    def remove_listener(self, listener):
+        with self._lock:
+            self._listeners = tuple(item for item in self._listeners if item is not listener)
+    
+    def stage_names(self):
+        with self._lock:
+            return list(self._stages)
+    
+    def percentile(self, name, q):
+        """
+        Percentil de la ventana reciente de una etapa, en milisegundos
+        
+        Args:
+            name: Nombre de la etapa
+            q: Percentil (0-100)
+        
+        Returns:
+            Milisegundos o None si la etapa no tiene mediciones
+        """
+        with self._lock:
+            window = self._stages.get(name)
+            values = window.recent() if window is not None else None
+        if values is None or len(values) == 0:
+            return None
+        return float(np.percentile(values, q) * 1000.0)
+    
+    def histogram(self, name, bins=20):
+        """
+        Histograma de la ventana reciente de una etapa
+        
+        Args:
+            name: Nombre de la etapa
+            bins: Número de intervalos o bordes en milisegundos
+        
+        Returns:
+            Tupla (conteos, bordes_ms) como np.histogram, o None si no hay mediciones
+        """
+        with self._lock:
+            window = self._stages.get(name)
+            values = window.recent() if window is not None else None
+        if values is None or len(values) == 0:
+            return None
+        return np.histogram(values * 1000.0, bins=bins)
+    
+    def snapshot(self):
+        """
+        Resumen de todas las etapas
+        
+        Returns:
+            Diccionario nombre -> {count, last_ms, mean_ms, p50_ms, p95_ms, max_ms}
+        """
+        with self._lock:
+            windows = {name: (window.recent(), window.count, window.last)
+                       for name, window in self._stages.items()}
+        
+        summary = {}
+        for name, (values, count, last) in windows.items():
+            if len(values) == 0:
+                continue
+            p50, p95 = np.percentile(values, [50, 95]) * 1000.0
+            summary[name] = {
+                'count': count,
+                'last_ms': last * 1000.0,
+                'mean_ms': float(values.mean() * 1000.0),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'max_ms': float(values.max() * 1000.0),
+            }
+        return summary
+    
+    def reset(self):
+        """Olvida todas las mediciones"""
+        with self._lock:
+            self._stages.clear()
+
+# Temporizador global compartido por todos los módulos (desactivado por defecto)
+STAGE_TIMER = StageTimer()
+
+def stage(name):
+    """Atajo para STAGE_TIMER.stage(name)"""
+    return STAGE_TIMER.stage(name)
+
+def timed(name):
+    """Atajo para STAGE_TIMER.timed(name)"""
+    return STAGE_TIMER.timed(name)
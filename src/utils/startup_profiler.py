@@ -0,0 +1,137 @@
+"""
+Medición del arranque: costo de importaciones, inicialización y calentamiento por componente
+"""
+
+import threading
+import time
+from .trace_recorder import TRACER
+
+PHASE_KINDS = ("import", "init", "warmup", "mark")
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'kind', 'span', 'start')
+    
+    def __init__(self, profiler, name, kind):
+        self.profiler = profiler
+        self.name = name
+        self.kind = kind
+    
+    def __enter__(self):
+        self.span = TRACER.span(self.name, "startup")
+        self.span.__enter__()
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.span.__exit__(exc_type, exc, tb)
+        self.profiler.record(self.name, self.kind, self.start, end - self.start, failed=exc_type is not None)
+        return False
+
+class StartupProfiler:
+    def __init__(self):
+        """
+        Registro de las fases del arranque de la aplicación
+        
+        El origen de tiempos es el momento en que se importa este módulo, así que conviene
+        importarlo antes que cualquier dependencia pesada.
+        """
+        self.origin = time.perf_counter()
+        self._phases = []
+        self._lock = threading.Lock()
+    
+    def phase(self, name, kind="init"):
+        """
+        Contexto que mide el bloque como una fase del arranque
+            
+            with STARTUP_PROFILER.phase("import.capture", "import"):
+                from src.capture import RealSenseCapture
+        
+        Args:
+            name: Nombre de la fase
+            kind: "import", "init" o "warmup"
+        """
+        if kind not in PHASE_KINDS:
+            raise ValueError(f"Tipo de fase desconocido: {kind}. Opciones: {PHASE_KINDS}")
+        return _Phase(self, name, kind)
+    
+    def mark(self, name):
+        """
+        Registra un instante del arranque (p. ej. la primera vez que se dibuja la ventana)
+        
+        Args:
+            name: Nombre del instante
+        """
+        TRACER.instant(name, "startup")
+        self.record(name, "mark", time.perf_counter(), 0.0)
+    
+    def record(self, name, kind, start, seconds, failed=False):
+        """
+        Registra una fase medida externamente
+        
+        Args:
+            name: Nombre de la fase
+            kind: Tipo de fase
+            start: Instante de inicio (time.perf_counter)
+            seconds: Duración en segundos
+            failed: La fase terminó con una excepción
+        """
+        with self._lock:
+            self._phases.append({
+                'name': name,
+                'kind': kind,
+                'thread': threading.current_thread().name,
+                'start_ms': (start - self.origin) * 1000.0,
+                'duration_ms': seconds * 1000.0,
+                'failed': failed
+            })
+    
+    def phases(self):
+        """Fases registradas, ordenadas por inicio"""
+        with self._lock:
+            return sorted(self._phases, key=lambda phase: phase['start_ms'])
+    
+    def totals(self):
+        """
+        Milisegundos acumulados por tipo de fase
+        
+        Las fases en paralelo se suman, así que el total puede superar el tiempo transcurrido.
+        """
+        totals = {kind: 0.0 for kind in PHASE_KINDS if kind != "mark"}
+        for phase in self.phases():
+            if phase['kind'] in totals:
+                totals[phase['kind']] += phase['duration_ms']
+        return totals
+    
+    def elapsed_ms(self):
+        """Milisegundos desde el origen hasta el final de la última fase registrada"""
+        phases = self.phases()
+        if not phases:
+            return 0.0
+        return max(phase['start_ms'] + phase['duration_ms'] for phase in phases)
+    
+    def report(self):
+        """
+        Tabla de texto con cada fase: inicio, duración, tipo e hilo
+        
+        Returns:
+            Reporte listo para imprimir
+        """
+        lines = [f"{'Fase':<32}{'tipo':<8}{'inicio ms':>11}{'duración ms':>13}  hilo"]
+        lines.append("-" * 80)
+        for phase in self.phases():
+            status = "  (error)" if phase['failed'] else ""
+            lines.append(
+                f"{phase['name']:<32}{phase['kind']:<8}{phase['start_ms']:>11.1f}"
+                f"{phase['duration_ms']:>13.1f}  {phase['thread']}{status}"
+            )
+        lines.append("-" * 80)
+        totals = self.totals()
+        lines.append(
+            "Total: " + ", ".join(f"{kind} {ms:.1f} ms" for kind, ms in totals.items())
+            + f" | transcurrido {self.elapsed_ms():.1f} ms"
+        )
+        return "\n".join(lines)
+
+# Instancia compartida por la GUI y los componentes que se inicializan al arrancar
+STARTUP_PROFILER = StartupProfiler()
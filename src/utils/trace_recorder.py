@@ -0,0 +1,199 @@
+"""
+Traza de eventos por hilo exportable al formato Chrome trace-event (chrome://tracing, Perfetto)
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from .stage_timer import STAGE_TIMER, _NULL_STAGE
+
+class _Span:
+    __slots__ = ('recorder', 'name', 'category', 'args', 'start')
+    
+    def __init__(self, recorder, name, category, args):
+        self.recorder = recorder
+        self.name = name
+        self.category = category
+        self.args = args
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.recorder._emit_complete(self.name, self.category, self.start, end - self.start, self.args)
+        return False
+
+class TraceRecorder:
+    def __init__(self, capacity=200000):
+        """
+        Registro acotado de eventos con hilo y marca de tiempo
+        
+        Cada intervalo se guarda como un evento completo ("X": inicio + duración) al cerrarse,
+        así el buffer circular nunca deja un inicio sin su fin al descartar eventos viejos.
+        
+        Args:
+            capacity: Eventos máximos conservados; al llenarse se descartan los más antiguos
+        """
+        self.capacity = capacity
+        self.enabled = False
+        self.events_recorded = 0
+        
+        self._events = deque(maxlen=capacity)
+        self._thread_names = {}
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._stage_timer = None
+    
+    def start(self, stage_timer=STAGE_TIMER):
+        """
+        Empieza a registrar eventos; las etapas medidas por stage_timer también se registran
+        
+        Args:
+            stage_timer: StageTimer cuyas etapas se vuelcan en la traza (None = solo intervalos propios)
+        """
+        if self.enabled:
+            return
+        self.enabled = True
+        if stage_timer is not None:
+            stage_timer.enabled = True
+            stage_timer.add_listener(self._on_stage)
+            self._stage_timer = stage_timer
+        print(f"Traza iniciada (capacidad {self.capacity} eventos)")
+    
+    def stop(self):
+        """Deja de registrar eventos (los ya registrados se conservan)"""
+        self.enabled = False
+        if self._stage_timer is not None:
+            self._stage_timer.remove_listener(self._on_stage)
+            self._stage_timer = None
+    
+    def span(self, name, category="app", **args):
+        """
+        Contexto que registra el bloque como un intervalo del hilo actual
+            
+            with TRACER.span("preview.frame", index=packet.index):
+                ...
+        
+        Args:
+            name: Nombre del intervalo
+            category: Categoría (filtro en el visor)
+            **args: Datos adicionales que se muestran al seleccionar el evento
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Span(self, name, category, args)
+    
+    def traced(self, name, category="app"):
+        """
+        Decorador que registra cada llamada a la función como un intervalo
+        
+        Args:
+            name: Nombre del intervalo
+            category: Categoría
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, name, category, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def instant(self, name, category="app", **args):
+        """
+        Registra un evento puntual
+        
+        Args:
+            name: Nombre del evento
+            category: Categoría
+            **args: Datos adicionales
+        """
+        if not self.enabled:
+            return
+        self._append({'name': name, 'cat': category, 'ph': 'i', 's': 't',
+                      'ts': self._to_us(time.perf_counter()), 'args': args})
+    
+    def counter(self, name, **values):
+        """
+        Registra el valor de uno o más contadores (se dibujan como gráfica en el visor)
+        
+        Args:
+            name: Nombre del contador
+            **values: Series y valores (p. ej. capture=29.8, inference=27.1)
+        """
+        if not self.enabled:
+            return
+        self._append({'name': name, 'ph': 'C', 'ts': self._to_us(time.perf_counter()), 'args': values})
+    
+    def _on_stage(self, name, seconds):
+        """Recibe las etapas del StageTimer (se llama al terminar cada una, en su mismo hilo)"""
+        if self.enabled:
+            end = time.perf_counter()
+            self._emit_complete(name, name.split('.', 1)[0], end - seconds, seconds, None)
+    
+    def _emit_complete(self, name, category, start, duration, args):
+        event = {'name': name, 'cat': category, 'ph': 'X',
+                 'ts': self._to_us(start), 'dur': duration * 1e6}
+        if args:
+            event['args'] = args
+        self._append(event)
+    
+    def _append(self, event):
+        thread = threading.current_thread()
+        tid = thread.ident
+        if tid not in self._thread_names:
+            self._thread_names[tid] = thread.name
+        event['pid'] = self._pid
+        event['tid'] = tid
+        # deque.append es atómico: no hace falta bloquear en el camino caliente
+        self._events.append(event)
+        self.events_recorded += 1
+    
+    def _to_us(self, perf_time):
+        return (perf_time - self._origin) * 1e6
+    
+    def export(self, path):
+        """
+        Escribe los eventos conservados en formato Chrome trace-event JSON
+        
+        Args:
+            path: Archivo .json de salida
+        
+        Returns:
+            Número de eventos escritos
+        """
+        events = list(self._events)
+        metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid, 'args': {'name': name}}
+                    for tid, name in list(self._thread_names.items())]
+        trace = {
+            'traceEvents': metadata + events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'events_recorded': self.events_recorded,
+                'events_dropped': max(self.events_recorded - len(events), 0),
+            },
+        }
+        
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f)
+        
+        print(f"Traza guardada en: {path} ({len(events)} eventos)")
+        return len(events)
+    
+    def clear(self):
+        """Descarta los eventos registrados"""
+        self._events.clear()
+        self.events_recorded = 0
+
+# Traza global compartida (desactivada hasta llamar a TRACER.start())
+TRACER = TraceRecorder()
@@ -4,13 +4,14 @@ Este archivo abre una ventana para ver la cámara y detectar el esqueleto humano
 """
 
 import cv2
-import pyrealsense2 as rs
 import numpy as np
 import mediapipe as mp
 import json
 import os
 import time
 from datetime import datetime
+from src.capture.depth_sampler import DepthSampler
+from src.capture.replay_source import ReplayPipeline, ReplayFinished
 
 class PoseDetector:
     """Detector de poses usando MediaPipe"""
@@ -26,6 +27,9 @@ class PoseDetector:
             min_tracking_confidence=0.5
         )
         
+        # Lectura vectorizada de profundidad (la escala se ajusta al iniciar el pipeline)
+        self.depth_sampler = DepthSampler()
+        
         # Diccionario de nombres de joints en español
         self.joint_names = {
             0: "Nariz", 1: "Ojo Izq. Int", 2: "Ojo Izq", 3: "Ojo Izq. Ext",
@@ -68,65 +72,77 @@ class PoseDetector:
                                   cv2.FONT_HERSHEY_SIMPLEX, 0.3, (255, 255, 0), 1)
     
     def get_joint_coordinates(self, results, depth_frame=None):
-        """Extrae coordenadas 3D de los joints detectados"""
+        """Extrae coordenadas 3D de los joints detectados (profundidad leída en bloque)"""
         joints_3d = []
         if results.pose_landmarks:
             h, w = 480, 640  # Resolución de la cámara
             
-            for idx, landmark in enumerate(results.pose_landmarks.landmark):
-                x = int(landmark.x * w)
-                y = int(landmark.y * h)
-                
-                # Obtener coordenada Z del sensor de profundidad si está disponible
-                z = 0
-                if depth_frame and 0 <= x < w and 0 <= y < h:
-                    z = depth_frame.get_distance(x, y)
-                
+            landmarks = results.pose_landmarks.landmark
+            normalized = np.array([(lm.x, lm.y, lm.visibility) for lm in landmarks])
+            xs = (normalized[:, 0] * w).astype(int)
+            ys = (normalized[:, 1] * h).astype(int)
+            
+            # Obtener coordenada Z del sensor de profundidad si está disponible
+            if depth_frame is not None:
+                zs = self.depth_sampler.sample(depth_frame, xs, ys)
+            else:
+                zs = np.zeros(len(xs))
+            
+            for idx in range(len(xs)):
                 joints_3d.append({
                     'id': idx,
                     'name': self.joint_names[idx],
-                    'x': x, 'y': y, 'z': z,
-                    'confidence': landmark.visibility
+                    'x': int(xs[idx]), 'y': int(ys[idx]), 'z': float(zs[idx]),
+                    'confidence': float(normalized[idx, 2])
                 })
         
         return joints_3d
 
-def test_realsense_camera():
+def test_realsense_camera(replay_path=None):
     """
     Prueba la conexión con la cámara RealSense y detecta poses en tiempo real
-    """
-    print("🔍 Buscando cámaras Intel RealSense...")
     
-    # Configurar el pipeline de RealSense
-    pipeline = rs.pipeline()
-    config = rs.config()
+    Args:
+        replay_path: Grabación (.npz o .mp4 de esta misma prueba) a reproducir en lugar de la cámara
+    """
+    # Configurar el pipeline de RealSense (o la reproducción de una grabación, que no necesita el SDK)
+    if replay_path:
+        print(f"🎞️ Reproduciendo grabación: {replay_path}")
+        pipeline = ReplayPipeline(replay_path, pacing="realtime")
+        config = None
+    else:
+        import pyrealsense2 as rs
+        print("🔍 Buscando cámaras Intel RealSense...")
+        pipeline = rs.pipeline()
+        config = rs.config()
     
     # Inicializar detector de poses
     pose_detector = PoseDetector()
     print("🤖 Detector de poses MediaPipe inicializado")
     
     try:
-        # Verificar dispositivos conectados
-        context = rs.context()
-        devices = context.devices
-        
-        if len(devices) == 0:
-            print("❌ No se encontraron cámaras Intel RealSense conectadas.")
-            print("   Verifica que:")
-            print("   - La cámara esté conectada por USB")
-            print("   - Los drivers de Intel RealSense estén instalados")
-            print("   - La cámara tenga alimentación suficiente")
-            return False
-        
-        print(f"✅ Encontradas {len(devices)} cámara(s) RealSense:")
-        for i, device in enumerate(devices):
-            serial = device.get_info(rs.camera_info.serial_number)
-            name = device.get_info(rs.camera_info.name)
-            print(f"   Cámara {i+1}: {name} (Serial: {serial})")
-        
-        # Configurar streams
-        config.enable_stream(rs.stream.color, 640, 480, rs.format.bgr8, 30)
-        config.enable_stream(rs.stream.depth, 640, 480, rs.format.z16, 30)
+        if config is not None:
+            # Verificar dispositivos conectados
+            context = rs.context()
+            devices = context.devices
+            
+            if len(devices) == 0:
+                print("❌ No se encontraron cámaras Intel RealSense conectadas.")
+                print("   Verifica que:")
+                print("   - La cámara esté conectada por USB")
+                print("   - Los drivers de Intel RealSense estén instalados")
+                print("   - La cámara tenga alimentación suficiente")
+                return False
+            
+            print(f"✅ Encontradas {len(devices)} cámara(s) RealSense:")
+            for i, device in enumerate(devices):
+                serial = device.get_info(rs.camera_info.serial_number)
+                name = device.get_info(rs.camera_info.name)
+                print(f"   Cámara {i+1}: {name} (Serial: {serial})")
+            
+            # Configurar streams
+            config.enable_stream(rs.stream.color, 640, 480, rs.format.bgr8, 30)
+            config.enable_stream(rs.stream.depth, 640, 480, rs.format.z16, 30)
         
         # Iniciar pipeline
         print("\n🎥 Iniciando detección de poses en tiempo real...")
@@ -137,7 +153,8 @@ def test_realsense_camera():
         print("   - 'n': Alternar nombres de joints")
         print("   - 's': Mostrar estadísticas de joints")
         
-        pipeline.start(config)
+        profile = pipeline.start(config)
+        pose_detector.depth_sampler = DepthSampler.from_profile(profile)
         
         show_depth = False
         show_poses = True
@@ -160,7 +177,11 @@ def test_realsense_camera():
         try:
             while True:
                 # Esperar frames
-                frames = pipeline.wait_for_frames()
+                try:
+                    frames = pipeline.wait_for_frames()
+                except ReplayFinished:
+                    print("\n🎞️ Fin de la grabación")
+                    break
                 
                 # Obtener frame de color y profundidad
                 color_frame = frames.get_color_frame()
@@ -337,9 +358,13 @@ def main():
     print("🚀 PRUEBA DE CÁMARA INTEL REALSENSE")
     print("=" * 45)
     
-    # Verificar que las librerías estén instaladas
+    import sys
+    replay_path = sys.argv[1] if len(sys.argv) > 1 else None
+    
+    # Verificar que las librerías estén instaladas (el SDK solo hace falta con la cámara física)
     try:
-        import pyrealsense2 as rs
+        if replay_path is None:
+            import pyrealsense2 as rs
         import cv2
         import mediapipe as mp
         print("✅ Librerías instaladas correctamente")
@@ -349,8 +374,8 @@ def main():
         print("   pip install pyrealsense2 opencv-python mediapipe")
         return
     
-    # Probar la cámara
-    success = test_realsense_camera()
+    # Probar la cámara (o reproducir la grabación indicada como argumento)
+    success = test_realsense_camera(replay_path)
     
     if success:
         print("\n🎉 ¡Prueba completada exitosamente!")
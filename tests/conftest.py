@@ -0,0 +1,19 @@
+"""
+Configuración común de las pruebas: el paquete src se importa desde la raíz del repositorio
+"""
+
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+try:
+    import src.capture  # noqa: F401
+except ImportError:
+    # Sin OpenCV/MediaPipe el __init__ de src.capture falla; los módulos que no los usan
+    # (frame_hub, motion_gate, replay_source...) se importan igual desde el paquete sin inicializar
+    capture = types.ModuleType("src.capture")
+    capture.__path__ = [os.path.join(ROOT, "src", "capture")]
+    sys.modules["src.capture"] = capture
@@ -0,0 +1,80 @@
+"""
+Pipeline de preprocesamiento sobre clips sintéticos: imputación, limpieza de anomalías y timestamps
+"""
+
+import numpy as np
+import pytest
+from src.preprocessing import DataPreprocessor
+
+def _walking_clip(n_frames=60):
+    """Clip sintético de 33 joints que se desplazan en x a velocidad constante"""
+    rng = np.random.default_rng(2)
+    base = rng.uniform(100, 400, size=(33, 3))
+    base[:, 2] = rng.uniform(1.0, 3.0, 33)
+    joints = np.repeat(base[np.newaxis], n_frames, axis=0)
+    joints[:, :, 0] += np.arange(n_frames)[:, np.newaxis] * 2.0
+    return joints
+
+@pytest.mark.parametrize("imputation", ["knn", "temporal"])
+def test_processed_sequence_has_100_frames_and_no_missing_values(imputation):
+    joints = _walking_clip()
+    joints[10:14, 15] = 0.0   # Muñeca no detectada durante 4 frames
+    
+    sequence = DataPreprocessor(imputation=imputation).process_sequence(joints)
+    
+    assert sequence.joints.shape == (100, 33, 3)
+    assert not np.isnan(sequence.joints).any()
+
+def test_temporal_imputation_fills_a_gap_along_the_trajectory():
+    joints = _walking_clip()
+    joints[10:14, 15] = 0.0
+    
+    sequence = DataPreprocessor(imputation="temporal").process_sequence(joints)
+    
+    # El clip es lineal en el tiempo: la interpolación sigue la trayectoria original con un error
+    # menor que el desplazamiento de un frame (el remuestreo toma el frame válido más cercano)
+    expected = DataPreprocessor(imputation="temporal").process_sequence(_walking_clip())
+    np.testing.assert_allclose(sequence.joints, expected.joints, rtol=0, atol=1.0)
+
+def test_temporal_imputation_rejects_a_joint_never_detected():
+    joints = _walking_clip()
+    joints[:, 15] = 0.0
+    
+    with pytest.raises(ValueError, match="imputar"):
+        DataPreprocessor(imputation="temporal").process_sequence(joints)
+
+def test_unknown_imputation_is_rejected():
+    with pytest.raises(ValueError):
+        DataPreprocessor(imputation="media")
+
+def test_default_imputation_is_temporal():
+    # Los modelos entrenados con KNN se señalan en check_compatibility por este preprocesamiento
+    assert DataPreprocessor().feature_config() == {'imputation': 'temporal', 'interpolation': 'linear',
+                                                   'max_gap': None}
+
+def test_cleaner_masks_jumps_without_dropping_frames():
+    joints = _walking_clip()
+    joints[20, 13, 0] += 500.0   # Salto en píxeles
+    joints[40, 25, 2] += 2.0     # Salto en metros
+    preprocessor = DataPreprocessor()
+    
+    values, valid = preprocessor._clean_anomalies(joints.reshape(len(joints), -1).copy())
+    
+    assert len(values) == len(joints)
+    valid = valid.reshape(len(joints), 33, 3)
+    invalid_samples = {(int(frame), int(joint)) for frame, joint in zip(*np.nonzero(~valid.all(axis=2)))}
+    # Como la regla original por diferencias: el pico y la vuelta al valor normal son saltos
+    assert invalid_samples == {(20, 13), (21, 13), (40, 25), (41, 25)}
+    assert preprocessor.last_cleaning_report['masked_joint_samples'] == 4
+    assert preprocessor.last_cleaning_report['frames_affected'] == 4
+
+def test_cleaner_uses_separate_pixel_and_depth_thresholds():
+    joints = _walking_clip()
+    joints[30:, 5, 2] += 0.3     # Cambio de profundidad bajo el umbral en metros
+    joints[30:, 6, 1] += 50.0    # Cambio en píxeles bajo el umbral x/y
+    preprocessor = DataPreprocessor()
+    
+    _, valid = preprocessor._clean_anomalies(joints.reshape(len(joints), -1).copy())
+    
+    assert valid.all()
+    assert preprocessor.last_cleaning_report['masked_joint_samples'] == 0
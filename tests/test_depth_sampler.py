@@ -0,0 +1,40 @@
+"""
+Muestreo vectorizado de profundidad frente a get_distance por píxel
+"""
+
+import numpy as np
+from src.capture.depth_sampler import DepthSampler
+from src.capture.replay_source import ReplayFrame, ReplayProfile
+
+def _depth_frame(depth_scale=0.001):
+    rng = np.random.default_rng(4)
+    depth = rng.integers(300, 4000, size=(48, 64)).astype(np.uint16)
+    return ReplayFrame(depth, 0.0, 0, depth_scale)
+
+def test_single_pixel_matches_get_distance():
+    frame = _depth_frame(0.00025)
+    sampler = DepthSampler(depth_scale=0.00025)
+    rng = np.random.default_rng(5)
+    xs = rng.uniform(0, 64, 33)
+    ys = rng.uniform(0, 48, 33)
+    
+    expected = [frame.get_distance(x, y) for x, y in zip(xs, ys)]
+    np.testing.assert_allclose(sampler.sample(frame, xs, ys), expected, rtol=0, atol=1e-12)
+
+def test_points_outside_the_image_have_no_depth():
+    sampler = DepthSampler()
+    depths = sampler.sample(_depth_frame(), [-1, 10, 64, 10], [10, -3, 10, 48])
+    np.testing.assert_array_equal(depths, 0.0)
+
+def test_neighborhood_median_fills_holes():
+    depth = np.full((20, 20), 2000, dtype=np.uint16)
+    depth[10, 10] = 0           # Hueco en el píxel del landmark
+    depth[9, 11] = 2600         # Valor atípico dentro de la ventana
+    depth[0:3, 0:3] = 0         # Ventana sin ningún dato
+    
+    np.testing.assert_allclose(DepthSampler(neighborhood=1).sample(depth, [10, 1], [10, 1]), [2.0, 0.0])
+    np.testing.assert_allclose(DepthSampler().sample(depth, [10], [10]), [0.0])
+
+def test_scale_comes_from_the_device_profile():
+    sampler = DepthSampler.from_profile(ReplayProfile("replay", 0.0001), neighborhood=2)
+    assert sampler.depth_scale == 0.0001 and sampler.neighborhood == 2
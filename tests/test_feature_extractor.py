@@ -0,0 +1,98 @@
+"""
+Características de distancias y velocidades: estadísticas con NaN y escala temporal de las velocidades
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+from src.features import FeatureExtractor
+from src.preprocessing import DataPreprocessor
+
+N_DISTANCE_FEATURES = 32
+
+def _moving_wrist_clip(n_frames, step):
+    """Joints fijos salvo la muñeca izquierda (15), que se aleja de la espina step píxeles por frame"""
+    joints = np.zeros((n_frames, 33, 3))
+    joints[:, :, 0] = 300.0
+    joints[:, :, 1] = 200.0
+    joints[:, :, 2] = 2.0
+    joints[:, 15, 0] += np.arange(n_frames) * step
+    return joints
+
+def _wrist_velocity_mean(features):
+    # Orden: [media, varianza, max, min] por joint objetivo; la muñeca izquierda es el tercero
+    return features[N_DISTANCE_FEATURES + 2 * 4]
+
+def test_statistics_ignore_nan_like_pandas_without_warnings():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(50, 6))
+    values[rng.random(values.shape) < 0.3] = np.nan
+    values[:, 2] = np.nan
+    values[1:, 4] = np.nan
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        stats = FeatureExtractor()._column_statistics(values).reshape(6, 4)
+    
+    df = pd.DataFrame(values)
+    expected = np.column_stack([df.mean(), df.var(), df.max(), df.min()])
+    np.testing.assert_allclose(stats, expected, rtol=1e-12, equal_nan=True)
+
+def test_statistics_without_nan_match_pandas():
+    values = np.random.default_rng(1).normal(size=(100, 8))
+    
+    stats = FeatureExtractor()._column_statistics(values).reshape(8, 4)
+    
+    df = pd.DataFrame(values)
+    expected = np.column_stack([df.mean(), df.var(), df.max(), df.min()])
+    np.testing.assert_allclose(stats, expected, rtol=1e-12)
+
+def test_velocity_without_timestamps_uses_nominal_30_fps():
+    extractor = FeatureExtractor()
+    
+    features = extractor.extract_features_from_array(_moving_wrist_clip(100, 2.0))
+    
+    assert len(features) == 64
+    assert _wrist_velocity_mean(features) == pytest.approx(2.0 * 30)
+
+def test_velocity_with_timestamps_uses_real_interval():
+    extractor = FeatureExtractor()
+    timestamps = np.arange(100) * 0.05
+    
+    features = extractor.extract_features_from_array(_moving_wrist_clip(100, 2.0), timestamps=timestamps)
+    
+    assert _wrist_velocity_mean(features) == pytest.approx(2.0 / 0.05)
+
+def test_repeated_timestamps_fall_back_to_nominal_interval():
+    extractor = FeatureExtractor()
+    timestamps = np.arange(100) / 30.0
+    timestamps[50] = timestamps[49]
+    
+    distances = np.arange(100, dtype=float)[:, np.newaxis]
+    velocities = extractor._calculate_velocities(distances, timestamps)
+    
+    assert velocities[48, 0] == pytest.approx(30.0)
+    assert velocities[49, 0] == pytest.approx(30.0)   # dt = 0: intervalo nominal
+    assert velocities[50, 0] == pytest.approx(15.0)   # dt = 2/30 s
+
+def test_processed_clip_without_timestamps_keeps_the_nominal_scale():
+    # 60 frames capturados sin timestamps se remuestrean a 100: las velocidades no se reescalan
+    # con una duración inventada, usan 1/30 s entre muestras como los modelos entrenados
+    sequence = DataPreprocessor(imputation="temporal").process_sequence(_moving_wrist_clip(60, 2.0))
+    
+    features = FeatureExtractor().extract_features_from_sequence(sequence)
+    
+    assert sequence.timestamps is None
+    step_after_resampling = 2.0 * 59 / 99
+    assert _wrist_velocity_mean(features) == pytest.approx(step_after_resampling * 30)
+
+def test_processed_clip_with_timestamps_uses_capture_duration():
+    timestamps = 100.0 + np.arange(60) * 0.05
+    sequence = DataPreprocessor(imputation="temporal").process_sequence(_moving_wrist_clip(60, 2.0),
+                                                                        timestamps=timestamps)
+    
+    features = FeatureExtractor().extract_features_from_sequence(sequence)
+    
+    np.testing.assert_allclose(sequence.timestamps, np.linspace(0.0, timestamps[-1] - timestamps[0], 100))
+    assert _wrist_velocity_mean(features) == pytest.approx(2.0 / 0.05)
@@ -0,0 +1,53 @@
+"""
+El bosque aplanado debe predecir lo mismo que scikit-learn con el scaler aplicado
+"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+from src.classification import FlatForest
+
+def _training_data(n_samples=300, n_features=12, seed=0):
+    """Características con escalas y desplazamientos distintos y tres clases"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_samples, n_features)) * rng.uniform(0.1, 50, n_features)
+    X += rng.uniform(-20, 20, n_features)
+    labels = (X[:, 0] > np.median(X[:, 0])).astype(int) + (X[:, 1] > np.median(X[:, 1]))
+    y = np.array(['caminar', 'correr', 'sentarse'])[labels]
+    return X, y
+
+@pytest.fixture(scope="module")
+def trained():
+    X, y = _training_data()
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=15, max_depth=8, random_state=0).fit(scaler.transform(X), y)
+    return model, scaler
+
+def test_predict_proba_matches_sklearn_with_folded_scaler(trained):
+    model, scaler = trained
+    flat = FlatForest.from_sklearn(model, scaler)
+    X, _ = _training_data(n_samples=200, seed=1)
+    
+    expected = model.predict_proba(scaler.transform(X))
+    np.testing.assert_allclose(flat.predict_proba(X), expected, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(flat.predict(X), model.predict(scaler.transform(X)))
+    np.testing.assert_array_equal(flat.classes, model.classes_)
+
+def test_single_vector_is_one_sample(trained):
+    model, scaler = trained
+    flat = FlatForest.from_sklearn(model, scaler)
+    X, _ = _training_data(n_samples=1, seed=2)
+    
+    np.testing.assert_allclose(flat.predict_proba(X[0]), flat.predict_proba(X))
+
+def test_missing_values_follow_sklearn():
+    X, y = _training_data(seed=3)
+    rng = np.random.default_rng(3)
+    X[rng.random(X.shape) < 0.1] = np.nan
+    model = RandomForestClassifier(n_estimators=10, max_depth=6, random_state=0).fit(X, y)
+    flat = FlatForest.from_sklearn(model)
+    
+    X_test, _ = _training_data(n_samples=150, seed=4)
+    X_test[rng.random(X_test.shape) < 0.2] = np.nan
+    np.testing.assert_allclose(flat.predict_proba(X_test), model.predict_proba(X_test), rtol=0, atol=1e-12)
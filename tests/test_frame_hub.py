@@ -0,0 +1,140 @@
+"""
+FrameProducer con pool de pose: publicación en orden y frames omitidos por la compuerta de movimiento
+"""
+
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+import numpy as np
+from src.capture.frame_hub import FrameProducer
+from src.capture.motion_gate import MotionGate
+from src.capture.replay_source import ReplayPipeline
+
+class _StaticRecording:
+    """Grabación en memoria con la misma imagen en todos los frames (escena quieta)"""
+    
+    depth_scale = 0.001
+    
+    def __init__(self, n_frames, fps=30.0):
+        self.n_frames = n_frames
+        self.fps = fps
+        self.color = np.full((48, 64, 3), 120, dtype=np.uint8)
+        self.depth = np.full((48, 64), 1500, dtype=np.uint16)
+    
+    def open(self):
+        pass
+    
+    def close(self):
+        pass
+    
+    def read(self):
+        for i in range(self.n_frames):
+            yield i / self.fps, self.color, self.depth
+
+class _SlowPool:
+    """Imita PoseWorkerPool con un único worker que tarda delay segundos por frame y descarta los de drop"""
+    
+    def __init__(self, delay=0.05, drop=()):
+        self.delay = delay
+        self.drop = set(drop)
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._busy_until = 0.0
+    
+    def start(self):
+        pass
+    
+    def stop(self):
+        pass
+    
+    def submit(self, index, timestamp, image):
+        if index in self.drop:
+            self.frames_submitted += 1
+            self.frames_dropped += 1
+            return
+        with self._condition:
+            self._busy_until = max(time.monotonic(), self._busy_until) + self.delay
+            self._queue.append((self._busy_until, index, timestamp))
+            self.frames_submitted += 1
+            self._condition.notify_all()
+    
+    def get_result(self, timeout=None):
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self._queue and self._queue[0][0] <= now:
+                    _, index, timestamp = self._queue.popleft()
+                    return index, timestamp, SimpleNamespace(pose_landmarks=object(), index=index)
+                if now >= deadline:
+                    return None
+                wait = deadline - now if not self._queue else min(deadline, self._queue[0][0]) - now
+                self._condition.wait(wait)
+
+class _FakeDetector:
+    """Detector mínimo: un joint por frame con la x igual al índice del frame inferido"""
+    
+    depth_sampler = None
+    
+    def get_joint_coordinates(self, pose_results, depth_frame):
+        return [{'id': 0, 'x': float(pose_results.index), 'y': 0.0, 'z': 1.0}]
+    
+    def joints_to_arrays(self, joints_3d):
+        coords = np.zeros((33, 3), dtype=np.float32)
+        valid = np.zeros(33, dtype=bool)
+        coords[0] = joints_3d[0]['x'], joints_3d[0]['y'], joints_3d[0]['z']
+        valid[0] = True
+        return coords, valid
+
+def _run_producer(n_frames, motion_gate=None, delay=0.05, drop=()):
+    pipeline = ReplayPipeline(_StaticRecording(n_frames), pacing="fixed", fps=60)
+    pipeline.start()
+    pool = _SlowPool(delay, drop)
+    producer = FrameProducer(pipeline, _FakeDetector(), name="test", pose_pool=pool, motion_gate=motion_gate)
+    subscriber = producer.subscribe("test", queue_size=n_frames)
+    producer.start()
+    
+    packets = []
+    while True:
+        packet = subscriber.get(timeout=5.0)
+        if packet is None:
+            break
+        packets.append(packet)
+    producer.stop()
+    return producer, pool, packets
+
+def test_pool_results_are_published_in_capture_order():
+    producer, pool, packets = _run_producer(20, delay=0.02, drop={3, 4, 11})
+    
+    # Los frames que el pool descartó no se publican; el resto sale en orden con su propia pose
+    assert [p.index for p in packets] == [i for i in range(20) if i not in (3, 4, 11)]
+    assert all(p.pose_results.index == p.index and not p.pose_reused for p in packets)
+    assert all(p.joint_coords[0, 0] == p.index for p in packets)
+    assert pool.frames_submitted == 20
+    assert producer.dropped_frames() == {'pose_pool': 3}
+
+def test_static_scene_skips_inference_and_publishes_in_order():
+    gate = MotionGate(static_interval=5)
+    producer, pool, packets = _run_producer(40, motion_gate=gate)
+    
+    # Todos los frames salen, en orden y sin huecos, aunque el pool va más lento que la captura
+    assert [p.index for p in packets] == list(range(40))
+    
+    # La escena quieta con una persona detectada solo se infiere uno de cada static_interval frames
+    assert pool.frames_submitted == 8
+    assert producer.frames_gated == 32
+    assert sum(p.pose_reused for p in packets) == 32
+    
+    # Cada frame omitido lleva la pose del último frame inferido que lo precede
+    last_inferred = None
+    for packet in packets:
+        if packet.pose_reused:
+            assert packet.pose_results is last_inferred.pose_results
+            assert packet.joint_coords is last_inferred.joint_coords
+        else:
+            assert packet.pose_results.index == packet.index
+            last_inferred = packet
+    assert packets[0].pose_reused is False
@@ -0,0 +1,127 @@
+"""
+reshape_csvs_to_dataset debe escribir datasets idénticos byte a byte a la implementación original
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.legacy_tools import LegacyDataProcessor
+
+def _baseline_reshape(input_path, output_path, activity_prefix):
+    """Implementación original: un pd.read_csv por archivo y un DataFrame por subcarpeta"""
+    subcarpetas = []
+    for item in os.listdir(input_path):
+        item_path = os.path.join(input_path, item)
+        if os.path.isdir(item_path):
+            csv_path = item_path
+            xyz_path = os.path.join(item_path, "xyz")
+            if os.path.exists(xyz_path):
+                csv_path = xyz_path
+            if any(f.endswith('.csv') for f in os.listdir(csv_path)):
+                subcarpetas.append(csv_path)
+    
+    os.makedirs(output_path, exist_ok=True)
+    for idx, ruta in enumerate(subcarpetas, start=1):
+        todas_las_filas = []
+        for archivo in [f for f in os.listdir(ruta) if f.endswith('.csv')]:
+            archivo_ruta = os.path.join(ruta, archivo)
+            if os.path.getsize(archivo_ruta) == 0:
+                continue
+            try:
+                df = pd.read_csv(archivo_ruta, header=None)
+                if df.shape[1] == 3 and df.shape[0] == 33:
+                    todas_las_filas.append(df.values.flatten())
+            except Exception:
+                pass
+        if todas_las_filas:
+            columnas = [f'joint{i // 3}_{["x", "y", "z"][i % 3]}' for i in range(99)]
+            df_resumen = pd.DataFrame(todas_las_filas, columns=columnas)
+            df_resumen.to_csv(os.path.join(output_path, f"{activity_prefix}_{idx:02}.csv"), index=False)
+
+def _write_frame(path, rows):
+    with open(path, 'w') as f:
+        f.write("\n".join(",".join(row) for row in rows) + "\n")
+
+def _legacy_tree(base, seed=0, n_folders=3, n_files=40):
+    """Carpetas de captura con decimales largos, enteros, -0, columnas mixtas y archivos atípicos"""
+    rng = np.random.default_rng(seed)
+    formats = [
+        lambda v: "%.18e" % v,
+        lambda v: repr(float(v)),
+        lambda v: str(int(round(v))),
+        lambda v: "%.6f" % v,
+    ]
+    for folder in range(n_folders):
+        ruta = os.path.join(base, f"captura_{folder}", "xyz")
+        os.makedirs(ruta)
+        for index in range(n_files):
+            values = rng.normal(0, 300, size=(33, 3))
+            kind = index % 6
+            if kind == 4:
+                # Columnas mixtas: x enteras (con -0), y/z decimales
+                rows = [["-0" if row == 0 else str(int(v[0])), repr(float(v[1])), "%.18e" % v[2]]
+                        for row, v in enumerate(values)]
+            elif kind == 5:
+                rows = [[formats[2](value) for value in v] for v in values]
+                rows[3][1] = "-0"
+            else:
+                rows = [[formats[kind](value) for value in v] for v in values]
+            _write_frame(os.path.join(ruta, f"frame_{index:04}.csv"), rows)
+        
+        # Archivos atípicos: vacío, campo vacío, texto, cabecera y forma incorrecta
+        open(os.path.join(ruta, "vacio.csv"), 'w').close()
+        rows = [[repr(float(value)) for value in v] for v in rng.normal(size=(33, 3))]
+        rows[7][2] = ""
+        _write_frame(os.path.join(ruta, "hueco.csv"), rows)
+        rows = [["1", "2", "3"] for _ in range(33)]
+        rows[0][0] = "nan"
+        _write_frame(os.path.join(ruta, "texto_nan.csv"), rows)
+        _write_frame(os.path.join(ruta, "cabecera.csv"), [["x", "y", "z"]] + [["1", "2", "3"]] * 33)
+        _write_frame(os.path.join(ruta, "corto.csv"), [["1.5", "2", "3"]] * 32)
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_reshape_is_byte_identical_to_baseline(tmp_path, n_jobs):
+    input_path = str(tmp_path / "capturas")
+    _legacy_tree(input_path)
+    _baseline_reshape(input_path, str(tmp_path / "baseline"), "caminar")
+    
+    LegacyDataProcessor().reshape_csvs_to_dataset(input_path, str(tmp_path / "nuevo"), "caminar", n_jobs=n_jobs)
+    
+    expected = sorted(os.listdir(tmp_path / "baseline"))
+    assert sorted(os.listdir(tmp_path / "nuevo")) == expected
+    for name in expected:
+        with open(tmp_path / "baseline" / name, 'rb') as f:
+            baseline = f.read()
+        with open(tmp_path / "nuevo" / name, 'rb') as f:
+            assert f.read() == baseline, name
+
+def test_small_batches_give_the_same_dataset(tmp_path, monkeypatch):
+    from src.legacy_tools import data_processor
+    input_path = str(tmp_path / "capturas")
+    _legacy_tree(input_path, seed=1, n_folders=1)
+    _baseline_reshape(input_path, str(tmp_path / "baseline"), "correr")
+    monkeypatch.setattr(data_processor, "READ_BATCH_FILES", 7)
+    
+    LegacyDataProcessor().reshape_csvs_to_dataset(input_path, str(tmp_path / "nuevo"), "correr")
+    
+    with open(tmp_path / "baseline" / "correr_01.csv", 'rb') as f:
+        baseline = f.read()
+    with open(tmp_path / "nuevo" / "correr_01.csv", 'rb') as f:
+        assert f.read() == baseline
+
+def test_integer_only_folder_stays_integer(tmp_path):
+    input_path = str(tmp_path / "capturas")
+    ruta = os.path.join(input_path, "captura", "xyz")
+    os.makedirs(ruta)
+    for index in range(5):
+        _write_frame(os.path.join(ruta, f"frame_{index}.csv"), [["-0", str(index), "640"]] * 33)
+    _baseline_reshape(input_path, str(tmp_path / "baseline"), "sentarse")
+    
+    LegacyDataProcessor().reshape_csvs_to_dataset(input_path, str(tmp_path / "nuevo"), "sentarse")
+    
+    with open(tmp_path / "baseline" / "sentarse_01.csv", 'rb') as f:
+        baseline = f.read()
+    with open(tmp_path / "nuevo" / "sentarse_01.csv", 'rb') as f:
+        assert f.read() == baseline
+    assert b".0" not in baseline
@@ -0,0 +1,145 @@
+"""
+Artefacto versionado del clasificador: ida y vuelta y rechazo de modelos incompatibles
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from src.classification import (ActivityClassifier, FlatForest, ARTIFACT_FORMAT_VERSION,
+                                save_artifact, load_artifact, read_metadata, check_compatibility,
+                                write_dataset_info, read_dataset_info)
+from src.features import FeatureExtractor, FEATURE_VERSION
+
+@pytest.fixture(scope="module")
+def flat_forest():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 6))
+    y = np.where(X[:, 0] + X[:, 1] > 0, 'correr', 'caminar')
+    model = RandomForestClassifier(n_estimators=8, max_depth=5, random_state=0).fit(X, y)
+    return FlatForest.from_sklearn(model)
+
+def _rewrite_metadata(path, **changes):
+    metadata_file = os.path.join(path, "metadata.json")
+    with open(metadata_file, encoding='utf-8') as f:
+        metadata = json.load(f)
+    metadata.update(changes)
+    with open(metadata_file, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f)
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip_keeps_arrays_and_metadata(tmp_path, flat_forest, mmap):
+    path = str(tmp_path / "modelo")
+    names = [f"f{i}" for i in range(6)]
+    save_artifact(path, flat_forest, feature_names=names, training_data_hash="abc",
+                  feature_version=FEATURE_VERSION, preprocessing={'imputation': 'knn'})
+    
+    loaded, metadata = load_artifact(path, mmap=mmap)
+    for name in ('feature', 'threshold', 'children', 'missing_left', 'leaf_proba', 'roots'):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(flat_forest, name))
+    np.testing.assert_array_equal(loaded.classes, flat_forest.classes)
+    assert loaded.max_depth == flat_forest.max_depth
+    assert metadata['format_version'] == ARTIFACT_FORMAT_VERSION
+    assert metadata['feature_names'] == names
+    assert metadata['feature_version'] == FEATURE_VERSION
+    assert metadata['preprocessing'] == {'imputation': 'knn'}
+    
+    X = np.random.default_rng(1).normal(size=(50, 6))
+    np.testing.assert_array_equal(loaded.predict_proba(X), flat_forest.predict_proba(X))
+
+def test_incomplete_artifact_is_not_read(tmp_path, flat_forest):
+    path = str(tmp_path / "modelo")
+    save_artifact(path, flat_forest)
+    os.remove(os.path.join(path, "metadata.json"))
+    
+    assert read_metadata(path) is None
+    with pytest.raises(FileNotFoundError):
+        load_artifact(path)
+
+def test_unknown_format_version_is_rejected(tmp_path, flat_forest):
+    path = str(tmp_path / "modelo")
+    save_artifact(path, flat_forest)
+    _rewrite_metadata(path, format_version=ARTIFACT_FORMAT_VERSION + 1)
+    
+    with pytest.raises(ValueError, match="formato"):
+        load_artifact(path)
+
+def test_array_not_matching_header_is_rejected(tmp_path, flat_forest):
+    path = str(tmp_path / "modelo")
+    save_artifact(path, flat_forest)
+    np.save(os.path.join(path, "threshold.npy"), flat_forest.threshold[:-1])
+    
+    with pytest.raises(ValueError, match="threshold"):
+        load_artifact(path)
+
+def test_compatibility_checks_features_and_preprocessing(tmp_path, flat_forest):
+    path = str(tmp_path / "modelo")
+    names = [f"f{i}" for i in range(6)]
+    metadata = save_artifact(path, flat_forest, feature_names=names, feature_version=2,
+                             preprocessing={'imputation': 'knn'})
+    
+    assert check_compatibility(metadata, names, 2, {'imputation': 'knn'}) == []
+    assert len(check_compatibility(metadata, names[::-1])) == 1
+    assert len(check_compatibility(metadata, feature_version=3)) == 1
+    assert len(check_compatibility(metadata, preprocessing={'imputation': 'temporal'})) == 1
+
+def test_artifact_without_feature_version_counts_as_version_1(tmp_path, flat_forest):
+    path = str(tmp_path / "modelo")
+    metadata = save_artifact(path, flat_forest)
+    
+    assert metadata['feature_version'] is None
+    assert check_compatibility(metadata, feature_version=1) == []
+    assert len(check_compatibility(metadata, feature_version=2)) == 1
+
+def _write_dataset(tmp_path):
+    feature_names = FeatureExtractor().create_feature_names()
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(90, len(feature_names)))
+    labels = np.repeat(['caminar', 'correr', 'sentarse'], 30)
+    X[:, 0] += np.repeat([0.0, 3.0, 6.0], 30)
+    dataset = pd.DataFrame(X, columns=feature_names)
+    dataset['actividad'] = labels
+    dataset_path = str(tmp_path / "dataset.csv")
+    dataset.to_csv(dataset_path, index=False)
+    return dataset_path, X, feature_names
+
+def test_classifier_trains_and_reloads_from_artifact(tmp_path):
+    dataset_path, X, feature_names = _write_dataset(tmp_path)
+    write_dataset_info(dataset_path, FEATURE_VERSION, {'imputation': 'knn'})
+    
+    model_path = str(tmp_path / "models" / "activity_classifier.pkl")
+    trained = ActivityClassifier(model_path, inference="sklearn")
+    trained.train_model(dataset_path)
+    
+    served = ActivityClassifier(model_path, inference="flat")
+    assert served.model is None and served.flat_forest is not None
+    assert served.feature_version == FEATURE_VERSION
+    assert served.check_compatibility(feature_names, {'imputation': 'knn'}) == []
+    assert served.check_compatibility(feature_names, {'imputation': 'temporal'}) != []
+    
+    served_labels, served_proba = served.predict_batch(X)
+    trained_labels, trained_proba = trained.predict_batch(X)
+    np.testing.assert_allclose(served_proba, trained_proba, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(served_labels, trained_labels)
+
+def test_dataset_without_info_trains_as_version_1(tmp_path):
+    dataset_path, _, feature_names = _write_dataset(tmp_path)
+    assert read_dataset_info(dataset_path) == (1, None)
+    
+    classifier = ActivityClassifier(str(tmp_path / "models" / "activity_classifier.pkl"))
+    classifier.train_model(dataset_path)
+    
+    assert classifier.feature_version == 1 and classifier.preprocessing is None
+    problems = classifier.check_compatibility(feature_names, {'imputation': 'temporal'})
+    assert len(problems) == 1 and "versión 1" in problems[0]
+
+def test_dataset_info_is_ignored_after_the_csv_changes(tmp_path):
+    dataset_path, _, _ = _write_dataset(tmp_path)
+    write_dataset_info(dataset_path, FEATURE_VERSION, {'imputation': 'temporal'})
+    assert read_dataset_info(dataset_path) == (FEATURE_VERSION, {'imputation': 'temporal'})
+    
+    with open(dataset_path, 'a', encoding='utf-8') as f:
+        f.write(",".join(["0"] * 64) + ",caminar\n")
+    assert read_dataset_info(dataset_path) == (1, None)
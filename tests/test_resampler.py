@@ -0,0 +1,43 @@
+"""
+Remuestreo a una malla de tiempo uniforme frente a la interpolación lineal de NumPy
+"""
+
+import numpy as np
+from src.preprocessing import resample_uniform
+
+def test_resample_matches_linear_interpolation_on_uneven_timestamps():
+    rng = np.random.default_rng(0)
+    timestamps = np.cumsum(rng.uniform(0.02, 0.06, 40))
+    values = rng.normal(size=(40, 5))
+    
+    resampled, valid, grid = resample_uniform(values, 100, timestamps=timestamps)
+    
+    np.testing.assert_allclose(grid, np.linspace(timestamps[0], timestamps[-1], 100))
+    expected = np.column_stack([np.interp(grid, timestamps, values[:, col]) for col in range(5)])
+    np.testing.assert_allclose(resampled, expected, rtol=0, atol=1e-12)
+    assert valid.all()
+
+def test_resample_never_blends_a_missing_sample():
+    values = np.array([[0.0], [10.0], [20.0], [30.0]])
+    valid = np.array([[True], [False], [True], [True]])
+    
+    resampled, resampled_valid, grid = resample_uniform(values, 7, valid=valid)
+    
+    # Malla 0, 0.5, ..., 3: entre el frame 0 y el 1 (inválido) se toma el más cercano con su validez
+    np.testing.assert_allclose(grid, np.arange(7) * 0.5)
+    np.testing.assert_allclose(resampled[:, 0], [0, 10, 10, 20, 20, 25, 30])
+    np.testing.assert_array_equal(resampled_valid[:, 0], [True, False, False, True, True, True, True])
+
+def test_resample_treats_clock_going_back_as_stopped_time():
+    values = np.arange(4, dtype=float)[:, np.newaxis]
+    
+    _, _, grid = resample_uniform(values, 4, timestamps=[0.0, 0.1, 0.05, 0.3])
+    
+    np.testing.assert_allclose(grid, np.linspace(0.0, 0.3, 4))
+
+def test_short_clip_is_interpolated_instead_of_padded():
+    values = np.array([[0.0], [1.0], [2.0]])
+    
+    resampled, _, _ = resample_uniform(values, 5)
+    
+    np.testing.assert_allclose(resampled[:, 0], [0.0, 0.5, 1.0, 1.5, 2.0])
@@ -0,0 +1,87 @@
+"""
+Temporizador de etapas: medición desactivada, percentiles y oyentes registrados mientras se mide
+"""
+
+import threading
+import numpy as np
+from src.utils.stage_timer import StageTimer
+
+def test_disabled_timer_records_nothing():
+    timer = StageTimer()
+    
+    @timer.timed("modelo.predecir")
+    def predict():
+        return 1
+    
+    with timer.stage("pose.mediapipe"):
+        pass
+    assert predict() == 1
+    assert timer.snapshot() == {}
+
+def test_percentiles_use_the_recent_window():
+    timer = StageTimer(window=4, enabled=True)
+    for seconds in (1.0, 0.001, 0.002, 0.003, 0.004):
+        timer.record("capture.wait_for_frames", seconds)
+    
+    summary = timer.snapshot()["capture.wait_for_frames"]
+    assert summary['count'] == 5 and summary['last_ms'] == 4.0
+    assert summary['max_ms'] == 4.0
+    assert timer.percentile("capture.wait_for_frames", 50) == np.percentile([1, 2, 3, 4], 50)
+
+def test_listener_changes_apply_to_the_next_record():
+    timer = StageTimer(enabled=True)
+    calls = []
+    
+    def late(name, seconds):
+        calls.append(("late", name))
+    
+    def once(name, seconds):
+        # Cambiar los oyentes desde un oyente no bloquea ni altera la llamada en curso
+        calls.append(("once", name))
+        timer.remove_listener(once)
+        timer.add_listener(late)
+    
+    timer.add_listener(once)
+    timer.record("a", 0.001)
+    timer.record("b", 0.001)
+    assert calls == [("once", "a"), ("late", "b")]
+
+def test_listeners_registered_while_recording_from_other_threads():
+    timer = StageTimer(enabled=True)
+    counts = [0] * 8
+    errors = []
+    
+    def make_listener(i):
+        def listener(name, seconds):
+            counts[i] += 1
+        return listener
+    
+    def record_many():
+        try:
+            for _ in range(2000):
+                timer.record("preprocess.impute", 0.001)
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=record_many) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    listeners = [make_listener(i) for i in range(8)]
+    for listener in listeners:
+        timer.add_listener(listener)
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert timer.snapshot()["preprocess.impute"]['count'] == 8000
+    assert all(count <= 8000 for count in counts)
+    
+    # Tras registrarse, cada oyente recibe todas las mediciones posteriores
+    before = list(counts)
+    timer.record("preprocess.impute", 0.001)
+    assert counts == [count + 1 for count in before]
+    
+    for listener in listeners:
+        timer.remove_listener(listener)
+    timer.record("preprocess.impute", 0.001)
+    assert counts == [count + 1 for count in before]
@@ -0,0 +1,38 @@
+"""
+Reporte de arranque: fases por tipo, fases fallidas y totales
+"""
+
+import threading
+import pytest
+from src.utils.startup_profiler import StartupProfiler
+
+def test_phases_are_recorded_with_kind_and_thread():
+    profiler = StartupProfiler()
+    with profiler.phase("import.pipeline", "import"):
+        pass
+    
+    worker = threading.Thread(target=lambda: profiler.record("init.camera", "init", profiler.origin, 0.25),
+                              name="init_0")
+    worker.start()
+    worker.join()
+    profiler.mark("window.first_paint")
+    
+    phases = {phase['name']: phase for phase in profiler.phases()}
+    assert phases["import.pipeline"]['kind'] == "import"
+    assert phases["init.camera"]['thread'] == "init_0" and phases["init.camera"]['duration_ms'] == 250.0
+    assert phases["window.first_paint"]['duration_ms'] == 0.0
+    assert profiler.totals()['init'] == 250.0 and "mark" not in profiler.totals()
+    assert profiler.elapsed_ms() >= 250.0
+
+def test_failed_phase_is_reported_and_reraised():
+    profiler = StartupProfiler()
+    with pytest.raises(ImportError):
+        with profiler.phase("import.capture", "import"):
+            raise ImportError("sin pyrealsense2")
+    
+    assert profiler.phases()[0]['failed']
+    assert "(error)" in profiler.report()
+
+def test_unknown_phase_kind_is_rejected():
+    with pytest.raises(ValueError):
+        StartupProfiler().phase("init.gui", "render")
@@ -0,0 +1,88 @@
+"""
+Ventana deslizante del modo continuo: orden del buffer circular, predicciones suavizadas y frames omitidos
+"""
+
+import time
+from collections import deque
+from types import SimpleNamespace
+import numpy as np
+from src.pipeline import SlidingWindowRecognizer
+
+class _FakePipeline:
+    """Devuelve probabilidades fijadas de antemano y guarda las ventanas recibidas"""
+    
+    def __init__(self, *probabilities):
+        self.probabilities = deque(probabilities)
+        self.windows = []
+    
+    def run(self, window, timestamps=None, valid=None):
+        self.windows.append((window, timestamps, valid))
+        probabilities = self.probabilities.popleft()
+        return max(probabilities, key=probabilities.get), probabilities
+
+class _FakeSubscriber:
+    """Entrega los paquetes indicados y se cierra al agotarlos, como al terminar una reproducción"""
+    
+    def __init__(self, packets):
+        self.packets = deque(packets)
+        self.closed = False
+    
+    def get(self, timeout=None):
+        if not self.packets:
+            self.closed = True
+            return None
+        return self.packets.popleft()
+    
+    def close(self):
+        self.closed = True
+
+def _frame(value):
+    return np.full(99, float(value))
+
+def test_window_is_chronological_after_wrapping():
+    recognizer = SlidingWindowRecognizer(_FakePipeline(), window_seconds=1, frame_rate=10)
+    for i in range(13):
+        recognizer.push_frame(_frame(i + 1), timestamp=i / 10)
+    
+    window, timestamps, valid = recognizer.get_window(with_metadata=True)
+    np.testing.assert_array_equal(window[:, 0], np.arange(4, 14))
+    np.testing.assert_allclose(timestamps, np.arange(3, 13) / 10)
+    assert valid.all()
+    
+    # Un frame sin marca de tiempo invalida las de toda la ventana
+    recognizer.push_frame(_frame(14))
+    assert recognizer.get_window(with_metadata=True)[1] is None
+
+def test_predictions_wait_for_a_full_window_and_are_smoothed():
+    pipeline = _FakePipeline({'caminar': 1.0, 'correr': 0.0}, {'caminar': 0.0, 'correr': 1.0})
+    recognizer = SlidingWindowRecognizer(pipeline, window_seconds=1, frame_rate=10, smoothing=0.5)
+    for i in range(9):
+        recognizer.push_frame(_frame(i + 1), timestamp=i / 10)
+    assert recognizer.predict_now() is None
+    
+    recognizer.push_frame(_frame(10), timestamp=0.9)
+    assert recognizer.predict_now()[:2] == ('caminar', 1.0)
+    _, _, probabilities = recognizer.predict_now()
+    assert probabilities == {'caminar': 0.5, 'correr': 0.5}
+    assert len(pipeline.windows) == 2 and len(pipeline.windows[0][0]) == 10
+
+def test_feeder_keeps_gated_frames_as_repeated_samples():
+    coords = np.arange(99, dtype=np.float32).reshape(33, 3)
+    valid = np.ones(33, dtype=bool)
+    packets = []
+    for i in range(6):
+        packet = SimpleNamespace(joint_coords=coords, joint_valid=valid, device_timestamp=i / 30,
+                                 pose_reused=i % 3 != 0)
+        packets.append(packet)
+    
+    recognizer = SlidingWindowRecognizer(_FakePipeline(), window_seconds=1, frame_rate=30)
+    recognizer.start(_FakeSubscriber(packets))
+    deadline = time.monotonic() + 2.0
+    while len(recognizer.get_window()) < len(packets) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    recognizer.stop()
+    
+    window, timestamps, _ = recognizer.get_window(with_metadata=True)
+    assert len(window) == 6
+    np.testing.assert_array_equal(window, np.tile(coords.ravel(), (6, 1)))
+    np.testing.assert_allclose(timestamps, np.arange(6) / 30)